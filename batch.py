@@ -0,0 +1,339 @@
+import io
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from loader import load_cities
+
+# ========= Résolution par lots de nombreuses instances =========
+#
+# list_instances()..... instances d'un dossier (*.csv, *.parquet), d'un manifeste (.txt / .jsonl) ou d'un fichier unique
+# load_solver_config()  paramètres du solveur : dictionnaire JSON, ou results/tuning.json (paramètres par taille)
+# iter_batch()......... résout les instances dans un pool de processus, renvoie les résultats au fil de l'eau
+# solve_batch()........ écrit ces résultats en JSON lines (fichier ou sortie standard)
+# hard_limit()......... interrompt un bloc au-delà d'un délai (SIGALRM -> JobTimeout), partagé avec server.py
+# main()............... point d'entrée CLI
+#
+# La configuration est lue une fois ; chaque worker la reçoit et importe le solveur une seule fois (initializer du
+# pool) ; un job ne transporte que le chemin de son instance. Le nombre de jobs en vol est
+# borné, la mémoire ne dépend donc pas du nombre d'instances.
+#
+# Limite de temps par job :
+#   - le génétique reçoit time_limit et s'arrête proprement avec son meilleur tour (status "ok")
+#   - au-delà de time_limit + marge, le job est interrompu (SIGALRM) et marqué "timeout"
+#
+# Lignes invalides et noms de villes en double : par défaut le job est en erreur, pour que le tour rendu
+# couvre toujours toutes les lignes du fichier. Avec drop_rows=True (--drop-rows), ces lignes et les
+# coordonnées en double sont ignorées ; "dropped_rows" du résultat compte les lignes retirées.
+#
+# Manifeste JSON lines, une instance par ligne :
+#   {"path": "tournees/lyon.csv", "id": "lyon", "params": {"pop_size": 50}, "time_limit": 5}
+# (chemins relatifs au manifeste ; seul "path" est obligatoire)
+#
+# Usage :
+#   python batch.py data/instances/ --solver genetic --time-limit 10 --output results/batch.jsonl
+#   python batch.py manifeste.jsonl --solver christofides --workers 8
+#
+# ================================================================
+
+SOLVERS = ("christofides", "genetic")
+INSTANCE_EXTENSIONS = (".csv", ".parquet")
+DROPPED_ROW_STATS = ("invalid", "duplicate_names", "duplicate_coordinates")
+
+# Marge avant l'interruption forcée d'un job : max(HARD_LIMIT_MIN_GRACE, HARD_LIMIT_GRACE × time_limit)
+HARD_LIMIT_GRACE = 0.2
+HARD_LIMIT_MIN_GRACE = 1.0
+
+_WORKER_STATE = {}
+
+
+class JobTimeout(Exception):
+    """Levée dans un worker lorsqu'un job dépasse sa limite de temps."""
+
+
+def list_instances(source):
+    """
+    Liste les instances à résoudre.
+
+    Args:
+        source: Dossier (tous les *.csv), manifeste (.txt : un chemin par ligne, .jsonl : un objet par ligne)
+                ou fichier CSV unique
+
+    Returns:
+        Liste de dictionnaires {"id", "path", "params", "time_limit"}
+    """
+    if os.path.isdir(source):
+        paths = sorted(os.path.join(source, name) for name in os.listdir(source)
+                       if name.endswith(INSTANCE_EXTENSIONS))
+        return [{"id": os.path.splitext(os.path.basename(path))[0], "path": path} for path in paths]
+
+    if source.endswith(INSTANCE_EXTENSIONS):
+        return [{"id": os.path.splitext(os.path.basename(source))[0], "path": source}]
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    instances = []
+    with open(source, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line) if source.endswith(".jsonl") else {"path": line}
+            if "path" not in entry:
+                raise ValueError(f"{source}:{line_number} : champ \"path\" manquant")
+            entry["path"] = os.path.join(base_dir, entry["path"])
+            entry.setdefault("id", os.path.splitext(os.path.basename(entry["path"]))[0])
+            instances.append(entry)
+    return instances
+
+
+def load_solver_config(config):
+    """
+    Charge la configuration du solveur.
+
+    Args:
+        config: None, dictionnaire de paramètres, ou chemin d'un fichier JSON. Un fichier produit par
+                tuning.py ({taille: {"params": ...}}) donne des paramètres par taille d'instance.
+
+    Returns:
+        (paramètres communs, {taille: paramètres})
+    """
+    if config is None:
+        return {}, {}
+    if isinstance(config, dict):
+        return dict(config), {}
+    with open(config, encoding="utf-8") as f:
+        content = json.load(f)
+    if content and all(key.isdigit() and isinstance(value, dict) and "params" in value
+                       for key, value in content.items()):
+        return {}, {int(size): entry["params"] for size, entry in content.items()}
+    return content, {}
+
+
+def _params_for_size(size):
+    """Paramètres du worker pour une instance de taille donnée (plus grande taille réglée <= size)."""
+    params = dict(_WORKER_STATE["params"])
+    by_size = _WORKER_STATE["by_size"]
+    tuned = [tuned_size for tuned_size in by_size if tuned_size <= size]
+    if tuned:
+        params.update(by_size[max(tuned)])
+    elif by_size:
+        params.update(by_size[min(by_size)])
+    return params
+
+
+def _init_batch_worker(solver, params, by_size):
+    """Initialise un processus du pool : import du solveur et configuration, une seule fois par worker."""
+    if solver == "christofides":
+        from utils import cristo_algo as solve
+    else:
+        from genetique import genetic_tsp as solve
+    _WORKER_STATE.update(solver=solver, solve=solve, params=params, by_size=by_size)
+
+
+def _on_alarm(signum, frame):
+    raise JobTimeout()
+
+
+@contextlib.contextmanager
+def hard_limit(seconds):
+    """Interrompt le bloc après `seconds` secondes (Unix uniquement ; sans effet si seconds est None)."""
+    if seconds is None or not hasattr(signal, "setitimer"):
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _run_batch_job(job):
+    """
+    Résout une instance dans un worker.
+
+    Args:
+        job: Dictionnaire {"id", "path", "params", "time_limit", "include_tour", "drop_rows"}
+
+    Returns:
+        Enregistrement JSON-sérialisable du résultat
+    """
+    solver = _WORKER_STATE["solver"]
+    record = {"id": job["id"], "path": job["path"], "solver": solver, "status": "ok"}
+    start = time.perf_counter()
+    try:
+        drop_rows = job.get("drop_rows", False)
+        data = load_cities(job["path"], dedup=drop_rows)
+        record["dropped_rows"] = {name: data.stats[name] for name in DROPPED_ROW_STATS}
+        if data.stats["invalid"] and not drop_rows:
+            raise ValueError(f"{data.stats['invalid']} ligne(s) invalide(s) (drop_rows=True pour les ignorer)")
+        record["n_cities"] = len(data)
+        params = _params_for_size(len(data))
+        params.update(job.get("params") or {})
+
+        time_limit = job.get("time_limit")
+        hard_timeout = None
+        if time_limit is not None:
+            hard_timeout = time_limit + max(HARD_LIMIT_MIN_GRACE, HARD_LIMIT_GRACE * time_limit)
+            if solver == "genetic":
+                params.setdefault("time_limit", time_limit)
+        if solver == "genetic":
+            params.setdefault("verbose", False)
+        record["params"] = params
+
+        with hard_limit(hard_timeout), contextlib.redirect_stdout(io.StringIO()):
+            result = _WORKER_STATE["solve"](data, **params)
+
+        if solver == "christofides":
+            tour, distance = result["tour"][:-1], result["total_distance"]
+        else:
+            tour, distance = result["best_tour"], result["best_distance"]
+            record["generations_run"] = result["generations_run"]
+        record["distance_km"] = round(float(distance), 4)
+        if job.get("include_tour", True):
+            record["tour"] = list(tour)
+    except JobTimeout:
+        record["status"] = "timeout"
+    except Exception as error:
+        record["status"] = "error"
+        record["error"] = f"{type(error).__name__}: {error}"
+    record["time_s"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def iter_batch(instances, solver="christofides", config=None, params=None, time_limit=None, workers=None,
+               include_tour=True, max_in_flight=None, drop_rows=False):
+    """
+    Résout des instances dans un pool de processus et renvoie les résultats dans l'ordre de fin.
+
+    Args:
+        instances: Liste renvoyée par list_instances() (ou source à lister)
+        solver: "christofides" ou "genetic"
+        config: Configuration du solveur (voir load_solver_config), lue une fois et transmise une fois par worker
+        params: Paramètres communs, prioritaires sur config
+        time_limit: Limite de temps par job en secondes (None = aucune), surchargée par le manifeste
+        workers: Nombre de processus (None = nombre de cœurs)
+        include_tour: Inclure le tour dans chaque résultat
+        max_in_flight: Nombre maximal de jobs soumis et non terminés (None = 4 par worker)
+        drop_rows: Ignorer les lignes invalides et les villes en double (False = job en erreur, sauf pour
+                   des coordonnées en double, gardées)
+
+    Yields:
+        Un enregistrement par instance (voir _run_batch_job)
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Solveur inconnu : {solver!r} (attendu : {', '.join(SOLVERS)})")
+    if isinstance(instances, str):
+        instances = list_instances(instances)
+
+    base, by_size = load_solver_config(config)
+    if params:
+        base.update(params)
+        by_size = {size: {**size_params, **params} for size, size_params in by_size.items()}
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 4 * workers
+    pending = iter(instances)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(solver, base, by_size)) as pool:
+        in_flight = set()
+        while True:
+            for instance in pending:
+                job = {
+                    "id": instance["id"],
+                    "path": instance["path"],
+                    "params": instance.get("params"),
+                    "time_limit": instance.get("time_limit", time_limit),
+                    "include_tour": include_tour,
+                    "drop_rows": drop_rows
+                }
+                in_flight.add(pool.submit(_run_batch_job, job))
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def solve_batch(source, output=None, solver="christofides", config=None, params=None, time_limit=None,
+                workers=None, include_tour=True, verbose=True, drop_rows=False):
+    """
+    Résout toutes les instances d'une source et écrit un résultat JSON par ligne dès qu'il est prêt.
+
+    Args:
+        source: Dossier, manifeste ou fichier CSV (voir list_instances)
+        output: Fichier JSON lines de sortie (None = sortie standard)
+        solver: "christofides" ou "genetic"
+        config: Configuration du solveur (dictionnaire ou fichier JSON)
+        params: Paramètres communs, prioritaires sur config
+        time_limit: Limite de temps par job en secondes
+        workers: Nombre de processus (None = nombre de cœurs)
+        include_tour: Inclure le tour dans chaque résultat
+        verbose: Afficher l'avancement et le bilan (sur la sortie d'erreur)
+        drop_rows: Ignorer les lignes invalides et les villes en double (False = job en erreur, sauf pour
+                   des coordonnées en double, gardées)
+
+    Returns:
+        Dictionnaire {"ok", "timeout", "error", "total", "time_s"}
+    """
+    instances = list_instances(source)
+    counts = {"ok": 0, "timeout": 0, "error": 0}
+    start = time.perf_counter()
+
+    if output is not None:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    stream = open(output, "w", encoding="utf-8") if output is not None else sys.stdout
+    try:
+        for done, record in enumerate(iter_batch(instances, solver=solver, config=config, params=params,
+                                                 time_limit=time_limit, workers=workers,
+                                                 include_tour=include_tour, drop_rows=drop_rows), start=1):
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stream.flush()
+            counts[record["status"]] += 1
+            if verbose:
+                print(f"\r  {done}/{len(instances)} instances ({counts['timeout']} timeout, "
+                      f"{counts['error']} erreur(s))", end="", file=sys.stderr, flush=True)
+    finally:
+        if output is not None:
+            stream.close()
+
+    summary = {**counts, "total": len(instances), "time_s": round(time.perf_counter() - start, 2)}
+    if verbose:
+        print(f"\n✓ {summary['ok']}/{summary['total']} instances résolues en {summary['time_s']:.2f} s"
+              + (f", résultats dans {output}" if output else ""), file=sys.stderr)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Résolution TSP par lots")
+    parser.add_argument("source", help="Dossier de CSV, manifeste (.txt / .jsonl) ou fichier CSV")
+    parser.add_argument("--solver", choices=SOLVERS, default="christofides", help="Solveur")
+    parser.add_argument("--config", default=None,
+                        help="Paramètres du solveur (JSON, ou results/tuning.json pour des paramètres par taille)")
+    parser.add_argument("--params", default=None, help="Paramètres communs en JSON, ex. '{\"pop_size\": 50}'")
+    parser.add_argument("--time-limit", type=float, default=None, help="Limite de temps par instance (s)")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus")
+    parser.add_argument("--output", default=None, help="Fichier JSON lines (défaut : sortie standard)")
+    parser.add_argument("--no-tour", action="store_true", help="Ne pas écrire les tours")
+    parser.add_argument("--drop-rows", action="store_true",
+                        help="Ignorer les lignes invalides et les villes en double (défaut : instance en erreur)")
+    parser.add_argument("--quiet", action="store_true", help="Ne pas afficher l'avancement")
+    args = parser.parse_args(argv)
+
+    summary = solve_batch(args.source, output=args.output, solver=args.solver, config=args.config,
+                          params=json.loads(args.params) if args.params else None, time_limit=args.time_limit,
+                          workers=args.workers, include_tour=not args.no_tour, verbose=not args.quiet,
+                          drop_rows=args.drop_rows)
+    return 0 if summary["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,47 @@
+import io
+import json
+import string
 import time
+import hashlib
+import platform
+import subprocess
 import psutil
 import os
+import contextlib
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from instrumentation import flatten_profile
+from loader import city_arrays
+from profiling import run_profiled, save_profile_artifacts, print_hot_functions, profile_basename
 
 
 # ========= Système de Benchmark et Comparaison =========
 #
 # Mesure temps d'exécution, CPU, mémoire pour les algorithmes TSP
 # Enregistre les résultats dans un CSV pour analyse
+# compare_algorithms_multiseed() répète chaque configuration sur plusieurs graines
+# dans un pool de processus et teste la significativité des écarts
+# L'historique (JSON lines) sert de référence au contrôle de régression (regression.py)
+# time_to_target() mesure le temps du génétique pour atteindre une distance cible, par croisement
 #
 # ========================================================
 
 
-def measure_performance(algorithm_func, data, algo_name, **kwargs):
+def measure_performance(algorithm_func, data, algo_name, profiling="none", profile_dir="results/profiles",
+                        run_label=None, top_n=10, **kwargs):
     """
     Mesure les performances d'un algorithme TSP.
 
     Args:
         algorithm_func: Fonction de l'algorithme à tester (cristo_complete ou genetic_tsp)
-        data: DataFrame des villes
+        data: DataFrame des villes ou Cities (loader.py)
         algo_name: Nom de l'algorithme pour l'affichage
+        profiling: Profileur à utiliser : "none", "cprofile" ou "sampling"
+        profile_dir: Dossier des artefacts de profilage (.pstats, .collapsed)
+        run_label: Suffixe des noms d'artefacts (ex: numéro du run)
+        top_n: Nombre de fonctions coûteuses retenues dans "hot_functions"
         **kwargs: Paramètres spécifiques à l'algorithme
 
     Returns:
@@ -38,8 +59,8 @@ def measure_performance(algorithm_func, data, algo_name, **kwargs):
     # --- Temps d'exécution ---
     start_time = time.time()
 
-    # Exécution de l'algorithme
-    result = algorithm_func(data, **kwargs)
+    # Exécution de l'algorithme (éventuellement sous profileur)
+    result, capture = run_profiled(algorithm_func, data, profiling=profiling, **kwargs)
 
     end_time = time.time()
     execution_time = end_time - start_time
@@ -58,7 +79,7 @@ def measure_performance(algorithm_func, data, algo_name, **kwargs):
         distance = result["best_distance"]
     else:  # Christofides
         tour = result["tour"]
-        distance = result["distance"]
+        distance = result["total_distance"]
 
     # --- Métriques ---
     metrics = {
@@ -73,34 +94,90 @@ def measure_performance(algorithm_func, data, algo_name, **kwargs):
     }
 
     # Ajouter les paramètres spécifiques
-    metrics.update(kwargs)
+    metrics.update({key: value for key, value in kwargs.items() if key != "profile"})
+
+    # Ajouter les temps par phase et les compteurs (colonnes profile_*)
+    metrics.update(flatten_profile(result.get("profile")))
+
+    # --- Artefacts de profilage, liés depuis la ligne de résultat ---
+    if capture is not None:
+        paths = save_profile_artifacts(capture, profile_dir, profile_basename(algo_name, run_label))
+        metrics["profiling"] = profiling
+        metrics["profiling_pstats"] = paths["pstats"]
+        metrics["profiling_collapsed"] = paths["collapsed"]
+        metrics["hot_functions"] = capture.top_functions(top_n)
 
     return metrics, result
 
 
-def compare_algorithms(data, genetic_params_list, save_to_csv=True, csv_filename="results/benchmark_results.csv"):
+# Algorithmes comparables à Christofides : nom affiché -> (module, fonction, libellé des paramètres)
+ALGORITHMS = {
+    "Genetique": ("genetique", "genetic_tsp", "Génétique (gen={generations}, pop={pop_size})"),
+    "Fourmis": ("fourmis", "ant_colony_tsp", "Fourmis (iter={iterations}, fourmis={n_ants})"),
+    "Recuit": ("recuit", "simulated_annealing_tsp", "Recuit (epoques={epochs})"),
+    "LinKernighan": ("lin_kernighan", "lin_kernighan_tsp", "Lin-Kernighan (t={time_limit}s)"),
+}
+
+
+def algorithm_function(algorithm):
+    """Fonction de résolution d'un algorithme de ALGORITHMS (ou cristo_algo pour "Christofides")."""
+    import importlib
+
+    if algorithm == "Christofides":
+        from utils import cristo_algo
+        return cristo_algo
+    module, function, _ = ALGORITHMS[algorithm]
+    return getattr(importlib.import_module(module), function)
+
+
+def _algorithm_label(row):
+    """Libellé d'une ligne de résultats pour l'analyse comparative."""
+    _, _, template = ALGORITHMS[row["algorithm"]]
+    fields = {key: row.get(key) for _, key, _, _ in string.Formatter().parse(template) if key}
+    for key, value in fields.items():
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            fields[key] = "N/A"
+        elif isinstance(value, float) and value.is_integer():
+            # Colonnes mélangées avec des NaN : les entiers y sont stockés en float
+            fields[key] = int(value)
+    return template.format(**fields)
+
+
+def compare_algorithms(data, genetic_params_list, save_to_csv=True, csv_filename="results/benchmark_results.csv",
+                       profiling="none", top_n=10, aco_params_list=None, sa_params_list=None,
+                       lk_params_list=None):
     """
-    Compare Christofides avec plusieurs configurations de l'algorithme génétique.
+    Compare Christofides avec plusieurs configurations de l'algorithme génétique (et de la colonie de fourmis,
+    du recuit simulé, de Lin-Kernighan).
 
     Args:
-        data: DataFrame des villes
+        data: DataFrame des villes ou Cities (loader.py)
         genetic_params_list: Liste de dictionnaires de paramètres pour l'algorithme génétique
                             Ex: [{"pop_size": 50, "generations": 100}, {"pop_size": 100, "generations": 200}]
         save_to_csv: Sauvegarder les résultats dans un CSV
         csv_filename: Nom du fichier CSV
+        profiling: Profileur appliqué à chaque run : "none", "cprofile" ou "sampling".
+                   Les artefacts sont écrits dans <dossier du CSV>/profiles/
+        top_n: Nombre de fonctions coûteuses affichées par run
+        aco_params_list: Liste de dictionnaires de paramètres pour ant_colony_tsp (None = pas de colonie)
+                         Ex: [{"n_ants": 20, "iterations": 200}]
+        sa_params_list: Liste de dictionnaires de paramètres pour simulated_annealing_tsp (None = pas de recuit)
+                        Ex: [{"epochs": 200, "schedule": "adaptive"}]
+        lk_params_list: Liste de dictionnaires de paramètres pour lin_kernighan_tsp (None = pas de Lin-Kernighan)
+                        Ex: [{"time_limit": 30}]
 
     Returns:
         DataFrame avec tous les résultats
     """
     # from utils import cristo_complete
     from utils import cristo_algo
-    from genetique import genetic_tsp
 
     print("\n" + "="*70)
     print("COMPARAISON DES ALGORITHMES TSP")
     print("="*70)
 
     results = []
+    profile_dir = os.path.join(os.path.dirname(csv_filename), "profiles")
 
     # --- Test Christofides ---
     print("\n[1/X] Exécution de Christofides...")
@@ -109,25 +186,40 @@ def compare_algorithms(data, genetic_params_list, save_to_csv=True, csv_filename
         cristo_algo,
         data,
         "Christofides",
-        verbose=False
+        profiling=profiling,
+        profile_dir=profile_dir,
+        run_label=1,
+        top_n=top_n,
+        verbose=False,
+        profile=True
     )
 
     print(f"  ✓ Distance: {metrics_cristo['distance_km']} km")
     print(f"  ✓ Temps: {metrics_cristo['execution_time_s']} s")
     print(f"  ✓ CPU: {metrics_cristo['cpu_percent']}%")
     print(f"  ✓ Mémoire: {metrics_cristo['memory_mb']} MB")
+    print_hot_functions(metrics_cristo.get("hot_functions"))
 
     results.append(metrics_cristo)
 
-    # --- Test Algorithme Génétique avec différents paramètres ---
-    for i, params in enumerate(genetic_params_list, start=2):
-        print(f"\n[{i}/{len(genetic_params_list)+1}] Exécution Génétique - {params}...")
+    # --- Test des algorithmes itératifs avec différents paramètres ---
+    runs = [("Genetique", params) for params in genetic_params_list]
+    runs += [("Fourmis", params) for params in aco_params_list or []]
+    runs += [("Recuit", params) for params in sa_params_list or []]
+    runs += [("LinKernighan", params) for params in lk_params_list or []]
+    for i, (algorithm, params) in enumerate(runs, start=2):
+        print(f"\n[{i}/{len(runs)+1}] Exécution {algorithm} - {params}...")
 
         metrics_genetic, result_genetic = measure_performance(
-            genetic_tsp,
+            algorithm_function(algorithm),
             data,
-            f"Genetique",
+            algorithm,
+            profiling=profiling,
+            profile_dir=profile_dir,
+            run_label=i,
+            top_n=top_n,
             verbose=False,
+            profile=True,
             **params
         )
 
@@ -135,6 +227,7 @@ def compare_algorithms(data, genetic_params_list, save_to_csv=True, csv_filename
         print(f"  ✓ Temps: {metrics_genetic['execution_time_s']} s")
         print(f"  ✓ CPU: {metrics_genetic['cpu_percent']}%")
         print(f"  ✓ Mémoire: {metrics_genetic['memory_mb']} MB")
+        print_hot_functions(metrics_genetic.get("hot_functions"))
 
         results.append(metrics_genetic)
 
@@ -143,8 +236,13 @@ def compare_algorithms(data, genetic_params_list, save_to_csv=True, csv_filename
 
     # Réorganiser les colonnes
     cols_order = ["algorithm", "distance_km", "execution_time_s", "cpu_percent", "memory_mb"]
-    param_cols = [col for col in df_results.columns if col not in cols_order + ["tour", "timestamp", "memory_total_mb"]]
+    param_cols = [col for col in df_results.columns if col not in cols_order + ["tour", "timestamp", "memory_total_mb", "hot_functions"]
+                  and not col.startswith(("profile_", "profiling"))]
+    profile_cols = [col for col in df_results.columns if col.startswith("profile_")]
+    profiling_cols = [col for col in df_results.columns if col.startswith("profiling")]
     cols_order.extend(param_cols)
+    cols_order.extend(profile_cols)
+    cols_order.extend(profiling_cols)
     cols_order.extend(["memory_total_mb", "timestamp"])
 
     df_results = df_results[cols_order]
@@ -179,45 +277,513 @@ def compare_algorithms(data, genetic_params_list, save_to_csv=True, csv_filename
 
     # Ratio de performance
     cristo_dist = df_results[df_results["algorithm"] == "Christofides"]["distance_km"].values[0]
-    for idx, row in df_results[df_results["algorithm"] == "Genetique"].iterrows():
+    for idx, row in df_results[df_results["algorithm"] != "Christofides"].iterrows():
         ratio = ((row["distance_km"] - cristo_dist) / cristo_dist) * 100
-        print(f"\nGénétique (gen={row.get('generations', 'N/A')}, pop={row.get('pop_size', 'N/A')}): {ratio:+.2f}% vs Christofides")
+        print(f"\n{_algorithm_label(row)}: {ratio:+.2f}% vs Christofides")
 
     print("\n" + "="*70)
 
     return df_results
 
 
-def load_benchmark_history(csv_filename="results/benchmark_results.csv"):
+# ------- Benchmark multi-graines en parallèle -------
+
+_WORKER_DATA = None
+
+
+def _init_benchmark_worker(data):
+    """Initialise un processus du pool : les villes sont reçues une seule fois par worker."""
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def _run_benchmark_job(job):
     """
-    Charge l'historique des benchmarks depuis un CSV.
+    Exécute un run (algorithme, paramètres, graine) dans un processus du pool.
 
     Args:
-        csv_filename: Nom du fichier CSV
+        job: Dictionnaire {"config": index, "algorithm": nom, "params": dict, "seed": graine}
 
     Returns:
-        DataFrame avec l'historique
+        Dictionnaire de métriques du run (sans le résultat complet)
     """
-    if os.path.exists(csv_filename):
-        return pd.read_csv(csv_filename)
-    else:
-        print(f"Fichier {csv_filename} introuvable.")
+    params = dict(job["params"])
+    func = algorithm_function(job["algorithm"])
+    if job["algorithm"] != "Christofides":
+        params["seed"] = job["seed"]
+
+    # cristo_algo affiche toujours sa tournée : on garde la sortie des workers silencieuse
+    with contextlib.redirect_stdout(io.StringIO()):
+        metrics, _ = measure_performance(func, _WORKER_DATA, job["algorithm"], verbose=False, **params)
+
+    metrics["config"] = job["config"]
+    metrics["seed"] = job["seed"]
+    metrics.pop("tour", None)
+    return metrics
+
+
+def bootstrap_ci(values, confidence=0.95, n_boot=2000, seed=0):
+    """
+    Intervalle de confiance de la moyenne par bootstrap (percentiles).
+
+    Args:
+        values: Échantillon (liste ou array)
+        confidence: Niveau de confiance
+        n_boot: Nombre de rééchantillonnages
+        seed: Graine du rééchantillonnage
+
+    Returns:
+        (borne basse, borne haute)
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < 2:
+        return float(values.mean()), float(values.mean())
+    rng = np.random.default_rng(seed)
+    samples = rng.choice(values, size=(n_boot, len(values)), replace=True).mean(axis=1)
+    alpha = (1 - confidence) / 2
+    return float(np.quantile(samples, alpha)), float(np.quantile(samples, 1 - alpha))
+
+
+def permutation_pvalue(a, b, n_perm=10000, seed=0):
+    """
+    p-value bilatérale d'un test de permutation sur la différence des moyennes de deux échantillons.
+
+    Args:
+        a, b: Échantillons à comparer
+        n_perm: Nombre de permutations
+        seed: Graine des permutations
+
+    Returns:
+        p-value (probabilité d'observer un écart au moins aussi grand sous H0)
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    observed = abs(a.mean() - b.mean())
+    pooled = np.concatenate([a, b])
+    rng = np.random.default_rng(seed)
+    permuted = rng.permuted(np.tile(pooled, (n_perm, 1)), axis=1)
+    diffs = np.abs(permuted[:, :len(a)].mean(axis=1) - permuted[:, len(a):].mean(axis=1))
+    # +1 au numérateur et au dénominateur : la permutation observée compte
+    return float((np.sum(diffs >= observed - 1e-12) + 1) / (n_perm + 1))
+
+
+def summarize_runs(df_runs, confidence=0.95):
+    """
+    Agrège les runs multi-graines par configuration.
+
+    Args:
+        df_runs: DataFrame des runs (colonnes config, algorithm, distance_km, execution_time_s, ...)
+        confidence: Niveau de confiance des intervalles
+
+    Returns:
+        DataFrame avec moyenne, médiane et IC de la distance et du temps par configuration
+    """
+    rows = []
+    for config, group in df_runs.groupby("config", sort=True):
+        row = {"config": config, "algorithm": group["algorithm"].iloc[0], "label": group["label"].iloc[0],
+               "runs": len(group)}
+        for metric in ("distance_km", "execution_time_s", "memory_mb"):
+            values = group[metric].to_numpy(dtype=float)
+            low, high = bootstrap_ci(values, confidence)
+            row[f"{metric}_mean"] = round(float(values.mean()), 4)
+            row[f"{metric}_median"] = round(float(np.median(values)), 4)
+            row[f"{metric}_ci_low"] = round(low, 4)
+            row[f"{metric}_ci_high"] = round(high, 4)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def compare_algorithms_multiseed(data, genetic_params_list, seeds=10, base_seed=0, workers=None,
+                                 alpha=0.05, save_to_csv=True, csv_filename="results/benchmark_multiseed.csv",
+                                 history_filename=None, aco_params_list=None, sa_params_list=None,
+                                 lk_params_list=None):
+    """
+    Compare Christofides et plusieurs configurations génétiques (et de colonie de fourmis, de recuit simulé,
+    de Lin-Kernighan)
+    sur R graines, en parallèle.
+
+    Chaque configuration est exécutée `seeds` fois dans un pool de processus ; la distance et le
+    temps sont agrégés (moyenne, médiane, IC bootstrap) et chaque configuration génétique est
+    comparée à Christofides par un test de permutation.
+
+    Args:
+        data: DataFrame des villes ou Cities (loader.py)
+        genetic_params_list: Liste de dictionnaires de paramètres pour l'algorithme génétique
+        seeds: Nombre de graines (runs) par configuration
+        base_seed: Première graine utilisée
+        workers: Nombre de processus (None = nombre de cœurs)
+        alpha: Seuil de significativité des tests
+        save_to_csv: Sauvegarder les runs et le résumé
+        csv_filename: CSV du résumé (les runs bruts vont dans <nom>_runs.csv)
+        history_filename: Historique JSON lines où ajouter les runs (None = pas d'historique)
+        aco_params_list: Liste de dictionnaires de paramètres pour ant_colony_tsp (None = pas de colonie)
+        sa_params_list: Liste de dictionnaires de paramètres pour simulated_annealing_tsp (None = pas de recuit)
+        lk_params_list: Liste de dictionnaires de paramètres pour lin_kernighan_tsp (None = pas de Lin-Kernighan)
+
+    Returns:
+        (DataFrame des runs, DataFrame du résumé)
+    """
+    configs = [("Christofides", {})] + [("Genetique", dict(params)) for params in genetic_params_list]
+    configs += [("Fourmis", dict(params)) for params in aco_params_list or []]
+    configs += [("Recuit", dict(params)) for params in sa_params_list or []]
+    configs += [("LinKernighan", dict(params)) for params in lk_params_list or []]
+    jobs = [
+        {"config": index, "algorithm": algorithm, "params": params, "seed": base_seed + r}
+        for r in range(seeds)
+        for index, (algorithm, params) in enumerate(configs)
+    ]
+
+    print("\n" + "="*70)
+    print(f"COMPARAISON MULTI-GRAINES ({len(configs)} configurations × {seeds} graines, {len(jobs)} runs)")
+    print("="*70)
+
+    start_time = time.time()
+    runs = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_benchmark_worker, initargs=(data,)) as pool:
+        futures = [pool.submit(_run_benchmark_job, job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            runs.append(future.result())
+            print(f"\r  {done}/{len(jobs)} runs terminés", end="", flush=True)
+    wall_time = time.time() - start_time
+    print(f"\n  ✓ Temps total : {wall_time:.2f} s")
+
+    df_runs = pd.DataFrame(runs).sort_values(["config", "seed"]).reset_index(drop=True)
+    labels = {index: algorithm if not params else f"{algorithm} " + " ".join(f"{k}={v}" for k, v in params.items())
+              for index, (algorithm, params) in enumerate(configs)}
+    df_runs["label"] = df_runs["config"].map(labels)
+
+    df_summary = summarize_runs(df_runs, confidence=1 - alpha)
+
+    # --- Tests de significativité contre Christofides ---
+    cristo_runs = df_runs[df_runs["config"] == 0]
+    for metric, short in (("distance_km", "distance"), ("execution_time_s", "time")):
+        deltas, pvalues = [], []
+        for config in df_summary["config"]:
+            group = df_runs[df_runs["config"] == config]
+            reference = cristo_runs[metric].mean()
+            deltas.append(round((group[metric].mean() - reference) / reference * 100, 2) if reference else np.nan)
+            pvalues.append(np.nan if config == 0 else round(permutation_pvalue(group[metric], cristo_runs[metric]), 4))
+        df_summary[f"{short}_vs_cristo_pct"] = deltas
+        df_summary[f"{short}_pvalue"] = pvalues
+
+    if save_to_csv:
+        os.makedirs(os.path.dirname(csv_filename) or ".", exist_ok=True)
+        runs_filename = os.path.splitext(csv_filename)[0] + "_runs.csv"
+        df_runs.to_csv(runs_filename, index=False, encoding='utf-8')
+        df_summary.to_csv(csv_filename, index=False, encoding='utf-8')
+        print(f"\n✓ Runs sauvegardés dans {runs_filename}")
+        print(f"✓ Résumé sauvegardé dans {csv_filename}")
+
+    if history_filename is not None:
+        append_to_benchmark_history(df_runs, history_filename, data=data)
+
+    # --- Rapport ---
+    level = int(round((1 - alpha) * 100))
+    print("\n" + "="*70)
+    print(f"RÉSUMÉ (moyenne [IC{level}%], médiane)")
+    print("="*70)
+    for _, row in df_summary.iterrows():
+        print(f"\n{row['label']}")
+        print(f"  Distance : {row['distance_km_mean']:.2f} km [{row['distance_km_ci_low']:.2f} ; "
+              f"{row['distance_km_ci_high']:.2f}], médiane {row['distance_km_median']:.2f} km")
+        print(f"  Temps    : {row['execution_time_s_mean']:.4f} s [{row['execution_time_s_ci_low']:.4f} ; "
+              f"{row['execution_time_s_ci_high']:.4f}], médiane {row['execution_time_s_median']:.4f} s")
+        if row["config"] == 0:
+            continue
+        for short, name in (("distance", "Distance"), ("time", "Temps")):
+            pvalue = row[f"{short}_pvalue"]
+            verdict = "significatif" if pvalue < alpha else "non significatif"
+            print(f"  {name} vs Christofides : {row[f'{short}_vs_cristo_pct']:+.2f}% (p={pvalue:.4f}, {verdict})")
+
+    print("\n" + "="*70)
+
+    return df_runs, df_summary
+
+
+def time_to_target(data, target=None, crossovers=("ox", "erx", "eax"), seeds=5, base_seed=0, time_limit=60,
+                   genetic_params=None, save_to_csv=True, csv_filename="results/time_to_target.csv"):
+    """
+    Temps nécessaire à l'algorithme génétique pour atteindre une distance cible, par type de croisement.
+
+    Chaque run s'arrête dès que le meilleur tour passe sous la cible (callback de genetic_tsp) ou à
+    time_limit ; les runs sont séquentiels pour que les temps restent comparables.
+
+    Args:
+        data: DataFrame des villes ou Cities (loader.py)
+        target: Distance cible en km (None = distance de Christofides)
+        crossovers: Croisements comparés (valeurs de crossover= de genetic_tsp)
+        seeds: Nombre de graines (runs) par croisement
+        base_seed: Première graine utilisée
+        time_limit: Budget de temps par run en secondes
+        genetic_params: Autres paramètres de genetic_tsp (ex. {"pop_size": 100, "generations": 5000}) ;
+                        crossover, seed, time_limit, callback et verbose sont fixés par la fonction
+        save_to_csv: Sauvegarder les runs et le résumé
+        csv_filename: CSV du résumé (les runs bruts vont dans <nom>_runs.csv)
+
+    Returns:
+        (DataFrame des runs, DataFrame du résumé par croisement)
+    """
+    genetic_tsp = algorithm_function("Genetique")
+    if target is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            target = algorithm_function("Christofides")(data)["total_distance"]
+    reserved = {"crossover", "seed", "time_limit", "callback", "verbose"} & set(genetic_params or {})
+    if reserved:
+        raise ValueError(f"Paramètres fixés par time_to_target, à retirer de genetic_params : {sorted(reserved)}")
+    params = {"generations": 100000, **(genetic_params or {})}
+
+    print("\n" + "="*70)
+    print(f"TEMPS POUR ATTEINDRE {target:.2f} km ({seeds} graines, {time_limit} s max par run)")
+    print("="*70)
+
+    runs = []
+    for crossover in crossovers:
+        for seed in range(base_seed, base_seed + seeds):
+            reached = {}
+            start = time.perf_counter()
+
+            def stop_at_target(generation, tour, distance, avg_distance):
+                if distance <= target + 1e-9:
+                    reached.update(time_s=time.perf_counter() - start, generation=generation)
+                    return True
+                return False
+
+            result = genetic_tsp(data, **params, crossover=crossover, seed=seed, time_limit=time_limit,
+                                 callback=stop_at_target, verbose=False)
+            runs.append({
+                "crossover": crossover,
+                "seed": seed,
+                "reached": bool(reached),
+                "time_to_target_s": round(reached["time_s"], 4) if reached else np.nan,
+                "generations_to_target": reached.get("generation", np.nan),
+                "best_distance_km": round(result["best_distance"], 2),
+                "execution_time_s": round(time.perf_counter() - start, 4)
+            })
+            status = f"{reached['time_s']:.2f} s" if reached else "non atteinte"
+            print(f"  {crossover:>4} seed {seed} : {status} (meilleur {result['best_distance']:.2f} km)")
+
+    df_runs = pd.DataFrame(runs)
+    df_summary = df_runs.groupby("crossover", sort=False).agg(
+        runs=("seed", "count"),
+        success_rate=("reached", "mean"),
+        time_to_target_median_s=("time_to_target_s", "median"),
+        time_to_target_mean_s=("time_to_target_s", "mean"),
+        generations_median=("generations_to_target", "median"),
+        best_distance_mean_km=("best_distance_km", "mean")
+    ).reset_index()
+    df_summary.insert(1, "target_km", round(target, 2))
+
+    if save_to_csv:
+        os.makedirs(os.path.dirname(csv_filename) or ".", exist_ok=True)
+        runs_filename = os.path.splitext(csv_filename)[0] + "_runs.csv"
+        df_runs.to_csv(runs_filename, index=False, encoding='utf-8')
+        df_summary.to_csv(csv_filename, index=False, encoding='utf-8')
+        print(f"\n✓ Runs sauvegardés dans {runs_filename}")
+        print(f"✓ Résumé sauvegardé dans {csv_filename}")
+
+    print("\n" + df_summary.to_string(index=False))
+    print("\n" + "="*70)
+    return df_runs, df_summary
+
+
+def instance_fingerprint(data):
+    """
+    Empreinte courte d'une instance (villes et coordonnées), pour regrouper les runs comparables.
+
+    Un DataFrame et un Cities en float64 des mêmes villes ont la même empreinte (coordonnées
+    arrondies à 6 décimales) ; un Cities en float32 peut en différer.
+
+    Args:
+        data: DataFrame des villes ou Cities (loader.py)
+
+    Returns:
+        Chaîne hexadécimale de 12 caractères
+    """
+    cities, lat, lon = city_arrays(data)
+    content = pd.DataFrame({"Ville": cities, "Latitude": lat, "Longitude": lon}).round(6).to_csv(index=False)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+
+
+def machine_info():
+    """Description de la machine qui exécute le benchmark."""
+    return {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version()
+    }
+
+
+def machine_key(machine):
+    """Identité de la machine (hôte, processeur, nombre de cœurs) d'un enregistrement, None si inconnue."""
+    if not isinstance(machine, dict):
+        return None
+    return json.dumps({key: machine.get(key) for key in MACHINE_IDENTITY_KEYS}, sort_keys=True)
+
+
+def git_revision():
+    """Révision git du dépôt de ce fichier (suffixée de '-dirty' si l'arbre est modifié), None hors dépôt."""
+    repo = os.path.dirname(os.path.abspath(__file__))
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             check=True, cwd=repo).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, check=True, cwd=repo).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{rev}-dirty" if dirty else rev
+
+
+# Colonnes qui identifient des runs comparables (même instance, algorithme et paramètres)
+HISTORY_GROUP_KEYS = ["instance", "algorithm", "params_key"]
+
+# Champs de machine_info() qui identifient une machine (temps et mémoire ne se comparent qu'entre runs de la même)
+MACHINE_IDENTITY_KEYS = ("hostname", "processor", "cpu_count")
+
+# Colonnes de résultat qui ne sont pas des paramètres de l'algorithme
+HISTORY_METRIC_COLUMNS = ["distance_km", "execution_time_s", "cpu_percent", "memory_mb", "memory_total_mb"]
+_NON_PARAM_COLUMNS = set(HISTORY_METRIC_COLUMNS) | {
+    "algorithm", "tour", "timestamp", "hot_functions", "verbose", "seed", "config", "label", "instance",
+    "n_cities", "git_rev", "machine", "machine_key", "params", "params_key"
+}
+
+
+def _clean_value(value):
+    """Convertit les scalaires numpy/pandas en types JSON (NaN -> None, 10.0 -> 10)."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if np.isnan(value):
+            return None
+        if value.is_integer():
+            return int(value)
+    return value
+
+
+def params_key(params):
+    """Clé canonique (JSON trié) d'un dictionnaire de paramètres."""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _row_params(row):
+    """Paramètres de l'algorithme d'une ligne de résultats (colonnes qui ne sont pas des métriques)."""
+    params = {}
+    for column, value in row.items():
+        if column in _NON_PARAM_COLUMNS or column.startswith(("profile_", "profiling")):
+            continue
+        value = _clean_value(value)
+        if value is not None:
+            params[column] = value
+    return params
+
+
+def _row_to_record(row, instance, n_cities, rev, machine):
+    params = _row_params(row)
+    record = {
+        "timestamp": row.get("timestamp") or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "git_rev": rev,
+        "machine": machine,
+        "instance": instance,
+        "n_cities": n_cities,
+        "algorithm": row["algorithm"],
+        "params": params,
+        "seed": _clean_value(row.get("seed"))
+    }
+    for column in HISTORY_METRIC_COLUMNS:
+        if column in row:
+            record[column] = _clean_value(row[column])
+    for column, value in row.items():
+        if column.startswith("profile_"):
+            value = _clean_value(value)
+            if value is not None:
+                record[column] = value
+    return record
+
+
+def load_benchmark_history(filename="results/benchmark_history.jsonl", csv_filename=None):
+    """
+    Charge l'historique des benchmarks.
+
+    L'historique est un fichier JSON lines (un run par ligne). Les anciens fichiers CSV sont
+    encore lus : les paramètres sont reconstruits à partir des colonnes et l'instance, inconnue,
+    vaut NaN.
+
+    Args:
+        filename: Fichier d'historique (.jsonl, ou .csv pour l'ancien format)
+        csv_filename: Ancien nom du paramètre filename
+
+    Returns:
+        DataFrame avec l'historique (colonnes instance, algorithm, params_key pour regrouper
+        les runs comparables, même si le fichier est vide, et machine_key), None si le fichier
+        n'existe pas
+    """
+    if csv_filename is not None:
+        filename = csv_filename
+    if not os.path.exists(filename):
+        print(f"Fichier {filename} introuvable.")
         return None
 
+    if filename.endswith(".csv"):
+        history = pd.read_csv(filename)
+        if "instance" not in history:
+            history["instance"] = np.nan
+        if "params" not in history:
+            history["params"] = [_row_params(row) for _, row in history.iterrows()]
+    else:
+        with open(filename, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        history = pd.DataFrame(records)
+
+    if history.empty:
+        return pd.DataFrame(columns=HISTORY_GROUP_KEYS + ["params", "machine_key"])
+    history["params_key"] = history["params"].map(params_key)
+    history["machine_key"] = history["machine"].map(machine_key) if "machine" in history else None
+    return history
+
 
-def append_to_benchmark_history(new_results, csv_filename="results/benchmark_results.csv"):
+def append_to_benchmark_history(new_results, filename="results/benchmark_history.jsonl", data=None, instance=None,
+                                csv_filename=None):
     """
     Ajoute de nouveaux résultats à l'historique existant.
 
+    Dans un fichier .jsonl, chaque run est écrit en fin de fichier sur une ligne JSON, avec la
+    révision git, les informations machine et l'empreinte de l'instance : le fichier n'est jamais
+    réécrit. Un fichier .csv garde l'ancien format (tableau réécrit avec les nouvelles lignes).
+
     Args:
-        new_results: DataFrame des nouveaux résultats
-        csv_filename: Nom du fichier CSV
+        new_results: DataFrame des nouveaux résultats (compare_algorithms ou runs multi-graines)
+        filename: Fichier d'historique (.jsonl, ou .csv pour l'ancien format)
+        data: DataFrame des villes ou Cities (pour calculer l'empreinte de l'instance)
+        instance: Empreinte explicite de l'instance (prioritaire sur data)
+        csv_filename: Ancien nom du paramètre filename
     """
-    if os.path.exists(csv_filename):
-        history = pd.read_csv(csv_filename)
-        combined = pd.concat([history, new_results], ignore_index=True)
-        combined.to_csv(csv_filename, index=False, encoding='utf-8')
-        print(f"✓ Résultats ajoutés à {csv_filename}")
+    if csv_filename is not None:
+        filename = csv_filename
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in (".jsonl", ".csv"):
+        raise ValueError(f"Format d'historique non pris en charge : {filename!r} (attendu : .jsonl ou .csv)")
+
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    created = not os.path.exists(filename)
+    if extension == ".csv":
+        if created:
+            new_results.to_csv(filename, index=False, encoding='utf-8')
+        else:
+            combined = pd.concat([pd.read_csv(filename), new_results], ignore_index=True)
+            combined.to_csv(filename, index=False, encoding='utf-8')
+    else:
+        if instance is None and data is not None:
+            instance = instance_fingerprint(data)
+        n_cities = len(data) if data is not None else None
+        rev = git_revision()
+        machine = machine_info()
+        with open(filename, "a", encoding="utf-8") as f:
+            for _, row in new_results.iterrows():
+                record = _row_to_record(row, instance, n_cities, rev, machine)
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    if created:
+        print(f"✓ Nouveau fichier créé : {filename}")
     else:
-        new_results.to_csv(csv_filename, index=False, encoding='utf-8')
-        print(f"✓ Nouveau fichier créé : {csv_filename}")
+        print(f"✓ Résultats ajoutés à {filename}")
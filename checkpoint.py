@@ -0,0 +1,119 @@
+import threading
+import numpy as np
+from utils import atomic_write
+
+# ========= Points de reprise (checkpoints) =========
+#
+# rng_state_to_arrays()... état d'un random.Random -> tableaux numpy
+# rng_state_from_arrays(). tableaux numpy -> état pour random.Random.setstate()
+# save_checkpoint()....... écrit un dictionnaire de tableaux dans un seul fichier .npz, de façon atomique
+# load_checkpoint()....... relit ce fichier (sans pickle)
+# CheckpointWriter........ écriture en tâche de fond : le calcul ne paie que la copie de l'état
+#
+# Le fichier est d'abord écrit sous un nom temporaire puis renommé : un arrêt brutal pendant
+# l'écriture laisse toujours le checkpoint précédent intact.
+#
+# ====================================================
+
+
+def rng_state_to_arrays(state):
+    """
+    Args:
+        state: Résultat de random.Random.getstate()
+
+    Returns:
+        Dictionnaire {"rng_version", "rng_state", "rng_gauss"} de tableaux numpy
+    """
+    version, internal, gauss_next = state
+    return {
+        "rng_version": np.array(version, dtype=np.int64),
+        "rng_state": np.array(internal, dtype=np.uint64),
+        "rng_gauss": np.array(np.nan if gauss_next is None else gauss_next, dtype=float)
+    }
+
+
+def rng_state_from_arrays(arrays):
+    """Inverse de rng_state_to_arrays(), à passer à random.Random.setstate()."""
+    gauss_next = float(arrays["rng_gauss"])
+    return (int(arrays["rng_version"]), tuple(int(value) for value in arrays["rng_state"]),
+            None if np.isnan(gauss_next) else gauss_next)
+
+
+def save_checkpoint(path, arrays):
+    """
+    Écrit des tableaux numpy dans un seul fichier .npz (non compressé), de façon atomique.
+
+    Args:
+        path: Chemin du fichier
+        arrays: Dictionnaire {nom: tableau numpy}
+    """
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+
+    atomic_write(path, write)
+
+
+def load_checkpoint(path):
+    """
+    Args:
+        path: Chemin d'un fichier écrit par save_checkpoint()
+
+    Returns:
+        Dictionnaire {nom: tableau numpy}
+    """
+    with np.load(path, allow_pickle=False) as content:
+        return {name: content[name] for name in content.files}
+
+
+class CheckpointWriter:
+    """
+    Écrit les checkpoints dans un thread : au plus une écriture en cours, un checkpoint demandé
+    pendant une écriture est ignoré (le coût pour le calcul reste borné à la copie de l'état).
+    Une erreur d'écriture dans le thread est comptée (failed), gardée, et relevée par close().
+
+    Args:
+        path: Chemin du fichier de checkpoint
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self.error = None
+        self._thread = None
+
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, arrays):
+        """Écrit un instantané en tâche de fond ; renvoie False si une écriture est déjà en cours."""
+        if self.busy():
+            self.skipped += 1
+            return False
+        self._thread = threading.Thread(target=self._write_background, args=(arrays,), daemon=True)
+        self._thread.start()
+        return True
+
+    def _write(self, arrays):
+        save_checkpoint(self.path, arrays)
+        self.written += 1
+
+    def _write_background(self, arrays):
+        try:
+            self._write(arrays)
+        except Exception as error:
+            self.failed += 1
+            if self.error is None:
+                self.error = error
+
+    def close(self, arrays=None):
+        """Attend l'écriture en cours, écrit (de façon synchrone) un dernier instantané, puis relève
+        la première erreur d'une écriture en tâche de fond s'il y en a eu une."""
+        if self._thread is not None:
+            self._thread.join()
+        if arrays is not None:
+            self._write(arrays)
+        if self.error is not None:
+            raise self.error
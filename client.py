@@ -0,0 +1,149 @@
+import sys
+import json
+import asyncio
+import argparse
+
+# ========= Client du serveur de résolution (server.py) =========
+#
+# parse_address()........ "unix:/chemin/socket" ou "hôte:port"
+# open_connection()...... connexion asyncio à cette adresse
+# cities_from_dataframe() DataFrame des villes -> liste JSON-sérialisable
+# submit()............... envoie un job et lit les événements jusqu'au résultat
+# cancel() / stats()..... annule un job / lit les compteurs du serveur
+# solve()................ version synchrone de submit()
+# main()................. point d'entrée CLI
+#
+# Protocole : une requête JSON par ligne, puis une réponse JSON par ligne (événements).
+#
+# Usage :
+#   python client.py data/villes.csv --solver genetic --params '{"generations": 500}' --deadline 5
+#
+# ===============================================================
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+TERMINAL_EVENTS = ("result", "rejected", "error")
+
+
+def parse_address(address):
+    """
+    Args:
+        address: "unix:/chemin/socket" ou "hôte:port"
+
+    Returns:
+        ("unix", chemin) ou ("tcp", (hôte, port))
+    """
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+async def open_connection(address):
+    kind, target = parse_address(address)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(target)
+    return await asyncio.open_connection(*target)
+
+
+async def _send(writer, message):
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+
+
+async def _request(address, message):
+    """Envoie une requête et renvoie la première réponse."""
+    reader, writer = await open_connection(address)
+    try:
+        await _send(writer, message)
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def cities_from_dataframe(data):
+    """
+    Args:
+        data: DataFrame avec colonnes Ville, Latitude, Longitude
+
+    Returns:
+        Liste de dictionnaires {"Ville", "Latitude", "Longitude"}
+    """
+    return data[["Ville", "Latitude", "Longitude"]].to_dict(orient="records")
+
+
+async def submit(address, solver, cities, params=None, deadline=None, progress=True, on_progress=None,
+                 on_accepted=None):
+    """
+    Soumet un job et attend son résultat.
+
+    Args:
+        address: Adresse du serveur
+        solver: "christofides" ou "genetic"
+        cities: Liste de villes (cities_from_dataframe)
+        params: Paramètres du solveur
+        deadline: Délai maximal en secondes depuis la soumission (None = aucun)
+        progress: Recevoir la progression du génétique
+        on_progress: Fonction appelée avec chaque événement "progress"
+        on_accepted: Fonction appelée avec l'événement "accepted" (contient job_id)
+
+    Returns:
+        Dernier événement : "result" (status ok / cancelled / timeout / error), "rejected" ou "error"
+    """
+    reader, writer = await open_connection(address)
+    try:
+        await _send(writer, {"op": "solve", "solver": solver, "cities": cities, "params": params or {},
+                             "deadline": deadline, "progress": progress})
+        while True:
+            line = await reader.readline()
+            if not line:
+                return {"event": "error", "error": "connexion fermée par le serveur"}
+            event = json.loads(line)
+            if event["event"] == "accepted" and on_accepted is not None:
+                on_accepted(event)
+            elif event["event"] == "progress" and on_progress is not None:
+                on_progress(event)
+            elif event["event"] in TERMINAL_EVENTS:
+                return event
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def cancel(address, job_id):
+    return await _request(address, {"op": "cancel", "job_id": job_id})
+
+
+async def stats(address):
+    return await _request(address, {"op": "stats"})
+
+
+def solve(address, solver, cities, **kwargs):
+    """Version synchrone de submit()."""
+    return asyncio.run(submit(address, solver, cities, **kwargs))
+
+
+def main(argv=None):
+    from loader import load_cities
+
+    parser = argparse.ArgumentParser(description="Client du serveur de résolution TSP")
+    parser.add_argument("data", help="CSV des villes")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help="unix:/chemin/socket ou hôte:port")
+    parser.add_argument("--solver", choices=("christofides", "genetic"), default="christofides")
+    parser.add_argument("--params", default=None, help="Paramètres du solveur en JSON")
+    parser.add_argument("--deadline", type=float, default=None, help="Délai maximal (s)")
+    parser.add_argument("--quiet", action="store_true", help="Ne pas afficher la progression")
+    args = parser.parse_args(argv)
+
+    def show_progress(event):
+        print(f"  génération {event['generation']:5d} : {event['best_distance']:.2f} km", file=sys.stderr)
+
+    event = solve(args.address, args.solver, cities_from_dataframe(load_cities(args.data).to_dataframe()),
+                  params=json.loads(args.params) if args.params else None, deadline=args.deadline,
+                  progress=not args.quiet, on_progress=None if args.quiet else show_progress)
+    print(json.dumps(event, ensure_ascii=False))
+    return 0 if event.get("status") == "ok" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
-import pandas as pd
 # from utils import haversine, plot_graph_map, plot_graph, cristo_algo, cristo_plot, crist_steps
 from utils import cristo_algo, cristo_steps
 from genetique import *
+from loader import load_cities
 
 # ============ fichier principal  ===============
 # 
@@ -16,7 +16,7 @@ from genetique import *
 
 
 # ---------- Chargement du CSV -------------
-data = pd.read_csv("data/villes.csv")
+data = load_cities("data/villes.csv").to_dataframe()
 # ------------------------------------------
 
 
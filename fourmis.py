@@ -0,0 +1,227 @@
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from utils import haversine_matrix, nearest_neighbors, nearest_neighbor_tour
+from instrumentation import PhaseProfiler
+from loader import city_arrays
+
+# =======  Colonie de fourmis (Ant Colony System) pour le TSP =======
+#
+# ant_colony_tsp()....... Ant Colony System vectorisé, résultat au même format que genetic_tsp()
+# tour_length().......... longueur d'un ou de plusieurs tours
+#
+# Candidats et tour initial : nearest_neighbors() et nearest_neighbor_tour() (utils.py)
+#
+# Toutes les structures sont des tableaux numpy indexés par ville :
+#   - distances (n x n), phéromones (n x n), heuristique 1/distance^beta (n x n)
+#   - candidats (n x k) : une fourmi ne choisit hors de ses k plus proches voisins que
+#     lorsqu'ils sont tous déjà visités
+#   - les tours des m fourmis sont construits ensemble : à chaque pas, une seule opération
+#     numpy choisit la ville suivante de toutes les fourmis
+#
+# Règles ACS (Dorigo & Gambardella) :
+#   - choix : avec la probabilité q0 la meilleure arête (exploitation), sinon tirage proportionnel
+#     à tau * eta^beta (exploration)
+#   - mise à jour locale à chaque pas : tau <- (1 - xi) tau + xi tau0
+#   - mise à jour globale sur le meilleur tour : tau <- (1 - rho) tau + rho / L_best
+#
+# colonies > 1 lance des colonies indépendantes (graines différentes) dans un pool de processus
+# et garde la meilleure.
+#
+# ===================================================================
+
+
+def tour_length(dist, tours):
+    """Longueur d'un tour (1D) ou de plusieurs tours (2D, un par ligne)."""
+    return dist[tours, np.roll(tours, -1, axis=-1)].sum(axis=-1)
+
+
+def _construct_tours(dist, tau, eta_beta, candidates, n_ants, q0, xi, tau0, rng):
+    """
+    Construit les tours de toutes les fourmis, pas par pas, avec la mise à jour locale des phéromones.
+
+    Returns:
+        Tableau (n_ants x n) des tours
+    """
+    n = len(dist)
+    ants = np.arange(n_ants)
+    tours = np.empty((n_ants, n), dtype=np.int64)
+    visited = np.zeros((n_ants, n), dtype=bool)
+    current = rng.integers(n, size=n_ants)
+    tours[:, 0] = current
+    visited[ants, current] = True
+
+    for step in range(1, n):
+        cand = candidates[current]                                    # (m, k)
+        weights = tau[current[:, None], cand] * eta_beta[current[:, None], cand]
+        weights[visited[ants[:, None], cand]] = 0.0
+        total = weights.sum(axis=1)
+
+        # Exploitation (meilleure arête) ou exploration (roulette) parmi les candidats
+        exploit = np.argmax(weights, axis=1)
+        threshold = rng.random(n_ants) * total
+        roulette = np.minimum((np.cumsum(weights, axis=1) < threshold[:, None]).sum(axis=1), cand.shape[1] - 1)
+        choice = np.where(rng.random(n_ants) < q0, exploit, roulette)
+        following = cand[ants, choice]
+
+        # Tous les candidats déjà visités : meilleure ville parmi toutes les non visitées
+        stuck = np.flatnonzero(total <= 0)
+        if len(stuck):
+            scores = tau[current[stuck]] * eta_beta[current[stuck]]
+            scores[visited[stuck]] = -1.0
+            following[stuck] = np.argmax(scores, axis=1)
+
+        # Mise à jour locale (symétrique)
+        tau[current, following] = (1 - xi) * tau[current, following] + xi * tau0
+        tau[following, current] = tau[current, following]
+
+        tours[:, step] = following
+        visited[ants, following] = True
+        current = following
+
+    # Arête de retour
+    first = tours[:, 0]
+    tau[current, first] = (1 - xi) * tau[current, first] + xi * tau0
+    tau[first, current] = tau[current, first]
+    return tours
+
+
+def _run_colony(lat, lon, n_ants, iterations, beta, rho, q0, xi, k_neighbors, time_limit, seed, profile,
+                callback=None, verbose=False):
+    """
+    Exécute une colonie.
+
+    Returns:
+        Dictionnaire {"tour" (indices), "distance", "history", "iterations_run", "profile"}
+    """
+    profiler = PhaseProfiler(enabled=profile)
+    rng = np.random.default_rng(seed)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    with profiler.phase("distances"):
+        dist = haversine_matrix(lat, lon)
+    n = len(dist)
+    with profiler.phase("candidates"):
+        candidates = nearest_neighbors(dist, k_neighbors)
+        with np.errstate(divide="ignore"):
+            eta_beta = np.where(dist > 0, 1.0 / dist, 0.0) ** beta
+
+        best_tour = nearest_neighbor_tour(dist)
+        best_distance = float(tour_length(dist, best_tour))
+        tau0 = 1.0 / (n * best_distance)
+        tau = np.full((n, n), tau0)
+    history = {"best": [], "avg": []}
+
+    for iteration in range(iterations):
+        with profiler.phase("construction"):
+            tours = _construct_tours(dist, tau, eta_beta, candidates, n_ants, q0, xi, tau0, rng)
+        profiler.count("tours_built", n_ants)
+
+        with profiler.phase("evaluation"):
+            lengths = tour_length(dist, tours)
+            index = int(np.argmin(lengths))
+            if lengths[index] < best_distance:
+                best_distance = float(lengths[index])
+                best_tour = tours[index].copy()
+
+        # Mise à jour globale sur le meilleur tour
+        with profiler.phase("update"):
+            following = np.roll(best_tour, -1)
+            tau[best_tour, following] = (1 - rho) * tau[best_tour, following] + rho / best_distance
+            tau[following, best_tour] = tau[best_tour, following]
+
+        history["best"].append(best_distance)
+        history["avg"].append(float(lengths.mean()))
+        profiler.count("iterations")
+
+        if verbose and (iteration % 50 == 0 or iteration == iterations - 1):
+            print(f"Iteration {iteration:3d} | Meilleur: {best_distance:.2f} km | Moy: {history['avg'][-1]:.2f} km")
+
+        if callback is not None and callback(iteration, best_tour, best_distance, history["avg"][-1]):
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+
+    return {
+        "tour": best_tour,
+        "distance": best_distance,
+        "history": history,
+        "iterations_run": len(history["best"]),
+        "profile": profiler.as_dict()
+    }
+
+
+def _run_colony_job(args):
+    return _run_colony(*args)
+
+
+def ant_colony_tsp(data, n_ants=20, iterations=200, beta=2.0, rho=0.1, q0=0.9, xi=0.1,
+                   k_neighbors=15, colonies=1, workers=None, time_limit=None, seed=None, verbose=True,
+                   profile=False, callback=None):
+    """
+    Ant Colony System pour resoudre le TSP.
+
+    Args:
+        data: DataFrame avec colonnes Ville, Latitude, Longitude, ou Cities (loader.py)
+        n_ants: Nombre de fourmis par iteration
+        iterations: Nombre d'iterations
+        beta: Poids de l'heuristique 1/distance
+        rho: Taux d'evaporation de la mise a jour globale
+        q0: Probabilite de choisir la meilleure arete plutot que de tirer au sort
+        xi: Taux de la mise a jour locale
+        k_neighbors: Taille des listes de candidats (plus proches voisins)
+        colonies: Nombre de colonies independantes (en parallele si > 1)
+        workers: Nombre de processus pour les colonies (None = nombre de cœurs)
+        time_limit: Budget de temps en secondes par colonie, None = aucun
+        seed: Graine (la colonie c utilise seed + c)
+        verbose: Afficher les progres
+        profile: Collecter les temps par phase et les compteurs
+        callback: Fonction appelee a chaque iteration (colonie unique) avec (iteration, meilleur tour,
+                  meilleure distance, distance moyenne) ; si elle renvoie True, l'algorithme s'arrete
+
+    Returns:
+        Dictionnaire au format de genetic_tsp():
+            - best_tour, best_distance, pos, history ({"best", "avg"} par iteration)
+            - generations_run: Nombre d'iterations executees (meilleure colonie)
+            - colonies: Distance finale de chaque colonie
+            - profile: Temps par phase et compteurs (meilleure colonie)
+    """
+    cities, lat, lon = city_arrays(data)
+    pos = dict(zip(cities, zip(lon.tolist(), lat.tolist())))
+
+    if verbose:
+        print("\n=== Colonie de fourmis (ACS) - Démarrage ===")
+        print(f"Fourmis: {n_ants}, Iterations: {iterations}, Colonies: {colonies}, Candidats: {k_neighbors}")
+
+    seeds = [None if seed is None else seed + c for c in range(colonies)]
+    jobs = [(lat, lon, n_ants, iterations, beta, rho, q0, xi, k_neighbors, time_limit, colony_seed, profile)
+            for colony_seed in seeds]
+    if colonies == 1:
+        named_callback = None
+        if callback is not None:
+            def named_callback(iteration, tour, distance, avg_distance):
+                return callback(iteration, [cities[i] for i in tour], distance, avg_distance)
+        runs = [_run_colony(*jobs[0], callback=named_callback, verbose=verbose)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(_run_colony_job, jobs))
+
+    best = min(runs, key=lambda run: run["distance"])
+    best_tour = [cities[i] for i in best["tour"]]
+
+    if verbose:
+        print(f"\n=== Resultat final ===")
+        print(f"Meilleur tour trouve: {best['distance']:.2f} km")
+
+    return {
+        "best_tour": best_tour,
+        "best_distance": best["distance"],
+        "pos": pos,
+        "history": best["history"],
+        "n_ants": n_ants,
+        "iterations": iterations,
+        "generations_run": best["iterations_run"],
+        "colonies": [run["distance"] for run in runs],
+        "seed": seed,
+        "profile": best["profile"]
+    }
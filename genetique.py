@@ -1,18 +1,42 @@
+import time
 import random
+import hashlib
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
 import seaborn as sns
 import networkx as nx
 import matplotlib.pyplot as plt
 from mpl_toolkits.basemap import Basemap
-from utils import haversine, calculate_tour_distance, basemap
+from utils import (haversine, haversine_matrix, nearest_neighbors, tour_distance, calculate_tour_distance, basemap,
+                   project_positions, tour_to_indices, draw_segments, draw_complete_graph, draw_nodes, draw_labels,
+                   new_figure, finish_figure)
+from instrumentation import PhaseProfiler
+from loader import city_arrays
+from checkpoint import CheckpointWriter, load_checkpoint, rng_state_to_arrays, rng_state_from_arrays
 # from main import POP_SIZE, GENERATIONS
 
+CROSSOVERS = ("ox", "erx", "eax")
+EAX_NEIGHBORS = 10      # candidats pour relier les sous-tours d'un enfant EAX
+
 # =======  Algorithme Genetique pour le TSP =======
 #
 # genetic_tsp() implemente un algorithme genetique classique
 # avec selection par tournoi, croisement OX et mutation par swap
 #
+# crossover= choisit le croisement :
+#   - "ox"  : Order Crossover, garde l'ordre relatif des villes mais pas leurs voisines
+#   - "erx" : Edge Recombination, l'enfant reprend les aretes des parents (tables d'adjacence O(n))
+#   - "eax" : Edge Assembly (un AB-cycle par enfant), aretes des parents + fusion des sous-tours
+# ERX et EAX travaillent sur des listes d'indices de villes.
+#
+# canonical_tour_key()... empreinte d'un tour, invariante par rotation et par sens de parcours
+# FitnessCache........... cache LRU borne des distances, indexe par cette empreinte
+#
+# Les elites et les clones issus de parents identiques ne sont evalues qu'une fois ;
+# replace_duplicates=True remplace en plus les doublons de la population par des tours
+# aleatoires pour retarder la convergence prematuree.
+#
 # =================================================
 
 
@@ -30,38 +54,129 @@ ma_palette = [land_color, sea_color, odd_color, genetic_color, cristofides_color
 # sns.palplot(ma_palette)
 
 
-def calculate_tour_distance(tour, data):
+def canonical_tour_key(tour, city_index):
     """
-    Calcule la distance totale d'un tour (chemin hamiltonien ferme).
+    Empreinte d'un tour ferme, identique pour toutes ses rotations et ses deux sens de parcours.
 
     Args:
-        tour: Liste des noms de villes dans l'ordre de visite
-        data: DataFrame avec colonnes Ville, Latitude, Longitude
+        tour: Liste des villes
+        city_index: Dictionnaire {ville: indice}
 
     Returns:
-        Distance totale en km
+        (empreinte de 16 octets, indices des villes dans l'ordre canonique)
     """
-    total_distance = 0
-    for i in range(len(tour)):
-        city1 = tour[i]
-        city2 = tour[(i + 1) % len(tour)]  # retour e la premiere ville
+    order = np.fromiter((city_index[city] for city in tour), dtype=np.int32, count=len(tour))
+    # Rotation : la ville d'indice minimal en tete ; sens : le plus petit voisin en second
+    order = np.roll(order, -int(np.argmin(order)))
+    if len(order) > 2 and order[-1] < order[1]:
+        order[1:] = order[1:][::-1].copy()
+    return hashlib.blake2b(order.tobytes(), digest_size=16).digest(), order
 
-        # Recuperer les coordonnees
-        lat1, lon1 = data.loc[data["Ville"] == city1, ["Latitude", "Longitude"]].values[0]
-        lat2, lon2 = data.loc[data["Ville"] == city2, ["Latitude", "Longitude"]].values[0]
 
-        total_distance += haversine(lat1, lon1, lat2, lon2)
+class FitnessCache:
+    """
+    Cache LRU borne {empreinte de tour: distance}.
 
-    return total_distance
+    Args:
+        maxsize: Nombre maximal d'entrees (les moins recemment utilisees sont evincees)
+    """
 
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        distance = self.entries.get(key)
+        if distance is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return distance
+
+    def put(self, key, distance):
+        self.entries[key] = distance
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_arrays(self):
+        """Entrees, de la moins a la plus recemment utilisee (pour les checkpoints)."""
+        keys = np.frombuffer(b"".join(self.entries), dtype=np.uint8).reshape(len(self.entries), 16)
+        return {"cache_keys": keys, "cache_values": np.array(list(self.entries.values()), dtype=float)}
+
+    def load_arrays(self, arrays):
+        for key, distance in zip(arrays["cache_keys"], arrays["cache_values"].tolist()):
+            self.put(key.tobytes(), distance)
+
+
+def evaluate_population(population, coordinates, cities, city_index, cache=None, replace_duplicates=False,
+                        rng=random):
+    """
+    Distances des tours de la population, chaque tour distinct n'etant evalue qu'une fois.
+
+    Args:
+        population: Liste de tours (modifiee en place si replace_duplicates)
+        coordinates: (latitudes, longitudes) indexees comme cities, en listes Python
+        cities: Liste des villes (ordre des indices)
+        city_index: Dictionnaire {ville: indice}
+        cache: FitnessCache (None = pas de memoisation entre generations)
+        replace_duplicates: Remplacer les doublons par des tours aleatoires
+        rng: Generateur aleatoire (module random par defaut)
 
-def create_initial_population(cities, pop_size):
+    Returns:
+        (distances, nombre d'evaluations effectives, nombre de doublons remplaces)
+    """
+    if cache is None and not replace_duplicates:
+        distances = [tour_distance([city_index[city] for city in tour], *coordinates) for tour in population]
+        return distances, len(distances), 0
+
+    distances = []
+    seen = {}
+    evaluations = replaced = 0
+    for i, tour in enumerate(population):
+        key, order = canonical_tour_key(tour, city_index)
+        if key in seen:
+            if not replace_duplicates:
+                distances.append(seen[key])
+                continue
+            # Doublon : remplace par un tour aleatoire
+            tour = cities.copy()
+            rng.shuffle(tour)
+            population[i] = tour
+            replaced += 1
+            key, order = canonical_tour_key(tour, city_index)
+
+        distance = seen.get(key)
+        if distance is None and cache is not None:
+            distance = cache.get(key)
+        if distance is None:
+            # Evaluation dans l'ordre canonique : meme valeur pour toutes les rotations du tour
+            distance = tour_distance(order, *coordinates)
+            evaluations += 1
+            if cache is not None:
+                cache.put(key, distance)
+        seen[key] = distance
+        distances.append(distance)
+    return distances, evaluations, replaced
+
+
+def create_initial_population(cities, pop_size, rng=random):
     """
     Cree une population initiale de tours aleatoires.
 
     Args:
         cities: Liste des noms de villes
         pop_size: Taille de la population
+        rng: Generateur aleatoire (module random par defaut)
 
     Returns:
         Liste de tours (chaque tour est une liste de villes)
@@ -69,7 +184,7 @@ def create_initial_population(cities, pop_size):
     population = []
     for _ in range(pop_size):
         tour = cities.copy()
-        random.shuffle(tour)
+        rng.shuffle(tour)
         population.append(tour)
     return population
 
@@ -89,7 +204,7 @@ def fitness(tour, data):
     return 1 / distance if distance > 0 else 0
 
 
-def tournament_selection(population, fitnesses, tournament_size=5):
+def tournament_selection(population, fitnesses, tournament_size=5, rng=random):
     """
     Selection par tournoi : choisit le meilleur individu parmi un echantillon aleatoire.
 
@@ -97,22 +212,24 @@ def tournament_selection(population, fitnesses, tournament_size=5):
         population: Liste de tours
         fitnesses: Liste des fitness correspondants
         tournament_size: Taille du tournoi
+        rng: Generateur aleatoire (module random par defaut)
 
     Returns:
         Un tour selectionne
     """
-    tournament_indices = random.sample(range(len(population)), tournament_size)
+    tournament_indices = rng.sample(range(len(population)), tournament_size)
     tournament_fitnesses = [fitnesses[i] for i in tournament_indices]
     winner_index = tournament_indices[tournament_fitnesses.index(max(tournament_fitnesses))]
     return population[winner_index].copy()
 
 
-def order_crossover(parent1, parent2):
+def order_crossover(parent1, parent2, rng=random):
     """
     Croisement OX (Order Crossover) : preserve l'ordre relatif des villes.
 
     Args:
         parent1, parent2: Tours parents
+        rng: Generateur aleatoire (module random par defaut)
 
     Returns:
         Deux enfants
@@ -120,7 +237,7 @@ def order_crossover(parent1, parent2):
     size = len(parent1)
 
     # Choisir deux points de coupure
-    start, end = sorted(random.sample(range(size), 2))
+    start, end = sorted(rng.sample(range(size), 2))
 
     # Creer l'enfant 1
     child1 = [None] * size
@@ -146,53 +263,344 @@ def order_crossover(parent1, parent2):
     return child1, child2
 
 
-def swap_mutation(tour, mutation_rate=0.1):
+def tour_adjacency(tour):
+    """
+    Table d'adjacence d'un tour ferme donne par indices : adjacency[ville] = [precedente, suivante].
+    """
+    n = len(tour)
+    adjacency = [None] * n
+    for i, city in enumerate(tour):
+        adjacency[city] = [tour[i - 1], tour[(i + 1) % n]]
+    return adjacency
+
+
+def _adjacency_to_tour(adjacency):
+    """Parcourt un cycle hamiltonien donne par sa table d'adjacence (degre 2 partout)."""
+    tour = [0]
+    previous, current = None, 0
+    for _ in range(len(adjacency) - 1):
+        first, second = adjacency[current]
+        previous, current = current, (second if first == previous else first)
+        tour.append(current)
+    return tour
+
+
+def _erx_child(adjacency1, adjacency2, start, rng):
+    n = len(adjacency1)
+    edges = [set(adjacency1[city]) | set(adjacency2[city]) for city in range(n)]
+    unvisited = list(range(n))
+    where = list(range(n))
+    child = []
+    current = start
+    while True:
+        child.append(current)
+        # Retrait O(1) de la liste des villes non visitees (echange avec la derniere)
+        last = unvisited.pop()
+        if last != current:
+            unvisited[where[current]] = last
+            where[last] = where[current]
+        for neighbor in edges[current]:
+            edges[neighbor].discard(current)
+        if len(child) == n:
+            return child
+        candidates = edges[current]
+        if candidates:
+            # Voisin ayant le moins d'aretes restantes (le plus menace d'isolement)
+            fewest = min(len(edges[city]) for city in candidates)
+            options = sorted(city for city in candidates if len(edges[city]) == fewest)
+            current = options[0] if len(options) == 1 else rng.choice(options)
+        else:
+            current = unvisited[rng.randrange(len(unvisited))]
+
+
+def edge_recombination_crossover(parent1, parent2, rng=random):
+    """
+    Croisement ERX (Edge Recombination) : l'enfant reprend autant que possible les aretes des parents.
+
+    Chaque ville garde la liste (au plus 4) de ses voisines dans l'un ou l'autre parent ; on avance
+    vers la voisine non visitee qui a le moins de voisines restantes, et au hasard seulement si
+    toutes sont visitees. Cout O(n).
+
+    Args:
+        parent1, parent2: Tours parents (indices de villes)
+        rng: Generateur aleatoire (module random par defaut)
+
+    Returns:
+        Deux enfants (indices), partant de la premiere ville de chaque parent
+    """
+    adjacency1, adjacency2 = tour_adjacency(parent1), tour_adjacency(parent2)
+    return (_erx_child(adjacency1, adjacency2, parent1[0], rng),
+            _erx_child(adjacency1, adjacency2, parent2[0], rng))
+
+
+def _ab_cycles(adjacency_a, adjacency_b, rng):
+    """
+    Decompose les aretes non communes des deux parents en AB-cycles (aretes de A et de B alternees).
+
+    Returns:
+        Liste de cycles ; un cycle est (sommets v0..vk avec vk = v0, parite de la premiere arete de A)
+    """
+    n = len(adjacency_a)
+    remaining = (
+        [[city for city in adjacency_a[v] if city not in adjacency_b[v]] for v in range(n)],
+        [[city for city in adjacency_b[v] if city not in adjacency_a[v]] for v in range(n)]
+    )
+    cycles = []
+    for start in range(n):
+        while remaining[0][start]:
+            # Marche alternee : l'arete i du chemin vient de A si i est pair, de B sinon
+            path = [start]
+            seen = {start: [0]}
+            while True:
+                step = len(path) - 1
+                edges = remaining[step % 2]
+                current = path[-1]
+                following = edges[current].pop(rng.randrange(len(edges[current])))
+                edges[following].remove(current)
+                path.append(following)
+                step += 1
+                closing = [j for j in seen.get(following, []) if j % 2 == step % 2]
+                if not closing:
+                    seen.setdefault(following, []).append(step)
+                    continue
+                j = closing[-1]
+                cycles.append((path[j:], j % 2))
+                for city in path[j + 1:]:
+                    seen[city] = [i for i in seen[city] if i <= j]
+                del path[j + 1:]
+                if len(path) == 1:
+                    break
+    return cycles
+
+
+def _replace_neighbor(adjacency, city, old, new):
+    row = adjacency[city]
+    row[row.index(old)] = new
+
+
+def _merge_subtours(adjacency, dist, neighbors):
+    """
+    Relie les sous-tours d'une table d'adjacence en un seul tour : le plus petit sous-tour est
+    raccorde a un autre par l'echange d'aretes (u, u') / (v, v') le moins couteux, v parmi les
+    plus proches voisins de u (toutes les villes si aucun voisin n'est hors du sous-tour).
+
+    Returns:
+        Nombre de fusions effectuees
+    """
+    n = len(adjacency)
+    label = [-1] * n
+    members = {}
+    for start in range(n):
+        if label[start] != -1:
+            continue
+        cycle = []
+        previous, current = None, start
+        while label[current] == -1:
+            label[current] = start
+            cycle.append(current)
+            first, second = adjacency[current]
+            previous, current = current, (second if first == previous else first)
+        members[start] = cycle
+
+    merges = 0
+    while len(members) > 1:
+        small = min(members, key=lambda key: len(members[key]))
+        best, best_cost = None, float("inf")
+        for candidates in (None, range(n)):
+            for u in members[small]:
+                for v in (neighbors[u] if candidates is None else candidates):
+                    if label[v] == small:
+                        continue
+                    for u2 in adjacency[u]:
+                        for v2 in adjacency[v]:
+                            # Retire (u, u2) et (v, v2), ajoute (u, a) et (u2, b)
+                            for a, b in ((v, v2), (v2, v)):
+                                cost = dist[u][a] + dist[u2][b] - dist[u][u2] - dist[v][v2]
+                                if cost < best_cost:
+                                    best, best_cost = (u, u2, v, v2, a, b), cost
+            if best is not None:
+                break
+        u, u2, v, v2, a, b = best
+        _replace_neighbor(adjacency, u, u2, a)
+        _replace_neighbor(adjacency, u2, u, b)
+        _replace_neighbor(adjacency, v, v2, u if a == v else u2)
+        _replace_neighbor(adjacency, v2, v, u if a == v2 else u2)
+        target = label[v]
+        for city in members[small]:
+            label[city] = target
+        members[target].extend(members.pop(small))
+        merges += 1
+    return merges
+
+
+def _eax_child(base, cycle, from_a, dist, neighbors):
+    """Applique un AB-cycle a un parent (A si from_a, sinon B) puis fusionne les sous-tours."""
+    adjacency = [list(row) for row in base]
+    vertices, first_parity = cycle
+    for i in range(len(vertices) - 1):
+        x, y = vertices[i], vertices[i + 1]
+        is_a_edge = (first_parity + i) % 2 == 0
+        if is_a_edge == from_a:
+            _replace_neighbor(adjacency, x, y, None)
+            _replace_neighbor(adjacency, y, x, None)
+    for i in range(len(vertices) - 1):
+        x, y = vertices[i], vertices[i + 1]
+        is_a_edge = (first_parity + i) % 2 == 0
+        if is_a_edge != from_a:
+            _replace_neighbor(adjacency, x, None, y)
+            _replace_neighbor(adjacency, y, None, x)
+    _merge_subtours(adjacency, dist, neighbors)
+    return _adjacency_to_tour(adjacency)
+
+
+def edge_assembly_crossover(parent1, parent2, dist, neighbors, rng=random):
+    """
+    Croisement de type EAX (Edge Assembly) : les aretes non communes des parents A et B sont
+    decomposees en AB-cycles ; appliquer un AB-cycle a A (retirer ses aretes de A, ajouter ses
+    aretes de B) donne des sous-tours, relies ensuite par les echanges d'aretes les moins couteux.
+
+    Variante un seul AB-cycle : l'enfant 1 applique a A le cycle qui raccourcit le plus A, l'enfant 2
+    applique a B celui qui raccourcit le plus B. Cout O(n) hors fusion des sous-tours.
+
+    Args:
+        parent1, parent2: Tours parents (indices de villes)
+        dist: Matrice des distances (listes Python)
+        neighbors: Plus proches voisins de chaque ville (listes Python)
+        rng: Generateur aleatoire (module random par defaut)
+
+    Returns:
+        Deux enfants (indices) ; des copies des parents s'ils ont les memes aretes
+    """
+    adjacency_a, adjacency_b = tour_adjacency(parent1), tour_adjacency(parent2)
+    cycles = _ab_cycles(adjacency_a, adjacency_b, rng)
+    if not cycles:
+        return list(parent1), list(parent2)
+
+    # Gain de chaque cycle applique a A : longueur des aretes de B ajoutees - celles de A retirees
+    deltas = []
+    for vertices, first_parity in cycles:
+        delta = 0.0
+        for i in range(len(vertices) - 1):
+            length = dist[vertices[i]][vertices[i + 1]]
+            delta += -length if (first_parity + i) % 2 == 0 else length
+        deltas.append(delta)
+    best_for_a = min(range(len(cycles)), key=deltas.__getitem__)
+    best_for_b = max(range(len(cycles)), key=deltas.__getitem__)
+    return (_eax_child(adjacency_a, cycles[best_for_a], True, dist, neighbors),
+            _eax_child(adjacency_b, cycles[best_for_b], False, dist, neighbors))
+
+
+def swap_mutation(tour, mutation_rate=0.1, rng=random):
     """
     Mutation par echange : echange deux villes avec une certaine probabilite.
 
     Args:
         tour: Tour e muter
         mutation_rate: Probabilite de mutation
+        rng: Generateur aleatoire (module random par defaut)
 
     Returns:
         Tour mute
     """
     tour = tour.copy()
-    if random.random() < mutation_rate:
-        i, j = random.sample(range(len(tour)), 2)
+    if rng.random() < mutation_rate:
+        i, j = rng.sample(range(len(tour)), 2)
         tour[i], tour[j] = tour[j], tour[i]
     return tour
 
 
-def inversion_mutation(tour, mutation_rate=0.1):
+def inversion_mutation(tour, mutation_rate=0.1, rng=random):
     """
     Mutation par inversion : inverse un segment du tour.
 
     Args:
         tour: Tour e muter
         mutation_rate: Probabilite de mutation
+        rng: Generateur aleatoire (module random par defaut)
 
     Returns:
         Tour mute
     """
     tour = tour.copy()
-    if random.random() < mutation_rate:
-        i, j = sorted(random.sample(range(len(tour)), 2))
+    if rng.random() < mutation_rate:
+        i, j = sorted(rng.sample(range(len(tour)), 2))
         tour[i:j] = reversed(tour[i:j])
     return tour
 
 
-def genetic_tsp(data, pop_size=100, generations=500, mutation_rate=0.1, elite_size=5, verbose=True):
+def _checkpoint_arrays(cities, population, best_tour, best_distance, best_history, avg_history, next_generation,
+                       rng, seed, cache=None):
+    """Instantané de l'état de genetic_tsp() au debut de la generation next_generation (tableaux numpy)."""
+    city_index = {city: i for i, city in enumerate(cities)}
+    arrays = {
+        "cities": np.array(cities, dtype=str),
+        "population": np.array([[city_index[city] for city in tour] for tour in population], dtype=np.int32),
+        "best_tour": np.array([city_index[city] for city in best_tour] if best_tour else [], dtype=np.int32),
+        "best_distance": np.array(best_distance, dtype=float),
+        "history_best": np.array(best_history, dtype=float),
+        "history_avg": np.array(avg_history, dtype=float),
+        "next_generation": np.array(next_generation, dtype=np.int64),
+        "seed": np.array(-1 if seed is None else seed, dtype=np.int64)
+    }
+    arrays.update(rng_state_to_arrays(rng.getstate()))
+    if cache is not None:
+        arrays.update(cache.to_arrays())
+    return arrays
+
+
+def _restore_checkpoint(path, cities, pop_size, rng, cache=None):
+    """
+    Relit un checkpoint de genetic_tsp() et restaure le generateur aleatoire (et le cache des distances).
+
+    Returns:
+        (population, meilleur tour, meilleure distance, historique best, historique avg, generation de reprise)
+    """
+    arrays = load_checkpoint(path)
+    saved_cities = arrays["cities"].tolist()
+    if saved_cities != list(cities):
+        raise ValueError(f"Checkpoint {path} : les villes ne correspondent pas a data (meme liste, meme ordre)")
+    if len(arrays["population"]) != pop_size:
+        raise ValueError(f"Checkpoint {path} : population de {len(arrays['population'])} individus, "
+                         f"pop_size={pop_size}")
+    rng.setstate(rng_state_from_arrays(arrays))
+    if cache is not None and "cache_keys" in arrays:
+        cache.load_arrays(arrays)
+    population = [[saved_cities[i] for i in tour] for tour in arrays["population"].tolist()]
+    best_tour = [saved_cities[i] for i in arrays["best_tour"].tolist()] or None
+    return (population, best_tour, float(arrays["best_distance"]), arrays["history_best"].tolist(),
+            arrays["history_avg"].tolist(), int(arrays["next_generation"]))
+
+
+def genetic_tsp(data, pop_size=100, generations=500, mutation_rate=0.1, elite_size=5, verbose=True,
+                profile=False, seed=None, tournament_size=5, time_limit=None, callback=None, initial_tours=None,
+                checkpoint_path=None, checkpoint_every=50, resume_from=None, cache_size=10000,
+                replace_duplicates=False, crossover="ox"):
     """
     Algorithme genetique pour resoudre le TSP.
 
     Args:
-        data: DataFrame avec colonnes Ville, Latitude, Longitude
+        data: DataFrame avec colonnes Ville, Latitude, Longitude, ou Cities (loader.py)
         pop_size: Taille de la population
         generations: Nombre de generations
         mutation_rate: Taux de mutation
         elite_size: Nombre d'individus elites preserves
         verbose: Afficher les progres
+        profile: Collecter les temps par phase et les compteurs (cle "profile" du resultat)
+        seed: Graine du generateur aleatoire (None = non reproductible)
+        tournament_size: Taille du tournoi de selection
+        time_limit: Budget de temps en secondes (arret apres la generation en cours), None = aucun
+        callback: Fonction appelee a chaque generation avec (generation, meilleur tour, meilleure distance,
+                  distance moyenne) ; si elle renvoie True, l'algorithme s'arrete
+        initial_tours: Tours (listes de villes) places dans la population initiale, ex. un tour deja
+                       optimise pour un depart a chaud ; le reste de la population est aleatoire
+        checkpoint_path: Fichier .npz ou l'etat est sauvegarde toutes les checkpoint_every generations
+                         (ecriture atomique en tache de fond) et a la fin du run ; None = pas de checkpoint
+        checkpoint_every: Intervalle entre deux checkpoints, en generations
+        resume_from: Checkpoint a reprendre ; le run continue a l'identique (population, historique,
+                     generateur aleatoire) jusqu'a `generations` au total. seed et initial_tours sont ignores
+        cache_size: Taille du cache LRU des distances (0 = pas de cache entre generations)
+        replace_duplicates: Remplacer les tours en double dans la population par des tours aleatoires
+        crossover: "ox" (Order Crossover), "erx" (Edge Recombination) ou "eax" (Edge Assembly)
 
     Returns:
         Dictionnaire contenant:
@@ -201,36 +609,77 @@ def genetic_tsp(data, pop_size=100, generations=500, mutation_rate=0.1, elite_si
             - G: Graphe complet
             - pos: Positions des villes
             - history: Historique des distances par generation
+            - generations_run: Nombre de generations effectivement executees
+            - profile: Temps par phase et compteurs (vide si profile=False)
     """
-    cities = data["Ville"].tolist()
+    if crossover not in CROSSOVERS:
+        raise ValueError(f"crossover inconnu : {crossover!r} (attendu : {', '.join(CROSSOVERS)})")
+    profiler = PhaseProfiler(enabled=profile)
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    tournament_size = min(tournament_size, pop_size)
+
+    cities, lat, lon = city_arrays(data)
+    city_index = {city: i for i, city in enumerate(cities)}
+    coordinates = (lat.tolist(), lon.tolist())
+    cache = FitnessCache(cache_size) if cache_size else None
 
     # Creer le graphe complet pour la visualisation
-    G = nx.Graph()
-    for i, v1 in data.iterrows():
-        for j, v2 in data.iterrows():
-            if i < j:
-                dist = haversine(v1["Latitude"], v1["Longitude"], v2["Latitude"], v2["Longitude"])
-                G.add_edge(v1["Ville"], v2["Ville"], weight=dist)
-
-    pos = {row["Ville"]: (row["Longitude"], row["Latitude"]) for _, row in data.iterrows()}
-
-    # Population initiale
-    population = create_initial_population(cities, pop_size)
-
-    best_distance_history = []
-    avg_distance_history = []
-
-    best_ever_tour = None
-    best_ever_distance = float('inf')
+    with profiler.phase("graph"):
+        G = nx.Graph()
+        lat, lon = coordinates
+        for i in range(len(cities)):
+            for j in range(i + 1, len(cities)):
+                dist = haversine(lat[i], lon[i], lat[j], lon[j])
+                G.add_edge(cities[i], cities[j], weight=dist)
+
+        pos = dict(zip(cities, zip(lon, lat)))
+
+        # EAX : matrice des distances et plus proches voisins pour relier les sous-tours
+        if crossover == "eax":
+            dist_matrix = haversine_matrix(lat, lon)
+            eax_dist = dist_matrix.tolist()
+            eax_neighbors = nearest_neighbors(dist_matrix, EAX_NEIGHBORS).tolist()
+
+    # Population initiale, ou etat repris d'un checkpoint
+    with profiler.phase("init"):
+        if resume_from is not None:
+            (population, best_ever_tour, best_ever_distance, best_distance_history, avg_distance_history,
+             start_generation) = _restore_checkpoint(resume_from, cities, pop_size, rng, cache)
+        else:
+            population = create_initial_population(cities, pop_size, rng)
+            for i, tour in enumerate((initial_tours or [])[:pop_size]):
+                if sorted(tour) != sorted(cities):
+                    raise ValueError("initial_tours : chaque tour doit visiter exactement les villes de data")
+                population[i] = list(tour)
+
+            best_distance_history = []
+            avg_distance_history = []
+
+            best_ever_tour = None
+            best_ever_distance = float('inf')
+            start_generation = 0
+
+    writer = CheckpointWriter(checkpoint_path) if checkpoint_path is not None else None
+    # Arret anticipe (callback, budget de temps) : le checkpoint final repart de la generation courante
+    stopped_early = False
 
     if verbose:
         print("\n=== Algorithme Genetique - Démarrage ===")
         print(f"Population: {pop_size}, Generations: {generations}, Mutation: {mutation_rate}")
+        if resume_from is not None:
+            print(f"Reprise de {resume_from} a la generation {start_generation}")
 
-    for generation in range(generations):
+    generation = start_generation
+    for generation in range(start_generation, generations):
         # Calculer les fitness
-        fitnesses = [fitness(tour, data) for tour in population]
-        distances = [calculate_tour_distance(tour, data) for tour in population]
+        with profiler.phase("evaluation"):
+            distances, evaluations, replaced = evaluate_population(population, coordinates, cities, city_index, cache,
+                                                                   replace_duplicates, rng)
+            fitnesses = [1 / distance if distance > 0 else 0 for distance in distances]
+        profiler.count("evaluations", evaluations)
+        profiler.count("evaluations_saved", len(population) - evaluations)
+        profiler.count("duplicates_replaced", replaced)
 
         # Meilleur de cette generation
         best_idx = distances.index(min(distances))
@@ -251,29 +700,82 @@ def genetic_tsp(data, pop_size=100, generations=500, mutation_rate=0.1, elite_si
             print(f"Generation {generation:3d} | Meilleur: {best_distance:.2f} km | "
                   f"Meilleur absolu: {best_ever_distance:.2f} km | Moy: {avg_distance_history[-1]:.2f} km")
 
+        # Suivi externe (affichage en direct, progression) : peut demander l'arret
+        if callback is not None and callback(generation, best_ever_tour, best_ever_distance, avg_distance_history[-1]):
+            stopped_early = True
+            break
+
+        # Budget de temps epuise : on garde le meilleur tour evalue
+        if deadline is not None and time.perf_counter() >= deadline:
+            stopped_early = True
+            break
+
         # elitisme : garder les meilleurs
-        sorted_indices = sorted(range(len(distances)), key=lambda i: distances[i])
-        elite = [population[i].copy() for i in sorted_indices[:elite_size]]
+        with profiler.phase("elitism"):
+            sorted_indices = sorted(range(len(distances)), key=lambda i: distances[i])
+            elite = [population[i].copy() for i in sorted_indices[:elite_size]]
 
         # Nouvelle generation
         new_population = elite.copy()
 
         while len(new_population) < pop_size:
             # Selection
-            parent1 = tournament_selection(population, fitnesses)
-            parent2 = tournament_selection(population, fitnesses)
+            with profiler.phase("selection"):
+                parent1 = tournament_selection(population, fitnesses, tournament_size, rng)
+                parent2 = tournament_selection(population, fitnesses, tournament_size, rng)
 
             # Croisement
-            child1, child2 = order_crossover(parent1, parent2)
+            with profiler.phase("crossover"):
+                if crossover == "ox":
+                    child1, child2 = order_crossover(parent1, parent2, rng)
+                else:
+                    order1 = [city_index[city] for city in parent1]
+                    order2 = [city_index[city] for city in parent2]
+                    if crossover == "erx":
+                        order1, order2 = edge_recombination_crossover(order1, order2, rng)
+                    else:
+                        order1, order2 = edge_assembly_crossover(order1, order2, eax_dist, eax_neighbors, rng)
+                    child1 = [cities[i] for i in order1]
+                    child2 = [cities[i] for i in order2]
+            profiler.count("crossovers")
 
             # Mutation
-            child1 = swap_mutation(child1, mutation_rate)
-            child2 = inversion_mutation(child2, mutation_rate)
+            with profiler.phase("mutation"):
+                child1 = swap_mutation(child1, mutation_rate, rng)
+                child2 = inversion_mutation(child2, mutation_rate, rng)
+            profiler.count("mutation_calls", 2)
 
             new_population.extend([child1, child2])
 
         # Tronquer si necessaire
         population = new_population[:pop_size]
+        profiler.count("generations")
+
+        # Checkpoint periodique : copie de l'etat ici, ecriture dans un thread
+        if writer is not None and (generation + 1) % checkpoint_every == 0:
+            with profiler.phase("checkpoint"):
+                writer.submit(_checkpoint_arrays(cities, population, best_ever_tour, best_ever_distance,
+                                                 best_distance_history, avg_distance_history, generation + 1,
+                                                 rng, seed, cache))
+    else:
+        generation = max(generations, start_generation)
+
+    if writer is not None:
+        # Arret anticipe : la generation courante sera reevaluee a la reprise, on l'enleve donc de
+        # l'historique. La reprise reste exacte : avec replace_duplicates=True, l'evaluation retire les
+        # clones avec rng, mais la population sauvegardee est deja dedupliquee et n'en tire plus aucun
+        keep = len(best_distance_history) - 1 if stopped_early else len(best_distance_history)
+        with profiler.phase("checkpoint"):
+            writer.close(_checkpoint_arrays(cities, population, best_ever_tour, best_ever_distance,
+                                            best_distance_history[:keep], avg_distance_history[:keep],
+                                            generation, rng, seed, cache))
+        profiler.set("checkpoints_written", writer.written)
+        profiler.set("checkpoints_skipped", writer.skipped)
+    if cache is not None:
+        profiler.set("cache_hits", cache.hits)
+        profiler.set("cache_misses", cache.misses)
+        profiler.set("cache_evictions", cache.evictions)
+        profiler.set("cache_hit_rate", round(cache.hit_rate(), 4))
 
     if verbose:
         print(f"\n=== Resultat final ===")
@@ -290,11 +792,15 @@ def genetic_tsp(data, pop_size=100, generations=500, mutation_rate=0.1, elite_si
             "avg": avg_distance_history
         },
         "pop_size": pop_size,
-        "generations": generations
+        "generations": generations,
+        "generations_run": len(best_distance_history),
+        "seed": seed,
+        "profile": profiler.as_dict()
     }
 
 
-def genetic_plot(result, bg_color='lightblue', show_graph=True, pop_size=None, generations=None):
+def genetic_plot(result, bg_color='lightblue', show_graph=True, pop_size=None, generations=None,
+                 full_graph_mode="auto", output=None):
     """
     Affiche le meilleur tour trouve par l'algorithme genetique sur une carte.
 
@@ -302,46 +808,47 @@ def genetic_plot(result, bg_color='lightblue', show_graph=True, pop_size=None, g
         result: Dictionnaire retourne par genetic_tsp()
         bg_color: Couleur de fond du continent
         show_graph: Afficher le graphe complet en arriere-plan
+        full_graph_mode: Rendu du graphe complet ("auto", "full", "subsample", "density")
+        output: Fichier image a ecrire (PNG/SVG) au lieu d'afficher la figure
+
+    Returns:
+        Chemin du fichier ecrit, ou None en mode interactif
     """
     best_tour = result["best_tour"]
     best_distance = result["best_distance"]
-    G = result["G"]
     pos = result["pos"]
 
-    plt.figure(figsize=(12, 10))
+    fig = new_figure((12, 10), output)
+    ax = fig.add_subplot(111)
 
     # --- Creation de la carte de fond ---
-    m = basemap(pos)
+    m = basemap(pos, ax=ax)
 
     # --- Convertir positions lat/lon en coordonnees projetees ---
-    x, y = m([coord[0] for coord in pos.values()], [coord[1] for coord in pos.values()])
-    projected_pos = {n: (x_i, y_i) for n, x_i, y_i in zip(G.nodes(), x, y)}
+    names, x, y, index = project_positions(m, pos)
 
     # --- Graphe complet en arriere-plan (optionnel) ---
     if show_graph:
-        nx.draw_networkx_edges(G, projected_pos, edge_color='gray', width=1, alpha=0.2)
+        draw_complete_graph(ax, x, y, mode=full_graph_mode, color='gray', width=1, alpha=0.2)
 
     # --- Dessiner le tour ---
-    tour_edges = [(best_tour[i], best_tour[(i + 1) % len(best_tour)]) for i in range(len(best_tour))]
-    nx.draw_networkx_edges(G, projected_pos, edgelist=tour_edges,
-                          edge_color=genetic_color, width=3, alpha=0.8, label=f'Tour genetique')
+    draw_segments(ax, x, y, tour_to_indices(best_tour, index), colors=[genetic_color], linewidths=3, alpha=0.8,
+                  label=f'Tour genetique')
 
     # --- Sommets ---
-    nx.draw_networkx_nodes(G, projected_pos, node_color='red', node_size=250)
+    draw_nodes(ax, x, y, range(len(names)), 'red', 250)
 
     # --- Labels ---
-    nx.draw_networkx_labels(G, projected_pos, font_size=8, font_color='black', font_weight='bold')
+    draw_labels(ax, x, y, names, font_size=8)
 
-    plt.legend(loc='upper right', fontsize=10, frameon=True, fancybox=True, shadow=True)
-
-    plt.title
+    ax.legend(loc='upper right', fontsize=10, frameon=True, fancybox=True, shadow=True)
     
     # ---- Infos sur la population et le nombre de générations -----------
-    plt.text(0.95, 0.85,
+    ax.text(0.95, 0.85,
          f"Population Size : {pop_size}\n"
          f"Generations : {generations}\n"
          f"Distance totale : {best_distance:.2f} km",
-         transform=plt.gca().transAxes,
+         transform=ax.transAxes,
          ha='right', va='top',
          multialignment='left',       # 👈 corrige l’alignement des lignes internes
          color='white',
@@ -349,24 +856,29 @@ def genetic_plot(result, bg_color='lightblue', show_graph=True, pop_size=None, g
                    ec='none', facecolor=genetic_color, alpha=0.8),
          fontsize=12)
     
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    return finish_figure(fig, output)
 
 
-def plot_genetic_convergence(history):
+def plot_genetic_convergence(history, output=None):
     """
     Affiche la courbe de convergence de l'algorithme genetique.
 
     Args:
         history: Dictionnaire avec keys 'best' et 'avg' (historique des distances)
+        output: Fichier image a ecrire (PNG/SVG) au lieu d'afficher la figure
+
+    Returns:
+        Chemin du fichier ecrit, ou None en mode interactif
     """
-    plt.figure(figsize=(10, 6))
-    plt.plot(history["best"], label="Meilleure distance", color=genetic_color, linewidth=2)
-    plt.plot(history["avg"], label="Distance moyenne", color='orange', linewidth=1, alpha=0.7)
-    plt.xlabel("Generation", fontsize=12)
-    plt.ylabel("Distance (km)", fontsize=12)
-    plt.title("Convergence de l'Algorithme Genetique", fontsize=14, fontweight='bold')
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.show()
+    fig = new_figure((10, 6), output)
+    ax = fig.add_subplot(111)
+    ax.plot(history["best"], label="Meilleure distance", color=genetic_color, linewidth=2)
+    ax.plot(history["avg"], label="Distance moyenne", color='orange', linewidth=1, alpha=0.7)
+    ax.set_xlabel("Generation", fontsize=12)
+    ax.set_ylabel("Distance (km)", fontsize=12)
+    ax.set_title("Convergence de l'Algorithme Genetique", fontsize=14, fontweight='bold')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return finish_figure(fig, output)
@@ -0,0 +1,252 @@
+import time
+import numpy as np
+import pandas as pd
+from utils import haversine_matrix
+from loader import city_arrays
+
+# ========= Ré-optimisation incrémentale d'une tournée =========
+#
+# IncrementalTour....... tournée + matrice des distances en cache, mises à jour ville par ville
+#   .from_result()...... construit l'objet depuis un résultat de cristo_algo() ou genetic_tsp()
+#   .update()........... ajoute / retire des villes puis répare localement la tournée
+#   .reoptimize()....... relance genetic_tsp() à chaud depuis la tournée courante
+#
+# Coûts, pour k villes modifiées sur n :
+#   - ajout : une ligne (et colonne) de la matrice O(n) + insertion au moindre coût O(n)
+#   - retrait : la dernière ville prend la place libérée dans la matrice, O(n), puis la tournée
+#     est recousue entre le prédécesseur et le successeur
+#   - réparation : 2-opt limité à une fenêtre de `repair_window` positions autour de chaque
+#     modification, O(window²) par passe
+# soit O(k·n) au lieu de O(n²) pour reconstruire la matrice et relancer un solveur.
+#
+# La capacité de la matrice double quand elle est pleine (coût amorti constant par ajout).
+#
+# ===============================================================
+
+
+class IncrementalTour:
+    """
+    Tournée maintenue de façon incrémentale.
+
+    Args:
+        data: DataFrame avec colonnes Ville, Latitude, Longitude, ou Cities (loader.py)
+        tour: Ordre de visite (noms de villes), fermé ou non ; None = ordre de data
+    """
+
+    def __init__(self, data, tour=None):
+        names, lat, lon = city_arrays(data)
+        if len(set(names)) != len(names):
+            raise ValueError("Noms de villes en double dans data")
+        self.size = len(names)
+        capacity = max(16, 2 * self.size)
+        self.names = names + [None] * (capacity - self.size)
+        self.lat = np.zeros(capacity)
+        self.lon = np.zeros(capacity)
+        self.lat[:self.size] = lat
+        self.lon[:self.size] = lon
+        self.index = {name: slot for slot, name in enumerate(names)}
+        self.dist = np.zeros((capacity, capacity))
+        self.dist[:self.size, :self.size] = haversine_matrix(self.lat[:self.size], self.lon[:self.size])
+
+        tour = list(names if tour is None else tour)
+        if len(tour) == self.size + 1 and tour[0] == tour[-1]:
+            tour = tour[:-1]
+        if sorted(tour) != sorted(names):
+            raise ValueError("La tournée doit visiter exactement les villes de data")
+        self.order = [self.index[name] for name in tour]
+        self.length = self.tour_length()
+
+    @classmethod
+    def from_result(cls, data, result):
+        """
+        Args:
+            data: DataFrame des villes
+            result: Résultat de cristo_algo() ("tour") ou de genetic_tsp() ("best_tour")
+        """
+        return cls(data, result["best_tour"] if "best_tour" in result else result["tour"])
+
+    # --- Accès ---
+    @property
+    def tour(self):
+        """Ordre de visite (noms de villes, tournée ouverte)."""
+        return [self.names[slot] for slot in self.order]
+
+    def tour_length(self):
+        """Longueur exacte de la tournée (recalculée, O(n))."""
+        order = np.asarray(self.order)
+        return float(self.dist[order, np.roll(order, -1)].sum()) if len(order) > 1 else 0.0
+
+    def to_dataframe(self):
+        """Villes actives, dans l'ordre de la tournée."""
+        order = np.asarray(self.order)
+        return pd.DataFrame({"Ville": self.tour, "Latitude": self.lat[order], "Longitude": self.lon[order]})
+
+    # --- Matrice des distances ---
+    def _grow(self):
+        capacity = 2 * len(self.names)
+        dist = np.zeros((capacity, capacity))
+        dist[:self.size, :self.size] = self.dist[:self.size, :self.size]
+        self.dist = dist
+        self.lat = np.resize(self.lat, capacity)
+        self.lon = np.resize(self.lon, capacity)
+        self.names.extend([None] * (capacity - len(self.names)))
+
+    def _add_slot(self, name, lat, lon):
+        if name in self.index:
+            raise ValueError(f"Ville déjà présente : {name!r}")
+        if self.size == len(self.names):
+            self._grow()
+        slot = self.size
+        self.size += 1
+        self.names[slot], self.lat[slot], self.lon[slot] = name, lat, lon
+        self.index[name] = slot
+        row = haversine_matrix([lat], [lon], self.lat[:self.size], self.lon[:self.size])[0]
+        self.dist[slot, :self.size] = row
+        self.dist[:self.size, slot] = row
+        return slot
+
+    def _remove_slot(self, slot):
+        """Libère un emplacement : la dernière ville vient l'occuper (lignes copiées en O(n))."""
+        last = self.size - 1
+        name = self.names[slot]
+        if slot != last:
+            moved = self.names[last]
+            self.names[slot], self.lat[slot], self.lon[slot] = moved, self.lat[last], self.lon[last]
+            self.dist[slot, :self.size] = self.dist[last, :self.size]
+            self.dist[:self.size, slot] = self.dist[:self.size, last]
+            self.dist[slot, slot] = 0.0
+            self.index[moved] = slot
+            self.order[self.order.index(last)] = slot
+        self.names[last] = None
+        del self.index[name]
+        self.size -= 1
+
+    # --- Modifications de la tournée ---
+    def _insert(self, slot):
+        """Insertion au moindre coût : entre les deux villes consécutives qui allongent le moins la tournée."""
+        if not self.order:
+            self.order.append(slot)
+            return 0
+        order = np.asarray(self.order)
+        following = np.roll(order, -1)
+        cost = self.dist[order, slot] + self.dist[slot, following] - self.dist[order, following]
+        position = int(np.argmin(cost)) + 1
+        self.order.insert(position, slot)
+        self.length += float(cost[position - 1])
+        return position
+
+    def _splice_out(self, slot):
+        """Retire une ville et relie son prédécesseur à son successeur ; renvoie le prédécesseur."""
+        position = self.order.index(slot)
+        n = len(self.order)
+        previous, following = self.order[position - 1], self.order[(position + 1) % n]
+        if n > 2:
+            self.length -= (self.dist[previous, slot] + self.dist[slot, following]
+                            - self.dist[previous, following])
+        del self.order[position]
+        if len(self.order) <= 1:
+            self.length = 0.0
+        elif len(self.order) == 2:
+            self.length = self.tour_length()
+        return previous if previous != slot else None
+
+    def _repair(self, slot, window, max_passes):
+        """
+        2-opt restreint aux `window` positions de part et d'autre de slot (extrémités de la fenêtre fixes).
+
+        Returns:
+            Nombre de mouvements appliqués
+        """
+        n = len(self.order)
+        if n < 5:
+            return 0
+        center = self.order.index(slot)
+        span = min(2 * window + 2, n)
+        positions = (center - span // 2 + np.arange(span)) % n
+        segment = np.asarray(self.order)[positions]
+
+        moves = 0
+        for _ in range(max_passes):
+            improved = False
+            for i in range(span - 3):
+                a, b = segment[i], segment[i + 1]
+                c, d = segment[i + 2:span - 1], segment[i + 3:span]
+                delta = self.dist[a, c] + self.dist[b, d] - self.dist[a, b] - self.dist[c, d]
+                j = int(np.argmin(delta))
+                if delta[j] < -1e-9:
+                    # Inverse segment[i+1 .. i+2+j]
+                    segment[i + 1:i + 3 + j] = segment[i + 1:i + 3 + j][::-1].copy()
+                    self.length += float(delta[j])
+                    moves += 1
+                    improved = True
+            if not improved:
+                break
+
+        for position, city in zip(positions, segment):
+            self.order[position] = int(city)
+        return moves
+
+    def update(self, added=None, removed=None, repair_window=10, max_passes=3):
+        """
+        Ajoute et retire des villes, puis répare la tournée autour des modifications.
+
+        Args:
+            added: DataFrame (ou liste de dictionnaires) avec colonnes Ville, Latitude, Longitude
+            removed: Noms des villes à retirer
+            repair_window: Demi-largeur (en positions) de la fenêtre de 2-opt autour de chaque modification
+            max_passes: Nombre maximal de passes de 2-opt par fenêtre
+
+        Returns:
+            Dictionnaire {"tour", "distance", "added", "removed", "repair_moves", "time_s"}
+        """
+        start = time.perf_counter()
+        touched = []
+
+        for name in removed or []:
+            if name not in self.index:
+                raise ValueError(f"Ville inconnue : {name!r}")
+            previous = self._splice_out(self.index[name])
+            if previous is not None:
+                touched.append(self.names[previous])
+            self._remove_slot(self.index[name])
+
+        if added is not None:
+            records = added.to_dict(orient="records") if isinstance(added, pd.DataFrame) else list(added)
+            for record in records:
+                slot = self._add_slot(record["Ville"], float(record["Latitude"]), float(record["Longitude"]))
+                self._insert(slot)
+                touched.append(record["Ville"])
+
+        moves = 0
+        for name in touched:
+            if name in self.index:
+                moves += self._repair(self.index[name], repair_window, max_passes)
+
+        return {
+            "tour": self.tour,
+            "distance": float(self.length),
+            "added": len(added) if added is not None else 0,
+            "removed": len(removed or []),
+            "repair_moves": moves,
+            "time_s": time.perf_counter() - start
+        }
+
+    def reoptimize(self, **ga_params):
+        """
+        Relance l'algorithme génétique en plaçant la tournée courante dans la population initiale.
+        La tournée n'est remplacée que si le génétique trouve mieux.
+
+        Args:
+            **ga_params: Paramètres de genetic_tsp()
+
+        Returns:
+            Résultat de genetic_tsp()
+        """
+        from genetique import genetic_tsp
+
+        ga_params.setdefault("verbose", False)
+        result = genetic_tsp(self.to_dataframe(), initial_tours=[self.tour], **ga_params)
+        if result["best_distance"] < self.length - 1e-9:
+            self.order = [self.index[name] for name in result["best_tour"]]
+            self.length = self.tour_length()
+        return result
@@ -0,0 +1,115 @@
+import time
+from collections import defaultdict
+
+# ========= Instrumentation par phase des algorithmes TSP =========
+#
+# PhaseProfiler....... chronomètre les phases d'un algorithme et tient des compteurs
+# phase()............. context manager qui mesure le temps passé dans une phase
+# count() / set()..... incrémente ou fixe un compteur (évaluations, croisements, ...)
+# as_dict()........... renvoie les mesures, stockées sous la clé "profile" du résultat
+#
+# Désactivé, le profiler renvoie un context manager partagé qui ne fait rien :
+# le coût se limite à un test de booléen par appel.
+#
+# ==================================================================
+
+
+class _NullPhase:
+    """Context manager vide utilisé quand l'instrumentation est désactivée."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Context manager qui ajoute la durée du bloc à la phase correspondante."""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.timings[self.name] += time.perf_counter() - self.start
+        self.profiler.calls[self.name] += 1
+        return False
+
+
+class PhaseProfiler:
+    """
+    Collecte les temps par phase et des compteurs pendant l'exécution d'un algorithme.
+
+    Args:
+        enabled: Active la collecte (sinon toutes les méthodes sont des no-op)
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.timings = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = {}
+
+    def phase(self, name):
+        """Renvoie un context manager qui chronomètre la phase `name`."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def count(self, name, n=1):
+        """Incrémente le compteur `name` de `n`."""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name, value):
+        """Fixe la valeur du compteur `name`."""
+        if self.enabled:
+            self.counters[name] = value
+
+    def as_dict(self):
+        """
+        Renvoie les mesures collectées.
+
+        Returns:
+            Dictionnaire {"timings": {phase: secondes}, "calls": {phase: nb}, "counters": {...}}
+            (vide si l'instrumentation est désactivée)
+        """
+        if not self.enabled:
+            return {}
+        return {
+            "timings": dict(self.timings),
+            "calls": dict(self.calls),
+            "counters": dict(self.counters)
+        }
+
+
+def flatten_profile(profile, prefix="profile"):
+    """
+    Aplatit le dictionnaire renvoyé par PhaseProfiler.as_dict() en colonnes CSV.
+
+    Args:
+        profile: Dictionnaire {"timings": ..., "counters": ...}
+        prefix: Préfixe des noms de colonnes
+
+    Returns:
+        Dictionnaire {"profile_<phase>_s": secondes, "profile_<compteur>": valeur}
+    """
+    if not profile:
+        return {}
+    flat = {}
+    for name, seconds in profile.get("timings", {}).items():
+        flat[f"{prefix}_{name}_s"] = round(seconds, 6)
+    for name, value in profile.get("counters", {}).items():
+        flat[f"{prefix}_{name}"] = value
+    return flat
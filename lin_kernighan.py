@@ -0,0 +1,493 @@
+import math
+import time
+import random
+from collections import deque
+import numpy as np
+from instrumentation import PhaseProfiler
+from loader import city_arrays
+
+# =======  Recherche locale à profondeur variable (Lin-Kernighan) pour le TSP =======
+#
+# lin_kernighan_tsp()..... Lin-Kernighan itéré (ILS), résultat au même format que genetic_tsp()
+# unit_vectors()......... coordonnées -> vecteurs unitaires 3D
+# sphere_neighbors()..... k plus proches voisins exacts, par blocs voisins (sans matrice n x n)
+# sphere_tour_length().. longueur d'un tour à partir des vecteurs unitaires
+# space_filling_tour().. tour de départ : ordre de la courbe de Hilbert sur (longitude, latitude)
+#
+# Conçu pour 10k-100k villes : aucune matrice n x n (100k villes = 80 Go en float64).
+#   - distances calculées à la demande : corde entre vecteurs unitaires, d = 2R asin(corde / 2)
+#     (identique à haversine, sans trigonométrie par paire)
+#   - candidats : k plus proches voisins, calculés bloc par bloc contre les seules villes proches
+#   - tour : tableau des villes + position de chaque ville ; une inversion retourne le plus court
+#     des deux côtés (au plus n/2 villes, copie numpy)
+#
+# Tous les mouvements sont des 2-opt (retire deux arêtes, en ajoute deux) appliqués sur le tour et
+# journalisés, donc annulables :
+#   - pas LK : chaîne de 2-opt partant de t1 (t1 fixe, l'arête libre (t1, t2) change à chaque pas),
+#     critère de gain positif, profondeur max_depth ; on garde le meilleur préfixe de la chaîne
+#   - or-opt : déplacement d'un segment de 1 à 3 villes à côté d'un voisin (2 ou 3 inversions)
+#   - perturbation : double-bridge local (segments B et C de moins de kick_segment villes échangés,
+#     3 inversions) ; le tour perturbé puis ré-optimisé est gardé s'il est meilleur, sinon annulé
+#
+# Bits « don't look » : seules les villes de la file (extrémités des arêtes modifiées) sont
+# ré-examinées ; après une perturbation, la recherche ne touche que son voisinage.
+#
+# ==================================================================================
+
+EARTH_RADIUS = 6371  # rayon moyen de la Terre en km
+EPSILON = 1e-9
+
+
+def unit_vectors(lat, lon):
+    """
+    Args:
+        lat, lon: Coordonnées en degrés
+
+    Returns:
+        Tableau (n x 3) des vecteurs unitaires
+    """
+    lat, lon = np.radians(np.asarray(lat, dtype=float)), np.radians(np.asarray(lon, dtype=float))
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+def sphere_neighbors(xyz, k, block=1024):
+    """
+    k plus proches voisins sur la sphère : le plus grand produit scalaire est la plus courte distance.
+
+    Les villes sont traitées par blocs consécutifs sur la courbe de Hilbert. Pour un bloc, la
+    k-ième plus proche voisine à l'intérieur du bloc borne la distance cherchée : seules les villes
+    de la boîte englobante du bloc élargie de cette borne (en coordonnées 3D) sont comparées.
+    Le résultat est exact.
+
+    Args:
+        xyz: Vecteurs unitaires (n x 3)
+        k: Nombre de voisins
+        block: Nombre de villes par bloc
+
+    Returns:
+        Tableau (n x k) des indices des k plus proches voisins, du plus proche au plus lointain
+    """
+    n = len(xyz)
+    k = min(k, n - 1)
+    lat = np.degrees(np.arcsin(np.clip(xyz[:, 2], -1.0, 1.0)))
+    lon = np.degrees(np.arctan2(xyz[:, 1], xyz[:, 0]))
+    order = space_filling_tour(lat, lon)
+    neighbors = np.empty((n, k), dtype=np.int64)
+    for start in range(0, n, block):
+        rows = order[start:start + block]
+        points = xyz[rows]
+        if len(rows) > k:
+            local = points @ points.T
+            np.fill_diagonal(local, -np.inf)
+            kth_similarity = np.partition(local, len(rows) - k, axis=1)[:, len(rows) - k]
+            margin = np.sqrt(max(0.0, 2 - 2 * kth_similarity.min()))    # corde = sqrt(2 - 2 cos)
+            inside = ((xyz >= points.min(axis=0) - margin) & (xyz <= points.max(axis=0) + margin)).all(axis=1)
+            candidates = np.flatnonzero(inside)
+        else:
+            candidates = np.arange(n)
+        similarity = points @ xyz[candidates].T
+        similarity[np.arange(len(rows)), np.searchsorted(candidates, rows)] = -np.inf
+        best = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        best = np.take_along_axis(best, np.argsort(-np.take_along_axis(similarity, best, axis=1), axis=1), axis=1)
+        neighbors[rows] = candidates[best]
+    return neighbors
+
+
+def sphere_tour_length(xyz, tour):
+    """Longueur d'un tour (indices) en km."""
+    tour = np.asarray(tour)
+    chord = np.linalg.norm(xyz[tour] - xyz[np.roll(tour, -1)], axis=1)
+    return float((2 * EARTH_RADIUS * np.arcsin(np.minimum(chord / 2, 1.0))).sum())
+
+
+def space_filling_tour(lat, lon, bits=16):
+    """
+    Tour de départ en O(n log n) : villes triées selon la courbe de Hilbert sur une grille 2^bits x 2^bits.
+
+    Returns:
+        Tableau des indices de villes
+    """
+    side = 2**bits
+    coords = []
+    for values in (np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)):
+        span = values.max() - values.min()
+        scaled = (values - values.min()) / span if span > 0 else np.zeros_like(values)
+        coords.append(np.minimum((scaled * side).astype(np.int64), side - 1))
+    x, y = coords
+    d = np.zeros(len(x), dtype=np.int64)
+    s = side // 2
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx.astype(np.int64)) ^ ry.astype(np.int64))
+        # Rotation du quadrant
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s //= 2
+    return np.argsort(d, kind="stable")
+
+
+class _TourSearch:
+    """
+    Tour (tableau + positions) et mouvements de la recherche locale.
+
+    Args:
+        xyz: Vecteurs unitaires (n x 3)
+        tour: Tour de départ (indices)
+        neighbors: Candidats (n x k)
+        max_depth: Profondeur maximale d'une chaîne LK
+    """
+
+    def __init__(self, xyz, tour, neighbors, max_depth):
+        self.n = len(tour)
+        self.x, self.y, self.z = (xyz[:, axis].tolist() for axis in range(3))
+        self.tour = np.array(tour, dtype=np.int64)
+        self.pos = np.empty(self.n, dtype=np.int64)
+        self.pos[self.tour] = np.arange(self.n)
+        self.neighbors = neighbors.tolist()
+        self.neighbor_dist = [[self.dist(a, b) for b in row] for a, row in enumerate(self.neighbors)]
+        self.max_depth = max_depth
+        self.length = sphere_tour_length(xyz, self.tour)
+        self.log = []               # 2-opt appliqués (a, b, c, d), pour annulation
+        self.counts = {"two_opt": 0, "lk_improvements": 0, "or_opt_improvements": 0}
+
+    # --- Distances et voisins dans le tour ---
+    def dist(self, a, b):
+        dx, dy, dz = self.x[a] - self.x[b], self.y[a] - self.y[b], self.z[a] - self.z[b]
+        return 2 * EARTH_RADIUS * math.asin(min(1.0, 0.5 * math.sqrt(dx * dx + dy * dy + dz * dz)))
+
+    def succ(self, a):
+        i = self.pos.item(a) + 1
+        return self.tour.item(i if i < self.n else 0)
+
+    def pred(self, a):
+        return self.tour.item(self.pos.item(a) - 1)
+
+    # --- Mouvements ---
+    def _reverse(self, i, j):
+        """Inverse le chemin des positions i à j (sens du tableau, circulaire) ou, s'il est plus court, son complément."""
+        n = self.n
+        inner = (j - i) % n + 1
+        if 2 * inner > n:
+            i, j, inner = (j + 1) % n, (i - 1) % n, n - inner
+        if inner < 2:
+            return
+        tour, pos = self.tour, self.pos
+        if inner <= 16:
+            for _ in range(inner // 2):
+                a, b = tour.item(i), tour.item(j)
+                tour[i], tour[j] = b, a
+                pos[b], pos[a] = i, j
+                i = i + 1 if i + 1 < n else 0
+                j = j - 1 if j > 0 else n - 1
+        elif i <= j:
+            segment = tour[i:j + 1][::-1].copy()
+            tour[i:j + 1] = segment
+            pos[segment] = np.arange(i, j + 1)
+        else:
+            positions = (i + np.arange(inner)) % n
+            segment = tour[positions][::-1]
+            tour[positions] = segment
+            pos[segment] = positions
+
+    def two_opt(self, a, b, c, d):
+        """Retire les arêtes (a, b) et (c, d), ajoute (a, c) et (b, d) ; b suit a et d suit c dans le même sens."""
+        if b == c:
+            return
+        if self.succ(a) == b:
+            self._reverse(self.pos.item(b), self.pos.item(c))
+        else:
+            self._reverse(self.pos.item(a), self.pos.item(d))
+        self.length += self.dist(a, c) + self.dist(b, d) - self.dist(a, b) - self.dist(c, d)
+        self.log.append((a, b, c, d))
+        self.counts["two_opt"] += 1
+
+    def undo(self, mark):
+        """Annule les 2-opt journalisés après `mark`, du plus récent au plus ancien."""
+        log = self.log
+        while len(log) > mark:
+            a, b, c, d = log.pop()
+            self.two_opt(a, c, b, d)
+            log.pop()
+
+    # --- Recherche locale ---
+    def lk_step(self, t1):
+        """
+        Chaîne de 2-opt depuis t1, dans les deux sens ; garde le meilleur préfixe améliorant.
+
+        Returns:
+            Villes touchées si le tour a été amélioré, sinon None
+        """
+        for forward in (True, False):
+            t2 = self.succ(t1) if forward else self.pred(t1)
+            mark = len(self.log)
+            gain = self.dist(t1, t2)
+            best_gain, best_mark = EPSILON, mark
+            added = set()
+            touched = [t1, t2]
+            for _ in range(self.max_depth):
+                # Sens courant : une inversion du côté complémentaire retourne le tableau
+                following, preceding = (self.succ, self.pred) if self.succ(t1) == t2 else (self.pred, self.succ)
+                after_t2 = following(t2)
+                best, best_score = None, -math.inf
+                for t3, d23 in zip(self.neighbors[t2], self.neighbor_dist[t2]):
+                    if gain - d23 <= EPSILON:
+                        break
+                    if t3 == t1 or t3 == after_t2:
+                        continue
+                    t4 = preceding(t3)
+                    if (min(t3, t4), max(t3, t4)) in added:
+                        continue
+                    score = self.dist(t3, t4) - d23
+                    if score > best_score:
+                        best, best_score = (t3, t4, d23), score
+                if best is None:
+                    break
+                t3, t4, d23 = best
+                self.two_opt(t1, t2, t4, t3)
+                added.add((min(t2, t3), max(t2, t3)))
+                gain += best_score
+                touched += [t3, t4]
+                closed = gain - self.dist(t4, t1)
+                if closed > best_gain:
+                    best_gain, best_mark = closed, len(self.log)
+                t2 = t4
+            self.undo(best_mark)
+            if best_mark > mark:
+                self.counts["lk_improvements"] += 1
+                return touched
+        return None
+
+    def or_opt_step(self, s0):
+        """
+        Déplace le segment de 1 à 3 villes commençant en s0 entre un voisin c et la ville e qui le suit
+        (ou le précède), dans le sens le moins coûteux.
+
+        Returns:
+            Villes touchées si le tour a été amélioré, sinon None
+        """
+        best, best_delta = None, -EPSILON
+        segment = [s0]
+        for _ in range(3):
+            if self.n < len(segment) + 4:
+                break
+            s1 = segment[-1]
+            p, q = self.pred(s0), self.succ(s1)
+            removal = self.dist(p, s0) + self.dist(s1, q) - self.dist(p, q)
+            if removal > EPSILON:
+                for end, other in ((s0, s1), (s1, s0)):
+                    for c, d_end in zip(self.neighbors[end], self.neighbor_dist[end]):
+                        if d_end >= removal:
+                            break
+                        if c == p or c in segment:
+                            continue
+                        for e in (self.succ(c), self.pred(c)):
+                            if e == p or e in segment:
+                                continue
+                            delta = d_end + self.dist(other, e) - self.dist(c, e) - removal
+                            if delta < best_delta:
+                                best, best_delta = (list(segment), p, q, c, e, end), delta
+            segment.append(self.succ(s1))
+
+        if best is None:
+            return None
+        segment, p, q, c, e, end = best
+        s0, s1 = segment[0], segment[-1]
+        # Ordre circulaire p S q ... C E (E suit C) ; « forward » : C s0 .. s1 E
+        if e == self.succ(c):
+            C, E, forward = c, e, end == s0
+        else:
+            C, E, forward = e, c, end == s1
+        self.two_opt(p, s0, C, E)              # p C ... q s1..s0 E
+        if C != q:
+            self.two_opt(p, C, q, s1)          # p q ... C s1..s0 E
+        if forward and s0 != s1:
+            self.two_opt(C, s1, s0, E)         # C s0..s1 E
+        self.counts["or_opt_improvements"] += 1
+        return [p, q, s0, s1, C, E]
+
+    def optimize(self, queue, queued, deadline=None, keep_log=False):
+        """
+        Vide la file des villes à examiner (bits « don't look » levés).
+
+        Args:
+            queue: deque des villes à examiner
+            queued: Liste de booléens, ville présente dans la file
+            deadline: Heure limite (time.perf_counter()), None = aucune
+            keep_log: Conserver le journal (annulation d'une perturbation)
+
+        Returns:
+            True si la file a été vidée (optimum local), False si la limite de temps a interrompu
+        """
+        examined = 0
+        while queue:
+            examined += 1
+            if deadline is not None and examined % 128 == 0 and time.perf_counter() >= deadline:
+                return False
+            t1 = queue.popleft()
+            queued[t1] = False
+            touched = self.lk_step(t1) or self.or_opt_step(t1)
+            if touched:
+                for city in touched:
+                    if not queued[city]:
+                        queued[city] = True
+                        queue.append(city)
+            if not keep_log:
+                self.log.clear()
+        return True
+
+    def double_bridge(self, rng, max_segment):
+        """
+        Double-bridge local : A B C D -> A C B D, avec B et C de 1 à max_segment villes consécutives.
+
+        Returns:
+            Villes touchées
+        """
+        n = self.n
+        longest = max(1, min(max_segment, (n - 2) // 2))
+        i = rng.randrange(n)
+        len_b, len_c = rng.randint(1, longest), rng.randint(1, longest)
+        at = lambda offset: self.tour.item((i + offset) % n)
+        a1, b0, b1 = at(0), at(1), at(len_b)
+        c0, c1, d0 = at(len_b + 1), at(len_b + len_c), at(len_b + len_c + 1)
+        self.two_opt(a1, b0, c1, d0)           # a1 c1..c0 b1..b0 d0
+        self.two_opt(a1, c1, c0, b1)           # a1 c0..c1 b1..b0 d0
+        self.two_opt(c1, b1, b0, d0)           # a1 c0..c1 b0..b1 d0
+        return [a1, b0, b1, c0, c1, d0]
+
+
+def lin_kernighan_tsp(data, initial_tour=None, k_neighbors=8, max_depth=6, time_limit=60.0, kicks=None,
+                      kicks_per_round=None, kick_segment=50, seed=None, verbose=True, profile=False, callback=None):
+    """
+    Lin-Kernighan itéré pour resoudre le TSP (grandes instances).
+
+    Args:
+        data: DataFrame avec colonnes Ville, Latitude, Longitude, ou Cities (loader.py)
+        initial_tour: Tour de depart (noms de villes, ferme ou non), par exemple cristo_algo(data)["tour"] ;
+                      None = ordre de la courbe de Hilbert
+        k_neighbors: Taille des listes de candidats
+        max_depth: Profondeur maximale d'une chaine LK (nombre de 2-opt enchaines)
+        time_limit: Budget de temps en secondes (recherche initiale comprise), None = aucun
+        kicks: Nombre maximal de perturbations, None = jusqu'a time_limit
+        kicks_per_round: Perturbations entre deux points de l'historique (None = n / 10, au moins 10)
+        kick_segment: Longueur maximale des segments echanges par le double-bridge
+        seed: Graine des perturbations
+        verbose: Afficher les progres
+        profile: Collecter les temps par phase et les compteurs
+        callback: Fonction appelee a chaque round avec (round, meilleur tour, meilleure distance,
+                  distance courante) ; si elle renvoie True, l'algorithme s'arrete
+
+    Returns:
+        Dictionnaire au format de genetic_tsp():
+            - best_tour, best_distance, pos
+            - history: {"best", "avg", "time"} par round (round 0 = optimum local du tour de depart,
+                       "time" = secondes depuis le debut)
+            - generations_run: Nombre de rounds
+            - start_distance: Longueur du tour de depart
+            - profile: Temps par phase et compteurs
+    """
+    if time_limit is None and kicks is None:
+        raise ValueError("time_limit ou kicks doit être fixé")
+    start_time = time.perf_counter()
+    deadline = start_time + time_limit if time_limit is not None else None
+    profiler = PhaseProfiler(enabled=profile)
+    rng = random.Random(seed)
+
+    cities, lat, lon = city_arrays(data)
+    pos = dict(zip(cities, zip(lon.tolist(), lat.tolist())))
+    n = len(cities)
+
+    with profiler.phase("start"):
+        xyz = unit_vectors(lat, lon)
+        if initial_tour is not None:
+            city_index = {city: i for i, city in enumerate(cities)}
+            tour = [city_index[city] for city in initial_tour]
+            if len(tour) == n + 1 and tour[0] == tour[-1]:
+                tour = tour[:-1]
+            if sorted(tour) != list(range(n)):
+                raise ValueError("initial_tour doit visiter exactement les villes de data")
+        else:
+            tour = space_filling_tour(lat, lon)
+    with profiler.phase("neighbors"):
+        neighbors = sphere_neighbors(xyz, k_neighbors)
+        search = _TourSearch(xyz, tour, neighbors, max_depth)
+    start_distance = search.length
+
+    if verbose:
+        print("\n=== Lin-Kernighan itéré - Démarrage ===")
+        print(f"Villes: {n}, Candidats: {k_neighbors}, Profondeur: {max_depth}, Départ: {start_distance:.2f} km")
+
+    history = {"best": [], "avg": [], "time": []}
+    kicks_per_round = kicks_per_round or max(10, n // 10)
+
+    def report(round_index):
+        history["best"].append(search.length)
+        history["avg"].append(search.length)
+        history["time"].append(time.perf_counter() - start_time)
+        if verbose:
+            print(f"Round {round_index:4d} | {history['time'][-1]:7.1f} s | Meilleur: {search.length:.2f} km")
+        return callback is not None and callback(round_index, [cities[i] for i in search.tour], search.length,
+                                                 search.length)
+
+    # --- Optimum local du tour de départ ---
+    with profiler.phase("descent"):
+        queue = deque(search.tour.tolist())
+        queued = [True] * n
+        search.optimize(queue, queued, deadline)
+        queue.clear()
+        queued = [False] * n
+    stop = report(0) or n < 8
+
+    # --- Perturbations (double-bridge local) + ré-optimisation ---
+    done = accepted = 0
+    round_index = 0
+    with profiler.phase("kicks"):
+        while not stop:
+            round_index += 1
+            for _ in range(kicks_per_round):
+                if (kicks is not None and done >= kicks) or (deadline is not None and time.perf_counter() >= deadline):
+                    stop = True
+                    break
+                before = search.length
+                search.log.clear()
+                for city in search.double_bridge(rng, kick_segment):
+                    if not queued[city]:
+                        queued[city] = True
+                        queue.append(city)
+                search.optimize(queue, queued, deadline, keep_log=True)
+                for city in queue:
+                    queued[city] = False
+                queue.clear()
+                if search.length < before - EPSILON:
+                    accepted += 1
+                else:
+                    search.undo(0)
+                done += 1
+            search.log.clear()
+            stop = report(round_index) or stop
+
+    # Longueur exacte (la longueur incrémentale accumule des erreurs d'arrondi)
+    best_distance = sphere_tour_length(xyz, search.tour)
+    profiler.set("cities", n)
+    profiler.set("kicks", done)
+    profiler.set("kicks_accepted", accepted)
+    for name, value in search.counts.items():
+        profiler.set(name, value)
+
+    if verbose:
+        print(f"\n=== Resultat final ===")
+        print(f"Meilleur tour trouve: {best_distance:.2f} km (départ {start_distance:.2f} km, "
+              f"{done} perturbations dont {accepted} acceptées)")
+
+    return {
+        "best_tour": [cities[i] for i in search.tour],
+        "best_distance": best_distance,
+        "pos": pos,
+        "history": history,
+        "generations_run": len(history["best"]),
+        "start_distance": start_distance,
+        "seed": seed,
+        "profile": profiler.as_dict()
+    }
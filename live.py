@@ -0,0 +1,216 @@
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from utils import basemap, project_positions, new_figure, finish_figure, draw_nodes, genetic_color
+from loader import city_arrays
+
+# ========= Suivi en direct de l'algorithme génétique =========
+#
+# DecimatedHistory...... historique de taille fixe : quand il est plein, un point sur deux est
+#                        supprimé et le pas d'échantillonnage double (coût constant par image)
+# LiveConvergence....... callback de genetic_tsp() : courbe de convergence + meilleur tour sur la carte,
+#                        redessinés par blitting au plus toutes les `min_interval` secondes
+# live_genetic_tsp().... lance genetic_tsp() avec l'affichage en direct
+#
+# Le redessin est limité par le temps écoulé et non par le nombre de générations : entre deux
+# images, le callback ne fait qu'ajouter un point à l'historique (O(1)).
+#
+# ==============================================================
+
+
+class DecimatedHistory:
+    """
+    Historique (génération, meilleure distance, distance moyenne) de capacité fixe.
+
+    Args:
+        capacity: Nombre maximal de points conservés (pair)
+    """
+
+    def __init__(self, capacity=2048):
+        self.capacity = capacity - capacity % 2
+        self.generations = np.empty(self.capacity, dtype=np.int64)
+        self.best = np.empty(self.capacity, dtype=float)
+        self.avg = np.empty(self.capacity, dtype=float)
+        self.size = 0
+        self.stride = 1
+
+    def append(self, generation, best, avg):
+        if generation % self.stride:
+            return
+        if self.size == self.capacity:
+            # Décimation : on garde un point sur deux et on double le pas
+            half = self.capacity // 2
+            self.generations[:half] = self.generations[::2]
+            self.best[:half] = self.best[::2]
+            self.avg[:half] = self.avg[::2]
+            self.size = half
+            self.stride *= 2
+            if generation % self.stride:
+                return
+        self.generations[self.size] = generation
+        self.best[self.size] = best
+        self.avg[self.size] = avg
+        self.size += 1
+
+    def arrays(self):
+        return self.generations[:self.size], self.best[:self.size], self.avg[:self.size]
+
+
+class LiveConvergence:
+    """
+    Affichage en direct de la convergence et du meilleur tour, à passer en callback= de genetic_tsp().
+
+    Args:
+        pos: Dictionnaire {ville: (lon, lat)}
+        min_interval: Délai minimal (s) entre deux images
+        capacity: Nombre de points de la courbe (historique décimé)
+        show_map: Afficher le meilleur tour sur la carte
+        output: Fichier où écrire l'image finale (None = fenêtre interactive)
+    """
+
+    def __init__(self, pos, min_interval=0.25, capacity=2048, show_map=True, output=None):
+        self.pos = pos
+        self.min_interval = min_interval
+        self.history = DecimatedHistory(capacity)
+        self.output = output
+        self.frames = 0
+        self.full_redraws = 0
+        self.draw_time = 0.0
+        self._last_draw = 0.0
+        self._last_tour = None
+        self._last_generation = 0
+
+        if output is None:
+            plt.ion()
+        self.fig = new_figure((16, 7) if show_map else (10, 6), output)
+        self.ax_curve = self.fig.add_subplot(121 if show_map else 111)
+        self.ax_map = self.fig.add_subplot(122) if show_map else None
+
+        # --- Courbe de convergence ---
+        self.best_line, = self.ax_curve.plot([], [], color=genetic_color, linewidth=2, label="Meilleure distance",
+                                             animated=True)
+        self.avg_line, = self.ax_curve.plot([], [], color='orange', linewidth=1, alpha=0.7, label="Distance moyenne",
+                                            animated=True)
+        self.ax_curve.set_xlabel("Generation", fontsize=12)
+        self.ax_curve.set_ylabel("Distance (km)", fontsize=12)
+        self.ax_curve.set_title("Convergence de l'Algorithme Genetique", fontsize=14, fontweight='bold')
+        self.ax_curve.legend(loc='upper right')
+        self.ax_curve.grid(True, alpha=0.3)
+        self.ax_curve.set_xlim(0, 100)
+        self.text = self.ax_curve.text(0.02, 0.03, "", transform=self.ax_curve.transAxes, animated=True)
+
+        # --- Carte et tour ---
+        if self.ax_map is not None:
+            m = basemap(pos, ax=self.ax_map)
+            names, self.x, self.y, self.index = project_positions(m, pos)
+            draw_nodes(self.ax_map, self.x, self.y, range(len(names)), 'red', 60)
+            self.tour_line, = self.ax_map.plot([], [], color=genetic_color, linewidth=2, alpha=0.8, animated=True)
+
+        self.fig.tight_layout()
+        self._background = None
+        self._ylim = None
+
+    # --- Blitting ---
+    def _animated_artists(self):
+        artists = [self.best_line, self.avg_line, self.text]
+        if self.ax_map is not None:
+            artists.append(self.tour_line)
+        return artists
+
+    def _full_redraw(self):
+        """Redessine tout le fond (axes, carte) et le mémorise pour le blitting."""
+        canvas = self.fig.canvas
+        canvas.draw()
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+        self.full_redraws += 1
+
+    def _update_limits(self, generation, best, avg):
+        """Ajuste les axes par paliers (rare) ; renvoie True si le fond doit être redessiné."""
+        changed = False
+        xmax = self.ax_curve.get_xlim()[1]
+        if generation >= xmax:
+            while xmax <= generation:
+                xmax *= 2
+            self.ax_curve.set_xlim(0, xmax)
+            changed = True
+        low, high = best.min(), avg.max()
+        if self._ylim is None or low < self._ylim[0] or high > self._ylim[1] \
+                or (self._ylim[1] - self._ylim[0]) > 4 * max(high - low, 1e-9):
+            margin = 0.05 * max(high - low, 1.0)
+            self._ylim = (low - margin, high + margin)
+            self.ax_curve.set_ylim(*self._ylim)
+            changed = True
+        return changed
+
+    def draw(self, generation):
+        start = time.perf_counter()
+        generations, best, avg = self.history.arrays()
+        if len(generations) == 0:
+            return
+        if self._update_limits(generation, best, avg) or self._background is None:
+            self._full_redraw()
+
+        canvas = self.fig.canvas
+        canvas.restore_region(self._background)
+
+        self.best_line.set_data(generations, best)
+        self.avg_line.set_data(generations, avg)
+        self.text.set_text(f"Generation {generation} | Meilleur : {best[-1]:.2f} km")
+        if self.ax_map is not None and self._last_tour is not None:
+            order = np.fromiter((self.index[city] for city in self._last_tour), dtype=np.int64,
+                                count=len(self._last_tour))
+            order = np.append(order, order[0])
+            self.tour_line.set_data(self.x[order], self.y[order])
+
+        for artist in self._animated_artists():
+            artist.axes.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        self.frames += 1
+        self.draw_time += time.perf_counter() - start
+
+    # --- Callback de genetic_tsp ---
+    def __call__(self, generation, best_tour, best_distance, avg_distance):
+        self.history.append(generation, best_distance, avg_distance)
+        self._last_tour = best_tour
+        self._last_generation = generation
+        now = time.perf_counter()
+        if now - self._last_draw >= self.min_interval:
+            self.draw(generation)
+            self._last_draw = time.perf_counter()
+        return False
+
+    def close(self):
+        """Dernière image (toujours dessinée), puis écriture du fichier ou affichage bloquant."""
+        self.draw(self._last_generation)
+        for artist in self._animated_artists():
+            artist.set_animated(False)
+        if self.output is None:
+            plt.ioff()
+        return finish_figure(self.fig, self.output)
+
+
+def live_genetic_tsp(data, min_interval=0.25, show_map=True, output=None, **params):
+    """
+    Lance genetic_tsp() en affichant la convergence et le meilleur tour en direct.
+
+    Args:
+        data: DataFrame des villes, ou Cities (loader.py)
+        min_interval: Délai minimal (s) entre deux images
+        show_map: Afficher le meilleur tour sur la carte
+        output: Fichier de l'image finale (None = fenêtre interactive)
+        **params: Paramètres de genetic_tsp()
+
+    Returns:
+        Résultat de genetic_tsp(), avec "live" = {"frames", "full_redraws", "draw_time_s"}
+    """
+    from genetique import genetic_tsp
+
+    cities, lat, lon = city_arrays(data)
+    pos = dict(zip(cities, zip(lon.tolist(), lat.tolist())))
+    live = LiveConvergence(pos, min_interval=min_interval, show_map=show_map, output=output)
+    result = genetic_tsp(data, callback=live, **params)
+    live.close()
+    result["live"] = {"frames": live.frames, "full_redraws": live.full_redraws,
+                      "draw_time_s": round(live.draw_time, 4)}
+    return result
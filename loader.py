@@ -0,0 +1,207 @@
+import os
+import numpy as np
+import pandas as pd
+
+# ========= Chargement compact de fichiers de villes =========
+#
+# load_cities()..... lit un CSV ou un Parquet par blocs, valide et déduplique -> Cities
+# Cities............ villes en colonnes : table des noms, latitudes, longitudes, index nom -> indice
+#   .from_dataframe() construit l'objet depuis un DataFrame déjà chargé
+#   .to_dataframe()  DataFrame Ville / Latitude / Longitude (tracés, code existant)
+#   .subset()        sous-ensemble de villes
+# city_arrays()..... (noms, latitudes, longitudes) depuis un DataFrame ou un Cities
+# city_index()...... index nom -> indice depuis un DataFrame ou un Cities
+#
+# Les solveurs passent par city_arrays() / city_index() et acceptent donc indifféremment un
+# DataFrame ou un Cities.
+#
+# Mémoire : un seul bloc de `chunksize` lignes est en mémoire à la fois. Les lignes retenues sont
+# copiées dans des tableaux dont la capacité double quand ils sont pleins. Le pic dépend du bloc et
+# du nombre de villes gardées, pas de la taille du fichier.
+#
+# Validation : les lignes sans nom, sans coordonnées numériques, ou avec une latitude hors
+# [-90, 90] ou une longitude hors [-180, 180] sont rejetées.
+# Déduplication : un nom déjà vu est ignoré pendant la lecture. Des coordonnées déjà vues (arrondies
+# à `precision` décimales) sont retirées à la fin, en une passe numpy. La première occurrence est
+# gardée dans les deux cas.
+#
+# Usage :
+#   cities = load_cities("data/villes_monde.csv", chunksize=500_000, dtype="float32")
+#   result = lin_kernighan_tsp(cities, time_limit=120)
+#
+# ============================================================
+
+COLUMNS = ("Ville", "Latitude", "Longitude")
+
+
+class Cities:
+    """
+    Villes stockées en colonnes (structure de tableaux).
+
+    Args:
+        names: Noms des villes (uniques), table des noms indexée par ville
+        lat, lon: Coordonnées en degrés
+        stats: Compteurs du chargement (lignes lues, rejetées, doublons)
+        name_index: Dictionnaire {nom: indice} déjà construit (None = construit depuis names)
+    """
+
+    def __init__(self, names, lat, lon, stats=None, name_index=None):
+        self.names = list(names)
+        self.lat = np.asarray(lat)
+        self.lon = np.asarray(lon)
+        self.name_index = name_index if name_index is not None else {name: i for i, name in enumerate(self.names)}
+        if len(self.name_index) != len(self.names):
+            raise ValueError("Noms de villes en double")
+        self.stats = dict(stats or {})
+
+    @classmethod
+    def from_dataframe(cls, data, dtype="float64", dedup=True, precision=6):
+        """
+        Args:
+            data: DataFrame avec colonnes Ville, Latitude, Longitude
+            dtype, dedup, precision: Voir load_cities()
+        """
+        return _build_cities([data], dtype, dedup, precision)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"Cities({len(self)} villes, {self.lat.dtype}, {self.nbytes() / 1e6:.1f} Mo de coordonnées)"
+
+    def nbytes(self):
+        """Taille des tableaux de coordonnées en octets."""
+        return self.lat.nbytes + self.lon.nbytes
+
+    def to_dataframe(self):
+        return pd.DataFrame({"Ville": self.names, "Latitude": self.lat.astype(float),
+                             "Longitude": self.lon.astype(float)})
+
+    def subset(self, indices):
+        """Villes d'indices donnés (dans cet ordre)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        return Cities([self.names[i] for i in indices], self.lat[indices], self.lon[indices])
+
+
+def city_arrays(data):
+    """
+    Args:
+        data: DataFrame avec colonnes Ville, Latitude, Longitude, ou Cities
+
+    Returns:
+        (liste des noms, latitudes, longitudes) ; coordonnées en tableaux numpy float64
+    """
+    if isinstance(data, Cities):
+        return list(data.names), data.lat.astype(float, copy=False), data.lon.astype(float, copy=False)
+    return data["Ville"].tolist(), data["Latitude"].to_numpy(dtype=float), data["Longitude"].to_numpy(dtype=float)
+
+
+def city_index(data):
+    """Dictionnaire {ville: indice} d'un DataFrame ou d'un Cities."""
+    if isinstance(data, Cities):
+        return data.name_index
+    return {name: i for i, name in enumerate(data["Ville"].tolist())}
+
+
+def _csv_chunks(path, columns, chunksize):
+    yield from pd.read_csv(path, usecols=list(columns), dtype={columns[0]: str}, chunksize=chunksize)
+
+
+def _parquet_chunks(path, columns, chunksize):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError("La lecture de fichiers Parquet nécessite pyarrow (pip install pyarrow)") from error
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=list(columns)):
+        yield batch.to_pandas()
+
+
+def _coordinate_keys(lat, lon, precision):
+    """Clé entière unique par couple (latitude, longitude) arrondi à `precision` décimales."""
+    scale = 10.0**precision
+    lat_key = np.rint((lat.astype(float) + 90) * scale).astype(np.int64)
+    lon_key = np.rint((lon.astype(float) + 180) * scale).astype(np.int64)
+    return lat_key * np.int64(360 * scale + 1) + lon_key
+
+
+def _build_cities(chunks, dtype, dedup, precision, columns=COLUMNS):
+    """Assemble les blocs : validation, déduplication des noms au fil de l'eau, tableaux à capacité doublée."""
+    name_column, lat_column, lon_column = columns
+    dtype = np.dtype(dtype)
+    capacity = 1024
+    lat = np.empty(capacity, dtype=dtype)
+    lon = np.empty(capacity, dtype=dtype)
+    names = []
+    name_index = {}
+    stats = {"rows": 0, "chunks": 0, "invalid": 0, "duplicate_names": 0, "duplicate_coordinates": 0}
+
+    for chunk in chunks:
+        stats["chunks"] += 1
+        stats["rows"] += len(chunk)
+        chunk_names = chunk[name_column]
+        chunk_lat = pd.to_numeric(chunk[lat_column], errors="coerce").to_numpy(dtype=float)
+        chunk_lon = pd.to_numeric(chunk[lon_column], errors="coerce").to_numpy(dtype=float)
+        valid = (chunk_names.notna().to_numpy() & np.isfinite(chunk_lat) & np.isfinite(chunk_lon)
+                 & (np.abs(chunk_lat) <= 90) & (np.abs(chunk_lon) <= 180))
+        chunk_names = chunk_names.astype(str).str.strip().to_numpy()
+        valid &= chunk_names != ""
+        stats["invalid"] += int((~valid).sum())
+
+        valid_rows = np.flatnonzero(valid)
+        rows = []
+        for row, name in zip(valid_rows.tolist(), chunk_names[valid_rows].tolist()):
+            if name in name_index:
+                if not dedup:
+                    raise ValueError(f"Nom de ville en double : {name!r}")
+                stats["duplicate_names"] += 1
+                continue
+            name_index[name] = len(names)
+            names.append(name)
+            rows.append(row)
+
+        start, stop = len(names) - len(rows), len(names)
+        if stop > capacity:
+            while stop > capacity:
+                capacity *= 2
+            lat, lon = np.resize(lat, capacity), np.resize(lon, capacity)
+        lat[start:stop] = chunk_lat[rows]
+        lon[start:stop] = chunk_lon[rows]
+
+    n = len(names)
+    lat, lon = lat[:n].copy(), lon[:n].copy()
+    if dedup and n:
+        _, first = np.unique(_coordinate_keys(lat, lon, precision), return_index=True)
+        if len(first) < n:
+            keep = np.sort(first)
+            stats["duplicate_coordinates"] = n - len(keep)
+            names = [names[i] for i in keep]
+            name_index = None
+            lat, lon = lat[keep], lon[keep]
+    stats["kept"] = len(names)
+    return Cities(names, lat, lon, stats, name_index)
+
+
+def load_cities(path, chunksize=100_000, dtype="float64", dedup=True, precision=6, columns=COLUMNS):
+    """
+    Charge un fichier de villes par blocs.
+
+    Args:
+        path: Fichier .csv ou .parquet
+        chunksize: Nombre de lignes lues à la fois
+        dtype: Type des coordonnées ("float64" ou "float32", deux fois plus compact)
+        dedup: Ignorer les noms et les coordonnées en double (première occurrence gardée) ;
+               False = erreur sur un nom en double
+        precision: Décimales des coordonnées pour la déduplication (6 ~ 10 cm)
+        columns: Noms des colonnes (ville, latitude, longitude) dans le fichier
+
+    Returns:
+        Cities ; cities.stats donne les lignes lues, rejetées et dédupliquées
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        chunks = _parquet_chunks(path, columns, chunksize)
+    elif extension == ".csv":
+        chunks = _csv_chunks(path, columns, chunksize)
+    else:
+        raise ValueError(f"Format non pris en charge : {path!r} (attendu : .csv ou .parquet)")
+    return _build_cities(chunks, dtype, dedup, precision, columns)
@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+from client import DEFAULT_ADDRESS, submit, stats, cities_from_dataframe
+from loader import load_cities
+
+# ========= Test de charge du serveur de résolution =========
+#
+# make_instances()..... instances distinctes tirées dans un CSV de villes
+# run_load_test()...... envoie N requêtes avec C clients concurrents, mesure les latences
+# print_load_report().. débit (requêtes/s), percentiles de latence, statuts, taux de déduplication
+# main()............... point d'entrée CLI ; --spawn lance un serveur local temporaire
+#
+# Les requêtes sont tirées parmi `distinct` instances : avec distinct < concurrency, des requêtes
+# identiques arrivent en même temps et le serveur doit les dédupliquer.
+#
+# Usage :
+#   python loadtest.py --spawn --requests 200 --concurrency 16 --distinct 20
+#   python loadtest.py --address unix:/tmp/tsp.sock --solver genetic --params '{"generations": 50}'
+#
+# ============================================================
+
+
+def make_instances(data, distinct=20, sizes=(8, 12), seed=0):
+    """
+    Tire des instances distinctes (sous-ensembles de villes).
+
+    Args:
+        data: DataFrame des villes
+        distinct: Nombre d'instances
+        sizes: Tailles min et max (bornées par le nombre de villes)
+        seed: Graine du tirage
+
+    Returns:
+        Liste de listes de villes (cities_from_dataframe)
+    """
+    rng = np.random.default_rng(seed)
+    low, high = min(sizes[0], len(data)), min(sizes[1], len(data))
+    return [
+        cities_from_dataframe(data.sample(n=int(rng.integers(low, high + 1)), random_state=int(rng.integers(2**31))))
+        for _ in range(distinct)
+    ]
+
+
+async def run_load_test(address, instances, requests=200, concurrency=16, solver="christofides", params=None,
+                        deadline=None, seed=0):
+    """
+    Envoie `requests` requêtes au serveur avec `concurrency` clients simultanés.
+
+    Returns:
+        (DataFrame d'une ligne par requête, durée totale en secondes, statistiques du serveur)
+    """
+    rng = np.random.default_rng(seed)
+    choices = rng.integers(len(instances), size=requests)
+    queue = asyncio.Queue()
+    for choice in choices:
+        queue.put_nowait(int(choice))
+    rows = []
+
+    async def client():
+        while not queue.empty():
+            instance = queue.get_nowait()
+            accepted = {}
+            start = time.perf_counter()
+            event = await submit(address, solver, instances[instance], params=params, deadline=deadline,
+                                 progress=False, on_accepted=accepted.update)
+            rows.append({
+                "instance": instance,
+                "latency_s": time.perf_counter() - start,
+                "status": event.get("status", event["event"]),
+                "deduplicated": accepted.get("deduplicated", False),
+                "distance_km": event.get("distance_km")
+            })
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return pd.DataFrame(rows), elapsed, await stats(address)
+
+
+def print_load_report(runs, elapsed, server_stats=None):
+    """
+    Affiche le débit et les percentiles de latence.
+
+    Args:
+        runs: DataFrame renvoyé par run_load_test()
+        elapsed: Durée totale (s)
+        server_stats: Compteurs du serveur (optionnel)
+    """
+    latencies_ms = runs["latency_s"].to_numpy() * 1000
+    p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99])
+    print("\n" + "="*70)
+    print("TEST DE CHARGE")
+    print("="*70)
+    print(f"Requêtes        : {len(runs)} en {elapsed:.2f} s -> {len(runs) / elapsed:.1f} req/s")
+    print(f"Latence (ms)    : p50 {p50:.1f} | p90 {p90:.1f} | p99 {p99:.1f} | max {latencies_ms.max():.1f}")
+    print(f"Statuts         : {runs['status'].value_counts().to_dict()}")
+    print(f"Dédupliquées    : {runs['deduplicated'].mean() * 100:.1f}%")
+    if server_stats is not None:
+        print(f"Serveur         : {server_stats}")
+
+
+async def _wait_for_server(address, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return await stats(address)
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge du serveur de résolution TSP")
+    parser.add_argument("--address", default=None, help="unix:/chemin/socket ou hôte:port")
+    parser.add_argument("--spawn", action="store_true", help="Lancer un serveur local temporaire")
+    parser.add_argument("--workers", type=int, default=None, help="Processus du serveur lancé par --spawn")
+    parser.add_argument("--data", default="data/villes.csv", help="CSV des villes")
+    parser.add_argument("--solver", choices=("christofides", "genetic"), default="christofides")
+    parser.add_argument("--params", default=None, help="Paramètres du solveur en JSON")
+    parser.add_argument("--deadline", type=float, default=None, help="Délai par requête (s)")
+    parser.add_argument("--requests", type=int, default=200, help="Nombre de requêtes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients simultanés")
+    parser.add_argument("--distinct", type=int, default=20, help="Nombre d'instances distinctes")
+    parser.add_argument("--seed", type=int, default=0, help="Graine")
+    args = parser.parse_args(argv)
+
+    instances = make_instances(load_cities(args.data).to_dataframe(), distinct=args.distinct, seed=args.seed)
+    params = json.loads(args.params) if args.params else None
+
+    server = None
+    address = args.address
+    if args.spawn:
+        address = address or f"unix:{os.path.join(tempfile.mkdtemp(), 'tsp.sock')}"
+        command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py"),
+                   "--address", address, "--max-pending", str(max(64, args.concurrency * 2))]
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+        server = subprocess.Popen(command)
+    address = address or DEFAULT_ADDRESS
+
+    async def run():
+        await _wait_for_server(address)
+        return await run_load_test(address, instances, requests=args.requests, concurrency=args.concurrency,
+                                   solver=args.solver, params=params, deadline=args.deadline, seed=args.seed)
+
+    try:
+        runs, elapsed, server_stats = asyncio.run(run())
+        print_load_report(runs, elapsed, server_stats)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-import pandas as pd
 from genetique import genetic_tsp, genetic_plot, plot_genetic_convergence
 from utils import cristo_algo, cristo_plot
+from loader import load_cities
 
 # ============ fichier principal  ===============
 #
@@ -23,7 +23,7 @@ ELITE_SIZE = 3            # 3 meilleurs preserves
 
 
 # --- Chargement du CSV ---
-data = pd.read_csv("data/villes.csv")
+data = load_cities("data/villes.csv").to_dataframe()
 # --------------------------
 
 
@@ -0,0 +1,268 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+
+# ========= Capture de profils pour les benchmarks =========
+#
+# PROFILING_MODES............ modes acceptés : "none", "cprofile", "sampling"
+# run_profiled()............. exécute une fonction sous le profileur choisi
+# SamplingProfiler........... profileur par échantillonnage (pile du thread principal)
+# pstats_to_collapsed()...... convertit des stats cProfile en piles repliées
+# save_profile_artifacts()... écrit les fichiers .pstats et .collapsed d'un run
+# ProfileCapture............. résultat d'un run profilé (collapsed(), top_functions())
+# print_hot_functions()...... affiche ce résumé dans la console
+# profile_basename()......... nom de base horodaté des artefacts d'un run
+#
+# Le format "collapsed" (une pile "a;b;c poids" par ligne) est celui attendu
+# par flamegraph.pl, speedscope ou inferno pour tracer des flame graphs.
+#
+# ===========================================================
+
+PROFILING_MODES = ("none", "cprofile", "sampling")
+
+
+def _frame_label(filename, lineno, funcname):
+    """Nom lisible d'une fonction, sans ';' pour rester compatible avec le format replié."""
+    label = f"{funcname} ({os.path.basename(filename)}:{lineno})"
+    return label.replace(";", ",")
+
+
+class SamplingProfiler:
+    """
+    Échantillonne périodiquement la pile d'un thread depuis un thread de fond.
+
+    Args:
+        interval: Période d'échantillonnage en secondes
+        thread_id: Thread à observer (par défaut le thread appelant)
+    """
+
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(_frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        self.stacks[tuple(stack)] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self):
+        """Piles repliées : {"a;b;c": nombre d'échantillons}."""
+        return {";".join(stack): count for stack, count in self.stacks.items()}
+
+    def top_functions(self, n=10):
+        """Fonctions triées par temps propre estimé (échantillons où elles sont en sommet de pile)."""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        return [
+            {"function": label, "self_s": count * self.interval, "cumulative_s": total[label] * self.interval,
+             "calls": None}
+            for label, count in own.most_common(n)
+        ]
+
+
+def pstats_to_collapsed(stats, max_depth=64):
+    """
+    Convertit des statistiques cProfile en piles repliées pondérées en microsecondes.
+
+    cProfile ne conserve que les arcs appelant -> appelé : les piles sont reconstruites
+    depuis les racines en répartissant le temps de chaque fonction au prorata de ses arcs,
+    comme le font les outils de flame graph basés sur pstats.
+
+    Args:
+        stats: pstats.Stats
+        max_depth: Profondeur maximale des piles reconstruites
+
+    Returns:
+        Dictionnaire {"a;b;c": microsecondes}
+    """
+    raw = stats.stats
+    children = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    def label(func):
+        filename, lineno, funcname = func
+        return _frame_label(filename, lineno, funcname)
+
+    collapsed = Counter()
+
+    def expand(func, budget, stack, seen):
+        _, _, tottime, cumtime, _ = raw[func]
+        scale = budget / cumtime if cumtime > 0 else 0.0
+        stack = stack + [label(func)]
+        own = tottime * scale
+        if own > 0:
+            collapsed[";".join(stack)] += own
+        if len(stack) >= max_depth:
+            return
+        for child, edge_cumtime in children.get(func, []):
+            if child in seen or child not in raw:
+                continue
+            child_budget = edge_cumtime * scale
+            if child_budget > 0:
+                expand(child, child_budget, stack, seen | {child})
+
+    roots = [func for func, value in raw.items() if not value[4]]
+    for root in roots:
+        expand(root, raw[root][3], [], {root})
+
+    return {stack: int(round(seconds * 1e6)) for stack, seconds in collapsed.items() if seconds * 1e6 >= 1}
+
+
+def _pstats_top_functions(stats, n=10):
+    rows = []
+    for (filename, lineno, funcname), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": _frame_label(filename, lineno, funcname),
+            "self_s": tottime,
+            "cumulative_s": cumtime,
+            "calls": ncalls
+        })
+    rows.sort(key=lambda row: row["self_s"], reverse=True)
+    return rows[:n]
+
+
+class ProfileCapture:
+    """Résultat d'un run profilé : stats cProfile ou échantillons, selon le mode."""
+
+    def __init__(self, mode, stats=None, sampler=None):
+        self.mode = mode
+        self.stats = stats
+        self.sampler = sampler
+
+    def collapsed(self):
+        if self.mode == "cprofile":
+            return pstats_to_collapsed(self.stats)
+        if self.mode == "sampling":
+            return self.sampler.collapsed()
+        return {}
+
+    def top_functions(self, n=10):
+        if self.mode == "cprofile":
+            return _pstats_top_functions(self.stats, n)
+        if self.mode == "sampling":
+            return self.sampler.top_functions(n)
+        return []
+
+
+def run_profiled(func, *args, profiling="none", sampling_interval=0.005, **kwargs):
+    """
+    Exécute func(*args, **kwargs) sous le profileur demandé.
+
+    Args:
+        func: Fonction à exécuter
+        profiling: "none", "cprofile" ou "sampling"
+        sampling_interval: Période d'échantillonnage (mode "sampling")
+
+    Returns:
+        (résultat de func, ProfileCapture ou None si profiling="none")
+    """
+    if profiling not in PROFILING_MODES:
+        raise ValueError(f"Mode de profilage inconnu : {profiling!r} (attendu : {', '.join(PROFILING_MODES)})")
+
+    if profiling == "none":
+        return func(*args, **kwargs), None
+
+    if profiling == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+        return result, ProfileCapture("cprofile", stats=pstats.Stats(profiler))
+
+    sampler = SamplingProfiler(interval=sampling_interval)
+    sampler.start()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        sampler.stop()
+    return result, ProfileCapture("sampling", sampler=sampler)
+
+
+def save_profile_artifacts(capture, directory, basename):
+    """
+    Écrit les artefacts d'un run profilé.
+
+    Args:
+        capture: ProfileCapture renvoyé par run_profiled()
+        directory: Dossier de sortie (créé si besoin)
+        basename: Nom de base des fichiers (sans extension)
+
+    Returns:
+        Dictionnaire {"pstats": chemin ou None, "collapsed": chemin}
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {"pstats": None, "collapsed": None}
+
+    if capture.mode == "cprofile":
+        paths["pstats"] = os.path.join(directory, f"{basename}.pstats")
+        capture.stats.dump_stats(paths["pstats"])
+
+    paths["collapsed"] = os.path.join(directory, f"{basename}.collapsed")
+    with open(paths["collapsed"], "w", encoding="utf-8") as f:
+        for stack, weight in sorted(capture.collapsed().items()):
+            f.write(f"{stack} {weight}\n")
+
+    return paths
+
+
+def print_hot_functions(hot_functions, title=""):
+    """
+    Affiche les fonctions les plus coûteuses d'un run.
+
+    Args:
+        hot_functions: Liste renvoyée par ProfileCapture.top_functions()
+        title: Titre affiché au-dessus du tableau
+    """
+    if not hot_functions:
+        return
+    print(f"  🔥 Fonctions les plus coûteuses {title}".rstrip())
+    for row in hot_functions:
+        calls = f"{row['calls']:>8}" if row["calls"] is not None else " " * 8
+        print(f"     {row['self_s']:8.4f} s  {row['cumulative_s']:8.4f} s cumul  {calls}  {row['function']}")
+
+
+def profile_basename(algo_name, run_index=None):
+    """Nom de base horodaté des artefacts d'un run."""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in algo_name)
+    suffix = f"_{run_index}" if run_index is not None else ""
+    return f"{stamp}_{safe_name}{suffix}"
@@ -0,0 +1,288 @@
+import math
+import time
+import random
+from concurrent.futures import ProcessPoolExecutor
+from utils import haversine_matrix, nearest_neighbors, nearest_neighbor_tour
+from instrumentation import PhaseProfiler
+from loader import city_arrays
+
+# =======  Recuit simulé pour le TSP =======
+#
+# simulated_annealing_tsp()... recuit simulé, résultat au même format que genetic_tsp()
+#
+# Le tour est une liste d'indices de villes, avec la position de chaque ville (pos[ville]).
+# Deux mouvements, guidés par les k plus proches voisins et évalués en O(1) sur la matrice :
+#   - 2-opt : relie une ville a à un de ses voisins c (inversion du segment entre les deux)
+#   - or-opt : déplace un segment de 1 à 3 villes à côté d'un voisin de sa première ville,
+#              dans le sens le moins coûteux
+# Seuls les mouvements acceptés modifient le tour (inversion / déplacement, positions mises à jour
+# sur la plage concernée).
+#
+# Températures :
+#   - t_start calibrée pour accepter ~50% des dégradations au départ, t_end = t_start / 1000
+#   - schedule="geometric" : T = t_start (t_end / t_start)^f, f = avancement (époques ou temps)
+#   - schedule="adaptive"  : T corrigée à chaque époque pour suivre un taux d'acceptation cible
+#                            décroissant de 50% à 0
+#   - réchauffe : sans amélioration pendant `patience` époques, T est multipliée par `reheat`
+#
+# restarts > 1 lance des recuits indépendants (graines et tours de départ différents) dans un
+# pool de processus et garde le meilleur.
+#
+# ==========================================
+
+
+def _calibrate_temperature(dist, tour, neighbors, rng, samples=200, acceptance=0.5):
+    """Température initiale : une dégradation moyenne (2-opt) y est acceptée avec la probabilité `acceptance`."""
+    n = len(tour)
+    increases = []
+    for _ in range(samples):
+        i = rng.randrange(n)
+        a, b = tour[i], tour[(i + 1) % n]
+        c = rng.choice(neighbors[a])
+        j = tour.index(c)
+        d = tour[(j + 1) % n]
+        delta = dist[a][c] + dist[b][d] - dist[a][b] - dist[c][d]
+        if delta > 0:
+            increases.append(delta)
+    mean_increase = sum(increases) / len(increases) if increases else 1.0
+    return -mean_increase / math.log(acceptance)
+
+
+def _anneal(lat, lon, epochs, moves_per_epoch, t_start, t_end, schedule, or_opt_rate, k_neighbors, patience,
+            reheat, time_limit, seed, profile, initial_tour=None, callback=None, verbose=False):
+    """
+    Exécute un recuit.
+
+    Returns:
+        Dictionnaire {"tour" (indices), "distance", "history", "epochs_run", "profile"}
+    """
+    profiler = PhaseProfiler(enabled=profile)
+    rng = random.Random(seed)
+    start_time = time.perf_counter()
+
+    with profiler.phase("setup"):
+        dist_matrix = haversine_matrix(lat, lon)
+        n = len(dist_matrix)
+        neighbors = nearest_neighbors(dist_matrix, k_neighbors).tolist()
+        # Listes Python : un accès dist[a][b] coûte bien moins qu'un accès à un élément numpy
+        dist = dist_matrix.tolist()
+        if initial_tour is not None:
+            tour = list(initial_tour)
+        else:
+            tour = nearest_neighbor_tour(dist_matrix, start=rng.randrange(n)).tolist()
+        pos = [0] * n
+        for index, city in enumerate(tour):
+            pos[city] = index
+        current = sum(dist[tour[k - 1]][tour[k]] for k in range(n))
+        best_tour, best_distance = tour.copy(), current
+
+        moves_per_epoch = moves_per_epoch or 20 * n
+        t_start = t_start or _calibrate_temperature(dist, tour, neighbors, rng)
+        t_end = t_end or t_start / 1000
+    temperature = t_start
+
+    history = {"best": [], "avg": []}
+    stagnation = 0
+    tried = accepted = accepted_two_opt = accepted_or_opt = 0
+
+    for epoch in range(epochs):
+        elapsed = time.perf_counter() - start_time
+        progress = epoch / epochs
+        if time_limit is not None:
+            progress = max(progress, elapsed / time_limit)
+        if schedule == "geometric":
+            temperature = t_start * (t_end / t_start) ** progress
+        epoch_best = best_distance
+        epoch_accepted = 0
+        epoch_sum = 0.0
+
+        with profiler.phase("moves"):
+            for _ in range(moves_per_epoch):
+                if n < 5:
+                    break
+                if rng.random() >= or_opt_rate:
+                    # --- 2-opt : nouvelles arêtes (a, c) et (b, d) ---
+                    i = rng.randrange(n)
+                    a, b = tour[i], tour[(i + 1) % n]
+                    c = neighbors[a][rng.randrange(len(neighbors[a]))]
+                    j = pos[c]
+                    d = tour[(j + 1) % n]
+                    if c == b or d == a:
+                        continue
+                    delta = dist[a][c] + dist[b][d] - dist[a][b] - dist[c][d]
+                    if delta > 0 and rng.random() >= math.exp(-delta / temperature):
+                        continue
+                    low, high = (i + 1, j) if i < j else (j + 1, i)
+                    tour[low:high + 1] = tour[low:high + 1][::-1]
+                    for k in range(low, high + 1):
+                        pos[tour[k]] = k
+                    accepted_two_opt += 1
+                else:
+                    # --- or-opt : déplace tour[i:i+L] entre c et son successeur e ---
+                    length = rng.randint(1, 3)
+                    i = rng.randrange(1, n - length)
+                    p, s0, s1, q = tour[i - 1], tour[i], tour[i + length - 1], tour[i + length]
+                    c = neighbors[s0][rng.randrange(len(neighbors[s0]))]
+                    j = pos[c]
+                    if i - 1 <= j < i + length:
+                        continue
+                    e = tour[(j + 1) % n]
+                    removal = dist[p][s0] + dist[s1][q] - dist[p][q]
+                    forward = dist[c][s0] + dist[s1][e] - dist[c][e]
+                    backward = dist[c][s1] + dist[s0][e] - dist[c][e]
+                    delta = min(forward, backward) - removal
+                    if delta > 0 and rng.random() >= math.exp(-delta / temperature):
+                        continue
+                    segment = tour[i:i + length]
+                    if backward < forward:
+                        segment.reverse()
+                    del tour[i:i + length]
+                    insert_at = (j if j < i else j - length) + 1
+                    tour[insert_at:insert_at] = segment
+                    for k in range(min(i, insert_at), max(i + length, insert_at + length)):
+                        pos[tour[k]] = k
+                    accepted_or_opt += 1
+
+                current += delta
+                epoch_accepted += 1
+                if current < best_distance - 1e-9:
+                    # Recalcul exact : évite la dérive des sommes de deltas
+                    current = sum(dist[tour[k - 1]][tour[k]] for k in range(n))
+                    if current < best_distance:
+                        best_distance = current
+                        best_tour = tour.copy()
+                epoch_sum += current
+            tried += moves_per_epoch
+
+        accepted += epoch_accepted
+        current = sum(dist[tour[k - 1]][tour[k]] for k in range(n))
+        history["best"].append(best_distance)
+        history["avg"].append(epoch_sum / epoch_accepted if epoch_accepted else current)
+        profiler.count("epochs")
+
+        # --- Température ---
+        acceptance_rate = epoch_accepted / moves_per_epoch
+        if schedule == "adaptive":
+            target = 0.5 * (1 - min(progress, 1.0)) ** 2
+            temperature *= math.exp(0.5 * (target - acceptance_rate) / max(target, 0.01))
+            temperature = max(temperature, t_end)
+        if best_distance < epoch_best - 1e-9:
+            stagnation = 0
+        else:
+            stagnation += 1
+            if patience and stagnation >= patience:
+                if schedule == "geometric":
+                    t_start *= reheat
+                else:
+                    temperature *= reheat
+                stagnation = 0
+                profiler.count("reheats")
+
+        if verbose and (epoch % 50 == 0 or epoch == epochs - 1):
+            print(f"Epoque {epoch:3d} | T: {temperature:9.3f} | Acceptation: {acceptance_rate:6.1%} | "
+                  f"Meilleur: {best_distance:.2f} km")
+
+        if callback is not None and callback(epoch, best_tour, best_distance, history["avg"][-1]):
+            break
+        if time_limit is not None and time.perf_counter() - start_time >= time_limit:
+            break
+
+    profiler.set("moves_tried", tried)
+    profiler.set("moves_accepted", accepted)
+    profiler.set("two_opt_accepted", accepted_two_opt)
+    profiler.set("or_opt_accepted", accepted_or_opt)
+    return {
+        "tour": best_tour,
+        "distance": best_distance,
+        "history": history,
+        "epochs_run": len(history["best"]),
+        "profile": profiler.as_dict()
+    }
+
+
+def _anneal_job(args):
+    return _anneal(*args)
+
+
+def simulated_annealing_tsp(data, epochs=200, moves_per_epoch=None, t_start=None, t_end=None, schedule="geometric",
+                            or_opt_rate=0.3, k_neighbors=10, patience=20, reheat=2.0, restarts=1, workers=None,
+                            time_limit=None, seed=None, initial_tour=None, verbose=True, profile=False,
+                            callback=None):
+    """
+    Recuit simule pour resoudre le TSP.
+
+    Args:
+        data: DataFrame avec colonnes Ville, Latitude, Longitude, ou Cities (loader.py)
+        epochs: Nombre d'epoques (paliers de temperature)
+        moves_per_epoch: Mouvements tentes par epoque (None = 20 x nombre de villes)
+        t_start: Temperature initiale (None = calibree sur le tour de depart)
+        t_end: Temperature finale (None = t_start / 1000)
+        schedule: "geometric" ou "adaptive" (taux d'acceptation cible)
+        or_opt_rate: Proportion de mouvements or-opt (le reste en 2-opt)
+        k_neighbors: Taille des listes de voisins qui guident les mouvements
+        patience: Epoques sans amelioration avant rechauffe (0 = jamais)
+        reheat: Facteur de rechauffe
+        restarts: Nombre de recuits independants (en parallele si > 1)
+        workers: Nombre de processus pour les recuits (None = nombre de cœurs)
+        time_limit: Budget de temps en secondes par recuit ; l'avancement de la temperature suit alors le temps
+        seed: Graine (le recuit r utilise seed + r)
+        initial_tour: Tour de depart (noms de villes) ; None = plus proche voisin depuis une ville aleatoire
+        verbose: Afficher les progres
+        profile: Collecter les temps par phase et les compteurs
+        callback: Fonction appelee a chaque epoque (recuit unique) avec (epoque, meilleur tour,
+                  meilleure distance, distance moyenne) ; si elle renvoie True, le recuit s'arrete
+
+    Returns:
+        Dictionnaire au format de genetic_tsp():
+            - best_tour, best_distance, pos, history ({"best", "avg"} par epoque)
+            - generations_run: Nombre d'epoques executees (meilleur recuit)
+            - restarts: Distance finale de chaque recuit
+            - profile: Temps par phase et compteurs (meilleur recuit)
+    """
+    if schedule not in ("geometric", "adaptive"):
+        raise ValueError(f"schedule inconnu : {schedule!r} (attendu : 'geometric' ou 'adaptive')")
+    cities, lat, lon = city_arrays(data)
+    pos = dict(zip(cities, zip(lon.tolist(), lat.tolist())))
+    start = None
+    if initial_tour is not None:
+        city_index = {city: i for i, city in enumerate(cities)}
+        start = [city_index[city] for city in initial_tour if city in city_index]
+        if len(start) == len(cities) + 1 and start[0] == start[-1]:
+            start = start[:-1]
+        if sorted(start) != list(range(len(cities))):
+            raise ValueError("initial_tour doit visiter exactement les villes de data")
+
+    if verbose:
+        print("\n=== Recuit simulé - Démarrage ===")
+        print(f"Epoques: {epochs}, Schedule: {schedule}, Recuits: {restarts}")
+
+    jobs = [(lat, lon, epochs, moves_per_epoch, t_start, t_end, schedule, or_opt_rate, k_neighbors, patience, reheat,
+             time_limit, None if seed is None else seed + r, profile, start)
+            for r in range(restarts)]
+    if restarts == 1:
+        named_callback = None
+        if callback is not None:
+            def named_callback(epoch, tour, distance, avg_distance):
+                return callback(epoch, [cities[i] for i in tour], distance, avg_distance)
+        runs = [_anneal(*jobs[0], callback=named_callback, verbose=verbose)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(_anneal_job, jobs))
+
+    best = min(runs, key=lambda run: run["distance"])
+
+    if verbose:
+        print(f"\n=== Resultat final ===")
+        print(f"Meilleur tour trouve: {best['distance']:.2f} km")
+
+    return {
+        "best_tour": [cities[i] for i in best["tour"]],
+        "best_distance": best["distance"],
+        "pos": pos,
+        "history": best["history"],
+        "epochs": epochs,
+        "generations_run": best["epochs_run"],
+        "restarts": [run["distance"] for run in runs],
+        "seed": seed,
+        "profile": best["profile"]
+    }
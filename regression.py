@@ -0,0 +1,191 @@
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+from benchmark import load_benchmark_history, permutation_pvalue, HISTORY_GROUP_KEYS
+
+# ========= Contrôle de régression des performances =========
+#
+# Compare un nouveau benchmark à une référence stockée pour la même instance,
+# le même algorithme et les mêmes paramètres (temps et mémoire : sur la même machine) :
+#   - temps d'exécution : ralentissement significatif au-delà du seuil
+#   - mémoire : augmentation au-delà du seuil
+#   - distance : perte de qualité significative au-delà du seuil
+#
+# check_regression()... renvoie le tableau des écarts avec les régressions marquées
+# print_report()....... affiche ce tableau
+# main()............... point d'entrée CLI (code de sortie 1 en cas de régression, 2 si rien n'est comparable)
+#
+# Usage :
+#   python regression.py --new results/new_run.jsonl
+#   python regression.py --baseline results/benchmark_history.jsonl --baseline-rev a1b2c3d --new new.jsonl
+#
+# ============================================================
+
+GROUP_KEYS = HISTORY_GROUP_KEYS
+
+# métrique, nom affiché, test statistique requis, dépend de la machine
+CHECKS = [
+    ("execution_time_s", "temps", True, True),
+    ("memory_mb", "mémoire", False, True),
+    ("distance_km", "distance", True, False),
+]
+
+
+def _relative_change(new, old):
+    if old == 0:
+        return 0.0 if new == 0 else np.inf
+    return (new - old) / abs(old)
+
+
+def check_regression(baseline, new_runs, time_threshold=0.10, memory_threshold=0.20, quality_threshold=0.01,
+                     memory_floor_mb=1.0, alpha=0.05):
+    """
+    Compare les runs d'un nouveau benchmark à la référence, groupe par groupe.
+
+    Un groupe régresse sur une métrique si la moyenne augmente de plus du seuil relatif et,
+    pour le temps et la distance, si l'écart est significatif (test de permutation) lorsque
+    les deux côtés ont au moins deux runs. Le temps et la mémoire ne sont comparés qu'aux runs de
+    référence de la même machine (machine_key) ; s'il n'y en a pas, la ligne est marquée
+    other_machine et ne compte pas comme une régression.
+
+    Args:
+        baseline: DataFrame de référence (load_benchmark_history)
+        new_runs: DataFrame du nouveau benchmark (même format)
+        time_threshold: Ralentissement relatif toléré (0.10 = +10%)
+        memory_threshold: Augmentation relative de mémoire tolérée
+        quality_threshold: Augmentation relative de distance tolérée
+        memory_floor_mb: Écart absolu de mémoire en dessous duquel on ne signale rien
+        alpha: Seuil de significativité
+
+    Returns:
+        DataFrame avec une ligne par (groupe, métrique) et les colonnes booléennes "regression"
+        et "other_machine"
+    """
+    thresholds = {"execution_time_s": time_threshold, "memory_mb": memory_threshold, "distance_km": quality_threshold}
+    rows = []
+    for key, new_group in new_runs.groupby(GROUP_KEYS, sort=True, dropna=False):
+        mask = np.ones(len(baseline), dtype=bool)
+        for column, value in zip(GROUP_KEYS, key):
+            mask &= (baseline[column] == value).to_numpy() | (baseline[column].isna() & pd.isna(value)).to_numpy()
+        old_group = baseline[mask]
+        if old_group.empty:
+            continue
+
+        same_machine = old_group
+        if "machine_key" in new_group and "machine_key" in old_group:
+            machines = set(new_group["machine_key"].fillna(""))
+            same_machine = old_group[old_group["machine_key"].fillna("").isin(machines)]
+
+        for metric, name, needs_test, hardware in CHECKS:
+            if metric not in new_group or metric not in old_group:
+                continue
+            new_values = new_group[metric].dropna().to_numpy(dtype=float)
+            old_values = old_group[metric].dropna().to_numpy(dtype=float)
+            if len(new_values) == 0 or len(old_values) == 0:
+                continue
+            if hardware:
+                old_values = same_machine[metric].dropna().to_numpy(dtype=float)
+                if len(old_values) == 0:
+                    rows.append({
+                        "instance": key[0], "algorithm": key[1], "params": key[2], "metric": name,
+                        "baseline_mean": np.nan, "new_mean": round(float(new_values.mean()), 4),
+                        "change_pct": np.nan, "pvalue": np.nan, "n_baseline": 0, "n_new": len(new_values),
+                        "regression": False, "other_machine": True
+                    })
+                    continue
+
+            change = _relative_change(new_values.mean(), old_values.mean())
+            pvalue = np.nan
+            if len(new_values) >= 2 and len(old_values) >= 2:
+                pvalue = permutation_pvalue(new_values, old_values)
+
+            regression = change > thresholds[metric]
+            if needs_test and not np.isnan(pvalue):
+                regression = regression and pvalue < alpha
+            if metric == "memory_mb":
+                regression = regression and (new_values.mean() - old_values.mean()) > memory_floor_mb
+
+            rows.append({
+                "instance": key[0],
+                "algorithm": key[1],
+                "params": key[2],
+                "metric": name,
+                "baseline_mean": round(float(old_values.mean()), 4),
+                "new_mean": round(float(new_values.mean()), 4),
+                "change_pct": round(change * 100, 2),
+                "pvalue": round(pvalue, 4) if not np.isnan(pvalue) else np.nan,
+                "n_baseline": len(old_values),
+                "n_new": len(new_values),
+                "regression": bool(regression),
+                "other_machine": False
+            })
+    return pd.DataFrame(rows)
+
+
+def print_report(report):
+    """
+    Affiche le tableau des écarts entre la référence et le nouveau benchmark.
+
+    Args:
+        report: DataFrame renvoyé par check_regression()
+    """
+    print("\n" + "="*70)
+    print("CONTRÔLE DE RÉGRESSION")
+    print("="*70)
+    if report.empty:
+        print("Aucun groupe comparable (instance, algorithme, paramètres) dans la référence.")
+        return
+    table = report.copy()
+    table["statut"] = np.where(table["regression"], "❌ RÉGRESSION",
+                               np.where(table["other_machine"], "⚠ autre machine", "✓"))
+    columns = ["algorithm", "params", "metric", "baseline_mean", "new_mean", "change_pct", "pvalue",
+               "n_baseline", "n_new", "statut"]
+    print(table[columns].to_string(index=False))
+    n_regressions = int(report["regression"].sum())
+    n_other = int(report["other_machine"].sum())
+    if n_other:
+        print(f"\n⚠ {n_other} mesure(s) de temps ou de mémoire non comparée(s) : référence issue d'une autre machine")
+    print("\n" + (f"❌ {n_regressions} régression(s) détectée(s)" if n_regressions else "✓ Aucune régression"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Contrôle de régression des benchmarks TSP")
+    parser.add_argument("--baseline", default="results/benchmark_history.jsonl",
+                        help="Historique de référence (JSON lines)")
+    parser.add_argument("--baseline-rev", default=None,
+                        help="Ne garder que les runs de référence de cette révision git")
+    parser.add_argument("--new", required=True, help="Runs du nouveau benchmark (JSON lines)")
+    parser.add_argument("--time-threshold", type=float, default=0.10, help="Ralentissement toléré (0.10 = +10%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.20, help="Hausse de mémoire tolérée")
+    parser.add_argument("--quality-threshold", type=float, default=0.01, help="Hausse de distance tolérée")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Seuil de significativité")
+    args = parser.parse_args(argv)
+
+    baseline = load_benchmark_history(args.baseline)
+    new_runs = load_benchmark_history(args.new)
+    if baseline is None or new_runs is None:
+        return 2
+    if baseline.empty or new_runs.empty:
+        print_report(pd.DataFrame())
+        return 2
+
+    if args.baseline_rev is not None:
+        revisions = baseline["git_rev"] if "git_rev" in baseline else pd.Series("", index=baseline.index)
+        revisions = revisions.fillna("").astype(str)
+        baseline = baseline[revisions.map(lambda rev: rev.startswith(args.baseline_rev))]
+    elif "git_rev" in new_runs and "git_rev" in baseline:
+        # Par défaut, la référence exclut les runs de la révision testée
+        baseline = baseline[~baseline["git_rev"].isin(new_runs["git_rev"].dropna().unique())]
+
+    report = check_regression(baseline, new_runs, time_threshold=args.time_threshold,
+                              memory_threshold=args.memory_threshold, quality_threshold=args.quality_threshold,
+                              alpha=args.alpha)
+    print_report(report)
+    if report.empty:
+        return 2
+    return 1 if report["regression"].any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
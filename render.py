@@ -0,0 +1,102 @@
+import os
+import matplotlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# ========= Rendu par lots des figures, sans écran =========
+#
+# render_job()....... rend une figure (Christofides, étapes, génétique, convergence, comparaison) dans un fichier
+# render_batch()..... rend de nombreux résultats en parallèle dans un pool de processus
+#
+# Chaque worker passe en backend Agg et garde en mémoire ses cartes de fond (cache de
+# utils.basemap) : seuls les premiers rendus d'une région paient la construction de la carte.
+# Les figures sont écrites puis fermées, la mémoire ne grossit pas au fil des rendus.
+#
+# Un job est un dictionnaire :
+#   {"kind": "cristo" | "cristo_steps" | "genetic" | "convergence" | "compare",
+#    "name": nom du fichier (sans extension),
+#    "result": résultat de cristo_algo() ou genetic_tsp(),
+#    "result_genetic": résultat de genetic_tsp() (kind="compare" uniquement),
+#    "options": paramètres supplémentaires de la fonction d'affichage}
+#
+# ===========================================================
+
+RENDER_KINDS = ("cristo", "cristo_steps", "genetic", "convergence", "compare")
+
+
+def _init_render_worker():
+    """Backend sans écran pour les processus de rendu."""
+    matplotlib.use("Agg", force=True)
+
+
+def render_job(job, output_dir, fmt="png"):
+    """
+    Rend un job dans output_dir/<name>.<fmt>.
+
+    Args:
+        job: Dictionnaire décrivant la figure (voir l'en-tête du module)
+        output_dir: Dossier de sortie
+        fmt: Format de fichier ("png", "svg", "pdf")
+
+    Returns:
+        Chemin du fichier écrit (liste de chemins pour kind="cristo_steps")
+    """
+    from utils import cristo_plot, cristo_steps
+    from genetique import genetic_plot, plot_genetic_convergence
+    from visualize import compare_figure
+
+    kind = job["kind"]
+    if kind not in RENDER_KINDS:
+        raise ValueError(f"Type de figure inconnu : {kind!r} (attendu : {', '.join(RENDER_KINDS)})")
+
+    output = os.path.join(output_dir, f"{job['name']}.{fmt}")
+    options = job.get("options", {})
+    result = job["result"]
+
+    if kind == "cristo":
+        return cristo_plot(result, output=output, **options)
+    if kind == "cristo_steps":
+        return cristo_steps(result, output=output)
+    if kind == "genetic":
+        options.setdefault("pop_size", result.get("pop_size"))
+        options.setdefault("generations", result.get("generations"))
+        return genetic_plot(result, output=output, **options)
+    if kind == "convergence":
+        return plot_genetic_convergence(result["history"], output=output)
+    genetic_params = options.get("genetic_params") or {
+        "pop_size": job["result_genetic"].get("pop_size"),
+        "generations": job["result_genetic"].get("generations")
+    }
+    return compare_figure(result, job["result_genetic"], genetic_params, output=output)
+
+
+def _render_job_worker(args):
+    job, output_dir, fmt = args
+    return job["name"], render_job(job, output_dir, fmt)
+
+
+def render_batch(jobs, output_dir="results/figures", fmt="png", workers=None, verbose=True):
+    """
+    Rend de nombreux résultats en fichiers image dans un pool de processus.
+
+    Args:
+        jobs: Liste de jobs (voir l'en-tête du module)
+        output_dir: Dossier de sortie
+        fmt: Format de fichier ("png", "svg", "pdf")
+        workers: Nombre de processus (None = nombre de cœurs)
+        verbose: Afficher l'avancement
+
+    Returns:
+        Dictionnaire {nom du job: chemin(s) écrit(s)}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    written = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as pool:
+        futures = [pool.submit(_render_job_worker, (job, output_dir, fmt)) for job in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            name, path = future.result()
+            written[name] = path
+            if verbose:
+                print(f"\r  {done}/{len(jobs)} figures rendues", end="", flush=True)
+    if verbose:
+        print(f"\n✓ Figures écrites dans {output_dir}")
+    return written
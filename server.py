@@ -0,0 +1,415 @@
+import io
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import hashlib
+import argparse
+import itertools
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from batch import JobTimeout, hard_limit, HARD_LIMIT_GRACE, HARD_LIMIT_MIN_GRACE
+from client import DEFAULT_ADDRESS, parse_address
+
+# ========= Serveur asyncio de résolution TSP =========
+#
+# JobServer............ accepte des jobs sur un socket Unix ou TCP et les exécute dans un pool de processus borné
+#   .start()........... ouvre le socket
+#   .submit().......... crée un job, ou rattache la requête à un job identique déjà en cours (déduplication)
+#   .cancel().......... demande l'arrêt d'un job
+#   .stats()........... compteurs du serveur
+# main()............... point d'entrée CLI
+#
+# Protocole (JSON lines) : le client envoie une requête par ligne, le serveur répond par des événements.
+#   {"op": "solve", "solver": "genetic", "cities": [...], "params": {...}, "deadline": 5, "progress": true}
+#       -> {"event": "accepted", "job_id": ..., "deduplicated": false}
+#       -> {"event": "progress", "generation": ..., "best_distance": ..., "avg_distance": ...}   (génétique)
+#       -> {"event": "result", "status": "ok" | "cancelled" | "timeout" | "error", ...}
+#   {"op": "cancel", "job_id": ...}   (sur une autre connexion, ou sur celle du job)
+#   {"op": "stats"}
+#
+# - Progression : le callback de genetic_tsp() publie au plus toutes les progress_interval secondes
+#   dans une file partagée, relayée aux clients abonnés.
+# - Annulation : un drapeau partagé, lu par le même callback ; le génétique s'arrête à la génération
+#   suivante avec son meilleur tour. Christofides ne s'annule qu'avant son démarrage.
+# - Délai : compté depuis la soumission ; le génétique le reçoit comme time_limit, et tout job qui le
+#   dépasse franchement est interrompu (comme dans batch.py).
+# - Déduplication : deux requêtes identiques (solveur, villes, paramètres, délai) en cours en même
+#   temps partagent un seul calcul. Un job dont tous les clients se sont déconnectés est annulé.
+#
+# Usage :
+#   python server.py --address unix:/tmp/tsp.sock --workers 4
+#
+# =====================================================
+
+SOLVERS = ("christofides", "genetic")
+
+_WORKER_STATE = {}
+
+
+def _parse_message(line):
+    """Renvoie (message, None) pour une ligne contenant un objet JSON, (None, événement d'erreur) sinon."""
+    try:
+        message = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as error:
+        return None, {"event": "error", "error": f"JSON invalide : {error}"}
+    if not isinstance(message, dict):
+        return None, {"event": "error", "error": f"Objet JSON attendu, reçu : {type(message).__name__}"}
+    return message, None
+
+
+# ------- Côté worker -------
+
+def _init_server_worker(progress_queue, cancelled):
+    """Initialise un processus du pool : solveurs importés et files partagées reçues une seule fois."""
+    from utils import cristo_algo
+    from genetique import genetic_tsp
+
+    # Ctrl+C est géré par le serveur, pas par les workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _WORKER_STATE.update(progress=progress_queue, cancelled=cancelled,
+                         solvers={"christofides": cristo_algo, "genetic": genetic_tsp})
+
+
+def _warmup_worker():
+    """Job vide : force le démarrage (et l'initialisation) d'un worker avant l'ouverture du socket."""
+    time.sleep(0.05)
+    return os.getpid()
+
+
+class _ProgressReporter:
+    """Callback de genetic_tsp() : publie la progression et lit le drapeau d'annulation, au plus toutes les
+    `interval` secondes (un aller-retour avec le serveur de mémoire partagée coûte ~0.1 ms)."""
+
+    def __init__(self, job_id, interval):
+        self.job_id = job_id
+        self.interval = interval
+        self.last = 0.0
+        self.cancelled = False
+
+    def __call__(self, generation, best_tour, best_distance, avg_distance):
+        now = time.perf_counter()
+        if now - self.last < self.interval:
+            return False
+        self.last = now
+        _WORKER_STATE["progress"].put((self.job_id, {
+            "event": "progress", "job_id": self.job_id, "generation": generation,
+            "best_distance": round(best_distance, 4), "avg_distance": round(avg_distance, 4)
+        }))
+        self.cancelled = bool(_WORKER_STATE["cancelled"].get(self.job_id))
+        return self.cancelled
+
+
+def _run_server_job(job_id, solver, cities, params, deadline_at, progress_interval):
+    """
+    Exécute un job dans un worker.
+
+    Args:
+        job_id: Identifiant du job
+        solver: "christofides" ou "genetic"
+        cities: Liste de villes {"Ville", "Latitude", "Longitude"}
+        params: Paramètres du solveur
+        deadline_at: Échéance absolue (time.time()) ou None
+        progress_interval: Intervalle minimal entre deux événements de progression (s)
+
+    Returns:
+        Événement "result"
+    """
+    import pandas as pd
+
+    event = {"event": "result", "job_id": job_id, "solver": solver, "status": "ok"}
+    start = time.perf_counter()
+    if _WORKER_STATE["cancelled"].get(job_id):
+        event["status"] = "cancelled"
+        return event
+
+    hard_timeout = None
+    params = dict(params)
+    reporter = None
+    if deadline_at is not None:
+        remaining = deadline_at - time.time()
+        if remaining <= 0:
+            event["status"] = "timeout"
+            return event
+        hard_timeout = remaining + max(HARD_LIMIT_MIN_GRACE, HARD_LIMIT_GRACE * remaining)
+        if solver == "genetic":
+            params["time_limit"] = min(params.get("time_limit") or remaining, remaining)
+    if solver == "genetic":
+        params.setdefault("verbose", False)
+        reporter = _ProgressReporter(job_id, progress_interval)
+        params["callback"] = reporter
+
+    try:
+        data = pd.DataFrame(cities)
+        with hard_limit(hard_timeout), contextlib.redirect_stdout(io.StringIO()):
+            result = _WORKER_STATE["solvers"][solver](data, **params)
+        if solver == "christofides":
+            event["tour"], event["distance_km"] = result["tour"][:-1], round(float(result["total_distance"]), 4)
+        else:
+            event["tour"], event["distance_km"] = result["best_tour"], round(float(result["best_distance"]), 4)
+            event["generations_run"] = result["generations_run"]
+            if reporter.cancelled:
+                event["status"] = "cancelled"
+    except JobTimeout:
+        event["status"] = "timeout"
+    except Exception as error:
+        event["status"] = "error"
+        event["error"] = f"{type(error).__name__}: {error}"
+    event["run_s"] = round(time.perf_counter() - start, 4)
+    return event
+
+
+# ------- Côté serveur -------
+
+def request_key(request):
+    """Empreinte d'une requête : deux requêtes de même empreinte produisent le même calcul."""
+    canonical = json.dumps([request.get("solver"), request.get("cities"), request.get("params") or {},
+                            request.get("deadline")], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class _Job:
+    def __init__(self, job_id, key):
+        self.job_id = job_id
+        self.key = key
+        self.subscribers = set()
+        self.submitted = time.perf_counter()
+
+    def publish(self, event):
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+
+class JobServer:
+    """
+    Serveur de jobs TSP.
+
+    Args:
+        workers: Nombre de processus du pool (None = nombre de cœurs)
+        max_pending: Nombre maximal de jobs en cours ou en attente ; au-delà, les requêtes sont refusées
+        progress_interval: Intervalle minimal entre deux événements de progression (s)
+    """
+
+    def __init__(self, workers=None, max_pending=64, progress_interval=0.2):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.progress_interval = progress_interval
+        self.jobs = {}
+        self.jobs_by_key = {}
+        self.counters = dict.fromkeys(("submitted", "deduplicated", "rejected", "ok", "cancelled", "timeout",
+                                       "error"), 0)
+        self._ids = itertools.count(1)
+        self._manager = multiprocessing.Manager()
+        self._progress = self._manager.Queue()
+        self._cancelled = self._manager.dict()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_server_worker,
+                                         initargs=(self._progress, self._cancelled))
+        self._server = None
+        self._pump = None
+        self._tasks = set()
+
+    # --- Jobs ---
+    def submit(self, request):
+        """
+        Crée un job pour la requête, ou renvoie le job identique déjà en cours.
+
+        Returns:
+            (job, dédupliqué) ou (None, False) si le serveur est plein
+        """
+        key = request_key(request)
+        job = self.jobs_by_key.get(key)
+        if job is not None:
+            self.counters["deduplicated"] += 1
+            return job, True
+        if len(self.jobs) >= self.max_pending:
+            self.counters["rejected"] += 1
+            return None, False
+
+        job = _Job(f"job-{next(self._ids)}", key)
+        self.jobs[job.job_id] = job
+        self.jobs_by_key[key] = job
+        self.counters["submitted"] += 1
+        deadline = request.get("deadline")
+        deadline_at = time.time() + deadline if deadline is not None else None
+        future = asyncio.get_running_loop().run_in_executor(
+            self._pool, _run_server_job, job.job_id, request["solver"], request["cities"],
+            request.get("params") or {}, deadline_at, self.progress_interval)
+        task = asyncio.ensure_future(self._finish(job, future))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job, False
+
+    async def _finish(self, job, future):
+        try:
+            event = await future
+        except Exception as error:
+            event = {"event": "result", "job_id": job.job_id, "status": "error",
+                     "error": f"{type(error).__name__}: {error}"}
+        event["latency_s"] = round(time.perf_counter() - job.submitted, 4)
+        self.counters[event["status"]] += 1
+        del self.jobs[job.job_id]
+        del self.jobs_by_key[job.key]
+        self._cancelled.pop(job.job_id, None)
+        job.publish(event)
+
+    def cancel(self, job_id):
+        """Demande l'arrêt d'un job ; renvoie False s'il n'est plus en cours."""
+        if job_id not in self.jobs:
+            return False
+        self._cancelled[job_id] = True
+        return True
+
+    def stats(self):
+        return {"event": "stats", "in_flight": len(self.jobs), "workers": self.workers,
+                "max_pending": self.max_pending, **self.counters}
+
+    async def _pump_progress(self):
+        """Relaie la progression publiée par les workers aux clients abonnés."""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await loop.run_in_executor(None, self._progress.get)
+            if item is None:
+                return
+            job_id, event = item
+            job = self.jobs.get(job_id)
+            if job is not None:
+                job.publish(event)
+
+    # --- Connexions ---
+    async def _send(self, writer, event):
+        writer.write((json.dumps(event, ensure_ascii=False) + "\n").encode())
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            request, error = _parse_message(line)
+            if error is not None:
+                await self._send(writer, error)
+                return
+
+            op = request.get("op", "solve")
+            if op == "stats":
+                await self._send(writer, self.stats())
+            elif op == "cancel":
+                await self._send(writer, {"event": "cancel", "job_id": request.get("job_id"),
+                                          "accepted": self.cancel(request.get("job_id"))})
+            elif op == "solve":
+                await self._serve_job(request, reader, writer)
+            else:
+                await self._send(writer, {"event": "error", "error": f"Opération inconnue : {op!r}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _serve_job(self, request, reader, writer):
+        if request.get("solver") not in SOLVERS or not request.get("cities"):
+            await self._send(writer, {"event": "error",
+                                      "error": f"Requête invalide : solver parmi {SOLVERS} et cities requis"})
+            return
+        job, deduplicated = self.submit(request)
+        if job is None:
+            await self._send(writer, {"event": "rejected", "reason": "busy", "max_pending": self.max_pending})
+            return
+
+        events = asyncio.Queue()
+        job.subscribers.add(events)
+        try:
+            await self._send(writer, {"event": "accepted", "job_id": job.job_id, "deduplicated": deduplicated})
+            want_progress = request.get("progress", True)
+            incoming = asyncio.ensure_future(reader.readline())
+            while True:
+                outgoing = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({incoming, outgoing}, return_when=asyncio.FIRST_COMPLETED)
+                if incoming in done:
+                    line = incoming.result()
+                    if not line:
+                        # Client déconnecté
+                        outgoing.cancel()
+                        return
+                    message, error = _parse_message(line)
+                    if error is not None:
+                        await self._send(writer, error)
+                    elif message.get("op") == "cancel":
+                        self.cancel(job.job_id)
+                    incoming = asyncio.ensure_future(reader.readline())
+                if outgoing in done:
+                    event = outgoing.result()
+                    if event["event"] == "progress" and not want_progress:
+                        continue
+                    await self._send(writer, event)
+                    if event["event"] == "result":
+                        incoming.cancel()
+                        return
+                else:
+                    outgoing.cancel()
+        finally:
+            job.subscribers.discard(events)
+            if not job.subscribers and job.job_id in self.jobs:
+                self.cancel(job.job_id)
+
+    # --- Cycle de vie ---
+    async def start(self, address=DEFAULT_ADDRESS):
+        # Les workers (imports de networkx, Basemap...) démarrent avant les premières requêtes
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _warmup_worker) for _ in range(self.workers)))
+
+        kind, target = parse_address(address)
+        if kind == "unix":
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(target)
+            self._server = await asyncio.start_unix_server(self._handle, path=target, limit=2**26)
+        else:
+            self._server = await asyncio.start_server(self._handle, *target, limit=2**26)
+        self._pump = asyncio.ensure_future(self._pump_progress())
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self._progress.put(None)
+        if self._pump is not None:
+            await self._pump
+        self._manager.shutdown()
+
+
+async def serve(address=DEFAULT_ADDRESS, workers=None, max_pending=64, progress_interval=0.2):
+    """Lance le serveur jusqu'à Ctrl+C / SIGTERM."""
+    server = JobServer(workers=workers, max_pending=max_pending, progress_interval=progress_interval)
+    await server.start(address)
+    print(f"✓ Serveur TSP sur {address} ({server.workers} workers, {max_pending} jobs max)", file=sys.stderr,
+          flush=True)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+    await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur asyncio de résolution TSP")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help="unix:/chemin/socket ou hôte:port")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus")
+    parser.add_argument("--max-pending", type=int, default=64, help="Jobs en cours ou en attente au maximum")
+    parser.add_argument("--progress-interval", type=float, default=0.2, help="Intervalle de progression (s)")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.address, workers=args.workers, max_pending=args.max_pending,
+                      progress_interval=args.progress_interval))
+
+
+if __name__ == "__main__":
+    main()
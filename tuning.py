@@ -0,0 +1,258 @@
+import io
+import os
+import json
+import time
+import random
+import argparse
+import contextlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from loader import load_cities
+
+# ========= Réglage des hyperparamètres de l'algorithme génétique =========
+#
+# Recherche par successive halving (racing) :
+#   1. tire N configurations dans PARAM_SPACE
+#   2. évalue chaque configuration survivante sur plusieurs graines avec un budget de temps fixe
+#   3. ne garde que le meilleur 1/eta (distance moyenne) et multiplie le budget par eta
+#   4. recommence jusqu'à ce qu'il ne reste qu'une configuration
+#
+# Le critère est la qualité du tour à budget CPU égal, pas à nombre de générations égal :
+# chaque run reçoit time_limit secondes et autant de générations qu'il peut en faire.
+#
+# sample_configs()......... tire des configurations distinctes dans l'espace de recherche
+# successive_halving()..... racing sur une instance, renvoie la meilleure configuration
+# tune_by_size()........... meilleure configuration par taille d'instance
+#
+# Usage :
+#   python tuning.py --data data/villes.csv --sizes 10 20 --configs 27 --budget 1
+#
+# =========================================================================
+
+PARAM_SPACE = {
+    "pop_size": [20, 50, 100, 200],
+    "mutation_rate": [0.02, 0.05, 0.1, 0.2, 0.4],
+    "elite_size": [1, 2, 5, 10],
+    "tournament_size": [2, 3, 5, 8]
+}
+
+# Nombre de générations "infini" : le budget de temps arrête l'algorithme
+_UNBOUNDED_GENERATIONS = 10**9
+
+_WORKER_INSTANCES = None
+
+
+def _init_tuning_worker(instances):
+    """Initialise un processus du pool : les instances sont reçues une seule fois par worker."""
+    global _WORKER_INSTANCES
+    _WORKER_INSTANCES = instances
+
+
+def _run_tuning_job(job):
+    """
+    Exécute genetic_tsp pour une configuration, une graine et un budget.
+
+    Args:
+        job: Dictionnaire {"size", "config_id", "params", "seed", "budget"}
+
+    Returns:
+        Dictionnaire avec la distance, le temps CPU et le nombre de générations
+    """
+    from genetique import genetic_tsp
+
+    data = _WORKER_INSTANCES[job["size"]]
+    cpu_start = time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = genetic_tsp(data, generations=_UNBOUNDED_GENERATIONS, verbose=False, seed=job["seed"],
+                             time_limit=job["budget"], **job["params"])
+    cpu_time = time.process_time() - cpu_start
+
+    return {
+        "size": job["size"],
+        "config_id": job["config_id"],
+        "seed": job["seed"],
+        "budget": job["budget"],
+        "distance_km": result["best_distance"],
+        "cpu_time_s": cpu_time,
+        "generations_run": result["generations_run"]
+    }
+
+
+def sample_configs(n_configs, param_space=PARAM_SPACE, seed=0):
+    """
+    Tire des configurations distinctes et valides dans l'espace de recherche.
+
+    Args:
+        n_configs: Nombre de configurations voulues
+        param_space: Dictionnaire {paramètre: valeurs possibles}
+        seed: Graine du tirage
+
+    Returns:
+        Liste de dictionnaires de paramètres
+    """
+    rng = random.Random(seed)
+    names = sorted(param_space)
+    total = int(np.prod([len(param_space[name]) for name in names]))
+    configs, seen = [], set()
+    attempts = 0
+    while len(configs) < min(n_configs, total) and attempts < 100 * n_configs:
+        attempts += 1
+        params = {name: rng.choice(param_space[name]) for name in names}
+        key = tuple(params[name] for name in names)
+        if key in seen:
+            continue
+        seen.add(key)
+        # Configurations incohérentes : trop d'élites ou tournoi plus grand que la population
+        if params.get("elite_size", 0) >= params.get("pop_size", np.inf):
+            continue
+        if params.get("tournament_size", 0) > params.get("pop_size", np.inf):
+            continue
+        configs.append(params)
+    return configs
+
+
+def successive_halving(instances, size, configs, pool, min_budget=1.0, eta=3, seeds_per_round=3, base_seed=0,
+                       verbose=True):
+    """
+    Racing par successive halving sur une instance.
+
+    Args:
+        instances: Dictionnaire {taille: DataFrame} partagé avec les workers
+        size: Taille de l'instance à régler
+        configs: Liste de configurations candidates
+        pool: ProcessPoolExecutor initialisé avec _init_tuning_worker
+        min_budget: Budget de temps (s) par run au premier tour
+        eta: Facteur d'élimination (on garde 1/eta des configurations par tour)
+        seeds_per_round: Nombre de graines par configuration et par tour
+        base_seed: Première graine utilisée
+        verbose: Afficher le déroulement des tours
+
+    Returns:
+        (meilleure configuration, DataFrame de tous les runs)
+    """
+    survivors = list(range(len(configs)))
+    budget = min_budget
+    all_runs = []
+    round_index = 0
+
+    while True:
+        seeds = [base_seed + round_index * seeds_per_round + k for k in range(seeds_per_round)]
+        jobs = [
+            {"size": size, "config_id": config_id, "params": configs[config_id], "seed": seed, "budget": budget}
+            for config_id in survivors
+            for seed in seeds
+        ]
+        runs = list(pool.map(_run_tuning_job, jobs))
+        for run in runs:
+            run["round"] = round_index
+        all_runs.extend(runs)
+
+        df_round = pd.DataFrame(runs)
+        ranking = df_round.groupby("config_id")["distance_km"].mean().sort_values()
+
+        if verbose:
+            best_id = ranking.index[0]
+            print(f"  [n={size}] tour {round_index} : {len(survivors)} configurations, budget {budget:.2f} s, "
+                  f"meilleure {ranking.iloc[0]:.2f} km {configs[best_id]}")
+
+        if len(survivors) == 1:
+            break
+        keep = max(1, len(survivors) // eta)
+        survivors = list(ranking.index[:keep])
+        budget *= eta
+        round_index += 1
+
+    best_id = survivors[0]
+    df_runs = pd.DataFrame(all_runs)
+    df_runs["params"] = df_runs["config_id"].map(lambda config_id: json.dumps(configs[config_id], sort_keys=True))
+    return configs[best_id], df_runs
+
+
+def tune_by_size(data, sizes, n_configs=27, min_budget=1.0, eta=3, seeds_per_round=3, workers=None, seed=0,
+                 output="results/tuning.json", verbose=True):
+    """
+    Cherche la meilleure configuration génétique pour plusieurs tailles d'instance.
+
+    Les instances de taille n sont tirées (avec une graine fixe) parmi les villes de data.
+
+    Args:
+        data: DataFrame des villes
+        sizes: Liste de tailles d'instance
+        n_configs: Nombre de configurations tirées au départ
+        min_budget: Budget de temps (s) par run au premier tour
+        eta: Facteur d'élimination du successive halving
+        seeds_per_round: Nombre de graines par configuration et par tour
+        workers: Nombre de processus (None = nombre de cœurs)
+        seed: Graine du tirage des configurations et des instances
+        output: Fichier JSON des meilleures configurations (None = pas de sauvegarde)
+        verbose: Afficher le déroulement
+
+    Returns:
+        Dictionnaire {taille: {"params": meilleure configuration, "distance_km": ..., "quality_per_cpu_s": ...}}
+    """
+    sizes = [size for size in sizes if size <= len(data)]
+    instances = {size: data.sample(n=size, random_state=seed).reset_index(drop=True) for size in sizes}
+    configs = sample_configs(n_configs, seed=seed)
+
+    if verbose:
+        print("\n" + "="*70)
+        print(f"RÉGLAGE DES HYPERPARAMÈTRES ({len(configs)} configurations, tailles {sizes})")
+        print("="*70)
+
+    best = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_tuning_worker, initargs=(instances,)) as pool:
+        for size in sizes:
+            params, df_runs = successive_halving(instances, size, configs, pool, min_budget=min_budget, eta=eta,
+                                                 seeds_per_round=seeds_per_round, base_seed=seed, verbose=verbose)
+            final = df_runs[df_runs["round"] == df_runs["round"].max()]
+            distance = float(final["distance_km"].mean())
+            cpu_time = float(final["cpu_time_s"].mean())
+            best[size] = {
+                "params": params,
+                "distance_km": round(distance, 2),
+                "cpu_time_s": round(cpu_time, 4),
+                # Qualité par seconde CPU : inverse de (distance × temps), plus grand = meilleur
+                "quality_per_cpu_s": round(1 / (distance * cpu_time), 10) if distance * cpu_time > 0 else None,
+                "generations_run": int(final["generations_run"].mean()),
+                "total_runs": len(df_runs)
+            }
+
+    if verbose:
+        print("\n" + "="*70)
+        print("MEILLEURES CONFIGURATIONS PAR TAILLE")
+        print("="*70)
+        for size, entry in best.items():
+            print(f"  n={size:5d} : {entry['params']} -> {entry['distance_km']:.2f} km "
+                  f"en {entry['cpu_time_s']:.2f} s CPU ({entry['generations_run']} générations)")
+
+    if output is not None:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({str(size): entry for size, entry in best.items()}, f, indent=2)
+        if verbose:
+            print(f"\n✓ Configurations sauvegardées dans {output}")
+
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Réglage des hyperparamètres de l'algorithme génétique")
+    parser.add_argument("--data", default="data/villes.csv", help="CSV des villes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20], help="Tailles d'instance")
+    parser.add_argument("--configs", type=int, default=27, help="Nombre de configurations tirées")
+    parser.add_argument("--budget", type=float, default=1.0, help="Budget (s) par run au premier tour")
+    parser.add_argument("--eta", type=int, default=3, help="Facteur d'élimination")
+    parser.add_argument("--seeds", type=int, default=3, help="Graines par configuration et par tour")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du tirage")
+    parser.add_argument("--output", default="results/tuning.json", help="Fichier JSON de sortie")
+    args = parser.parse_args(argv)
+
+    data = load_cities(args.data).to_dataframe()
+    tune_by_size(data, args.sizes, n_configs=args.configs, min_budget=args.budget, eta=args.eta,
+                 seeds_per_round=args.seeds, workers=args.workers, seed=args.seed, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
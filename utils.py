@@ -1,20 +1,45 @@
+import os
+import copy
+import math
+import pickle
+import hashlib
+import numpy as np
 import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
-import math
+import matplotlib.image as mpimg
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import seaborn as sns
 from mpl_toolkits.basemap import Basemap
+from instrumentation import PhaseProfiler
+from loader import city_arrays, city_index
 
 # =======  Liste de fonctions utilisées dans le main.py =======
 #
 # crée une palette de couleurs personnalisée
 # haversine()................ calcule la distance entre 2 point géographiques
-# calculate_tour_distance().. calcule la distance totale d'un tour
+# haversine_matrix()......... matrice des distances de Haversine entre deux ensembles de points (numpy)
+# nearest_neighbors()........ les k plus proches voisins de chaque ville (listes de candidats)
+# nearest_neighbor_tour().... tour glouton du plus proche voisin
+# tour_distance()............ distance totale d'un tour donné par indices de villes
+# calculate_tour_distance().. calcule la distance totale d'un tour (noms de villes)
+# atomic_write()............. écrit un fichier de façon atomique (fichier temporaire renommé)
+# get_basemap().............. Basemap d'une emprise, mise en cache (mémoire + disque)
+# get_background()........... image du fond de carte, mise en cache (mémoire + disque)
 # basemap().................. crée une carte de fond
+# shortcut_all_starts()...... raccourcit un circuit eulérien depuis chacune de ses positions (numpy)
 # cristo_algo().............. implémente les étapes de l'algorithme de Christofides
+# draw_segments()............ dessine des arêtes en une seule LineCollection
+# draw_complete_graph()...... dessine le graphe complet avec niveau de détail automatique
 # cristo_plot().............. affiche l'algorithme de Christofides sur le fond de carte
 # cristo_steps()............. décompose et affiche l'algorithme de Christofides sur le fond de carte
 #
+# Toutes les fonctions d'affichage acceptent output="fichier.png|.svg" : rendu Agg sans écran,
+# écriture du fichier puis fermeture de la figure (voir render.py pour le rendu par lots)
+#
 # =============================================================
 
 
@@ -51,94 +76,399 @@ def haversine(lat1, lon1, lat2, lon2):
 
 
 
+# --- Matrice des distances de Haversine (vectorisée) ---
+def haversine_matrix(lat1, lon1, lat2=None, lon2=None):
+    """
+    Distances de Haversine entre deux ensembles de points (numpy).
+
+    Args:
+        lat1, lon1: Coordonnées (degrés) du premier ensemble, longueur n
+        lat2, lon2: Coordonnées du second ensemble, longueur m (None = le premier ensemble)
+
+    Returns:
+        Matrice n x m des distances en km
+    """
+    R = 6371  # rayon moyen de la Terre en km
+    if lat2 is None:
+        lat2, lon2 = lat1, lon1
+    phi1 = np.radians(np.asarray(lat1, dtype=float))[:, None]
+    phi2 = np.radians(np.asarray(lat2, dtype=float))[None, :]
+    lambda1 = np.radians(np.asarray(lon1, dtype=float))[:, None]
+    lambda2 = np.radians(np.asarray(lon2, dtype=float))[None, :]
+
+    a = np.sin((phi2 - phi1) / 2)**2 + np.cos(phi1) * np.cos(phi2) * np.sin((lambda2 - lambda1) / 2)**2
+    a = np.clip(a, 0.0, 1.0)
+    return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def nearest_neighbors(dist, k):
+    """
+    Args:
+        dist: Matrice des distances (n x n)
+        k: Nombre de voisins
+
+    Returns:
+        Tableau (n x k) des indices des k plus proches voisins, du plus proche au plus lointain
+    """
+    n = len(dist)
+    k = min(k, n - 1)
+    masked = dist + np.diag(np.full(n, np.inf))
+    candidates = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(masked, candidates, axis=1), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def nearest_neighbor_tour(dist, start=0):
+    """Tour glouton : toujours la ville non visitée la plus proche."""
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    tour = np.empty(n, dtype=np.int64)
+    tour[0] = start
+    visited[start] = True
+    for step in range(1, n):
+        row = np.where(visited, np.inf, dist[tour[step - 1]])
+        tour[step] = int(np.argmin(row))
+        visited[tour[step]] = True
+    return tour
+
+
 # --- Distance Totale ---
+def tour_distance(order, lat, lon):
+    """
+    Distance totale d'un tour ferme donne par indices de villes.
+
+    Args:
+        order: Indices des villes dans l'ordre de visite
+        lat, lon: Coordonnees (degres) indexees par ville, de preference des listes Python
+
+    Returns:
+        Distance totale en km
+    """
+    total_distance = 0
+    for i in range(len(order)):
+        a = order[i]
+        b = order[(i + 1) % len(order)]  # retour e la premiere ville
+        total_distance += haversine(lat[a], lon[a], lat[b], lon[b])
+    return total_distance
+
+
 def calculate_tour_distance(tour, data):
     """
     Calcule la distance totale d'un tour (chemin hamiltonien ferme).
 
     Args:
         tour: Liste des noms de villes dans l'ordre de visite
-        data: DataFrame avec colonnes Ville, Latitude, Longitude
+        data: DataFrame avec colonnes Ville, Latitude, Longitude, ou Cities (loader.py)
 
     Returns:
         Distance totale en km
     """
-    total_distance = 0
-    for i in range(len(tour)):
-        city1 = tour[i]
-        city2 = tour[(i + 1) % len(tour)]  # retour e la premiere ville
-
-        # Recuperer les coordonnees
-        lat1, lon1 = data.loc[data["Ville"] == city1, ["Latitude", "Longitude"]].values[0]
-        lat2, lon2 = data.loc[data["Ville"] == city2, ["Latitude", "Longitude"]].values[0]
+    index = city_index(data)
+    _, lat, lon = city_arrays(data)
+    return tour_distance([index[city] for city in tour], lat.tolist(), lon.tolist())
 
-        total_distance += haversine(lat1, lon1, lat2, lon2)
 
-    return total_distance
+# --- Cache des cartes de fond ---
+# La construction d'une Basemap (chargement et projection des côtes) et le dessin du fond
+# dominent le temps d'affichage : la Basemap et l'image du fond sont mises en cache
+# par emprise et résolution, en mémoire et sur disque (dossier BASEMAP_CACHE_DIR).
+BASEMAP_CACHE_DIR = os.environ.get(
+    "TSP_BASEMAP_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "basemap")
+)
+BACKGROUND_WIDTH_PX = 1200          # largeur d'une figure 12 x 10 à 100 dpi
+_basemap_cache = {}
+_background_cache = {}
 
 
-# --- Création de la carte de fond ---
-def basemap(pos):
+def map_bounds(pos, margin=1):
+    """Emprise (lon min, lat min, lon max, lat max) des positions, avec une marge en degrés."""
     lons = [coord[0] for coord in pos.values()]
     lats = [coord[1] for coord in pos.values()]
-    m = Basemap(
-        projection='merc',
-        llcrnrlon=min(lons) - 1,
-        llcrnrlat=min(lats) - 1,
-        urcrnrlon=max(lons) + 1,
-        urcrnrlat=max(lats) + 1,
-        resolution='i'
+    return (
+        round(min(lons) - margin, 4),
+        round(min(lats) - margin, 4),
+        round(max(lons) + margin, 4),
+        round(max(lats) + margin, 4)
     )
-    m.drawcoastlines()
-    m.drawcountries()
-    m.fillcontinents(color=land_color, lake_color=sea_color)
-    m.drawmapboundary(fill_color=sea_color)
+
+
+def _cache_name(bounds, resolution):
+    return f"{resolution}_" + "_".join(f"{value:.4f}" for value in bounds)
+
+
+def atomic_write(path, write):
+    """
+    Écrit un fichier via un fichier temporaire renommé, pour ne jamais laisser de fichier tronqué.
+
+    Args:
+        path: Chemin du fichier
+        write: Fonction qui écrit le contenu dans le chemin temporaire qu'elle reçoit
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def get_basemap(bounds, resolution='i', cache_dir=None):
+    """
+    Renvoie la Basemap d'une emprise, depuis le cache mémoire, le cache disque ou en la construisant.
+
+    Args:
+        bounds: Emprise (lon min, lat min, lon max, lat max)
+        resolution: Résolution des côtes Basemap ('c', 'l', 'i', 'h', 'f')
+        cache_dir: Dossier du cache disque (None = BASEMAP_CACHE_DIR)
+
+    Returns:
+        Instance de Basemap
+    """
+    key = (tuple(bounds), resolution)
+    if key in _basemap_cache:
+        return _basemap_cache[key]
+
+    cache_dir = cache_dir or BASEMAP_CACHE_DIR
+    path = os.path.join(cache_dir, _cache_name(bounds, resolution) + ".pickle")
+    m = None
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                m = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            m = None
+
+    if m is None:
+        m = Basemap(
+            projection='merc',
+            llcrnrlon=bounds[0],
+            llcrnrlat=bounds[1],
+            urcrnrlon=bounds[2],
+            urcrnrlat=bounds[3],
+            resolution=resolution
+        )
+
+        def write(tmp_path):
+            with open(tmp_path, "wb") as f:
+                pickle.dump(m, f, protocol=pickle.HIGHEST_PROTOCOL)
+        atomic_write(path, write)
+
+    _basemap_cache[key] = m
+    return m
+
+
+def _draw_background(m, ax):
+    # Basemap garde une référence au contour dessiné : on dessine avec une copie pour que
+    # l'instance en cache reste réutilisable sur d'autres figures
+    m = copy.copy(m)
+    m.drawcoastlines(ax=ax)
+    m.drawcountries(ax=ax)
+    m.fillcontinents(color=land_color, lake_color=sea_color, ax=ax)
+    m.drawmapboundary(fill_color=sea_color, ax=ax)
+
+
+def get_background(m, bounds, resolution='i', width_px=BACKGROUND_WIDTH_PX, cache_dir=None):
+    """
+    Renvoie l'image RGBA du fond de carte (côtes, pays, continents), rendue une seule fois par emprise.
+
+    Args:
+        m: Basemap de l'emprise
+        bounds: Emprise (clé du cache)
+        resolution: Résolution des côtes (clé du cache)
+        width_px: Largeur de l'image en pixels
+        cache_dir: Dossier du cache disque (None = BASEMAP_CACHE_DIR)
+
+    Returns:
+        Array numpy (hauteur, largeur, 4)
+    """
+    colors = "".join(f"{c:.3f}" for c in (*land_color, *sea_color))
+    key = (tuple(bounds), resolution, width_px, colors)
+    if key in _background_cache:
+        return _background_cache[key]
+
+    cache_dir = cache_dir or BASEMAP_CACHE_DIR
+    digest = hashlib.sha1(colors.encode()).hexdigest()[:8]
+    path = os.path.join(cache_dir, f"{_cache_name(bounds, resolution)}_{width_px}_{digest}.png")
+    image = None
+    if os.path.exists(path):
+        try:
+            image = mpimg.imread(path)
+        except (OSError, ValueError):
+            image = None
+
+    if image is None:
+        # Rendu hors écran, sans marge, à l'échelle exacte de la projection
+        height_px = max(1, int(round(width_px * (m.ymax - m.ymin) / (m.xmax - m.xmin))))
+        fig = Figure(figsize=(width_px / 100, height_px / 100), dpi=100)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes([0, 0, 1, 1])
+        _draw_background(m, ax)
+        ax.set_xlim(m.xmin, m.xmax)
+        ax.set_ylim(m.ymin, m.ymax)
+        # Pas de set_axis_off() : Basemap peint la mer dans le fond des axes
+        ax.set_xticks([])
+        ax.set_yticks([])
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        canvas.draw()
+        image = np.asarray(canvas.buffer_rgba()).copy()
+        atomic_write(path, lambda tmp_path: mpimg.imsave(tmp_path, image, format="png"))
+
+    _background_cache[key] = image
+    return image
+
+
+# --- Création de la carte de fond ---
+def basemap(pos, ax=None, resolution='i', cached_background=True):
+    """
+    Crée la carte de fond englobant les positions et la dessine sur les axes.
+
+    Args:
+        pos: Dictionnaire {ville: (lon, lat)}
+        ax: Axes matplotlib (None = axes courants)
+        resolution: Résolution des côtes Basemap
+        cached_background: Réutiliser l'image du fond mise en cache au lieu de redessiner les côtes
+
+    Returns:
+        Instance de Basemap (pour projeter les coordonnées)
+    """
+    ax = ax if ax is not None else plt.gca()
+    bounds = map_bounds(pos)
+    m = get_basemap(bounds, resolution)
+
+    if cached_background:
+        image = get_background(m, bounds, resolution)
+        ax.imshow(image, extent=(m.xmin, m.xmax, m.ymin, m.ymax), origin='upper', zorder=0,
+                  interpolation='nearest')
+        m.set_axes_limits(ax=ax)
+    else:
+        _draw_background(m, ax)
     return m
 
 
 
 # -------- Algo de Christofides ---------
 
-def cristo_algo(data, verbose=False):
+def shortcut_all_starts(circuit, dist, block_elements=2**22):
+    """
+    Raccourcit un circuit eulérien depuis chacune de ses m positions de départ, en une passe numpy.
+
+    Le circuit est doublé ; en partant de la position s, la position p (s <= p < s + m) est gardée
+    si le sommet n'apparaît pas dans [s, p), c'est-à-dire si son occurrence précédente est avant s.
+    Chaque ligne garde exactement un exemplaire de chaque sommet, dans l'ordre du circuit.
+    Coût O(m²), traité par blocs de départs pour borner la mémoire.
+
+    Args:
+        circuit: Sommets du circuit (indices), sans répéter le premier à la fin
+        dist: Matrice des distances (indexée par les sommets)
+        block_elements: Nombre de cases (départs x m) traitées à la fois
+
+    Returns:
+        (longueurs des m tournées raccourcies, meilleure tournée (indices, ouverte), position de départ de celle-ci)
+    """
+    circuit = np.asarray(circuit, dtype=np.int64)
+    m = len(circuit)
+    k = len(np.unique(circuit))
+    doubled = np.concatenate([circuit, circuit])
+
+    # Occurrence précédente de chaque position dans le circuit doublé (-1 = aucune)
+    order = np.argsort(doubled, kind="stable")
+    same = doubled[order[1:]] == doubled[order[:-1]]
+    previous = np.full(2 * m, -1, dtype=np.int64)
+    previous[order[1:][same]] = order[:-1][same]
+
+    lengths = np.empty(m)
+    best_tour, best_start = None, 0
+    offsets = np.arange(m)
+    rows = max(1, block_elements // m)
+    for first in range(0, m, rows):
+        starts = np.arange(first, min(first + rows, m))
+        positions = starts[:, None] + offsets
+        keep = previous[positions] < starts[:, None]
+        tours = doubled[positions[keep]].reshape(len(starts), k)
+        block_lengths = dist[tours, np.roll(tours, -1, axis=1)].sum(axis=1)
+        lengths[starts] = block_lengths
+        row = int(np.argmin(block_lengths))
+        if best_tour is None or block_lengths[row] < lengths[best_start]:
+            best_tour, best_start = tours[row].copy(), int(starts[row])
+    return lengths, best_tour, best_start
+
+
+def cristo_algo(data, verbose=False, profile=False, shortcut="single", circuits=8):
+    """
+    Args:
+        data: DataFrame avec colonnes Ville, Latitude, Longitude, ou Cities (loader.py)
+        verbose: Inutilisé (la tournée est toujours affichée)
+        profile: Collecter les temps par phase et les compteurs
+        shortcut: "single" = raccourci du circuit eulérien depuis son premier sommet ;
+                  "best" = meilleur raccourci sur toutes les positions de départ de `circuits` circuits
+                  (sources différentes), g_data["shortcut"] donne la dispersion des longueurs
+        circuits: Nombre de circuits eulériens comparés en mode "best"
+    """
+    if shortcut not in ("single", "best"):
+        raise ValueError(f"shortcut inconnu : {shortcut!r} (attendu : 'single' ou 'best')")
+    profiler = PhaseProfiler(enabled=profile)
+
     # --- Graphe complet pondéré ---
-    G = nx.Graph()
-    for i, v1 in data.iterrows():
-        for j, v2 in data.iterrows():
-            if i < j:
-                dist = haversine(v1["Latitude"], v1["Longitude"], v2["Latitude"], v2["Longitude"])
-                G.add_edge(v1["Ville"], v2["Ville"], weight=dist)
+    names, lat_array, lon_array = city_arrays(data)
+    with profiler.phase("graph"):
+        G = nx.Graph()
+        lat, lon = lat_array.tolist(), lon_array.tolist()
+        for i in range(len(names)):
+            for j in range(i + 1, len(names)):
+                dist = haversine(lat[i], lon[i], lat[j], lon[j])
+                G.add_edge(names[i], names[j], weight=dist)
 
     # ---  Minimum Spanning Tree ---
-    mst = nx.minimum_spanning_tree(G, weight="weight")
+    with profiler.phase("mst"):
+        mst = nx.minimum_spanning_tree(G, weight="weight")
 
     # --- Sommets de degré impair ---
     odd_nodes = [node for node in mst.nodes() if mst.degree(node) % 2 == 1]
     # --- Sommets de degré pair ---
     even_nodes = [node for node in mst.nodes() if mst.degree(node) % 2 == 0]
-    # --- Sommets de degré pair ---
-    even_nodes = [node for node in mst.nodes() if mst.degree(node) % 2 == 0]
 
     # --- Sous-graphe des sommets impairs ---
     odd_subgraph = G.subgraph(odd_nodes)
 
     # --- Minimum Weight Perfect Matching du ous-graphe ---
-    matching = nx.algorithms.matching.min_weight_matching(odd_subgraph, weight="weight")
+    with profiler.phase("matching"):
+        matching = nx.algorithms.matching.min_weight_matching(odd_subgraph, weight="weight")
 
     # --- Fusion MST + matching ---
     multigraph = nx.MultiGraph(mst)
     multigraph.add_edges_from(matching)
 
     # --- Trouver un cycle eulérien ---
-    eulerian_circuit = list(nx.eulerian_circuit(multigraph))
+    with profiler.phase("eulerian"):
+        eulerian_circuit = list(nx.eulerian_circuit(multigraph))
 
     # --- Extraire la tournée finale (Hamiltonienne) ---
-    visited = set()
-    tour = []
-    for u, v in eulerian_circuit:
-        if u not in visited:
-            tour.append(u)
-            visited.add(u)
-    tour.append(tour[0])  # retour au point de départ
+    with profiler.phase("shortcut"):
+        if shortcut == "single":
+            visited = set()
+            tour = []
+            for u, v in eulerian_circuit:
+                if u not in visited:
+                    tour.append(u)
+                    visited.add(u)
+            shortcut_lengths = None
+        else:
+            # Circuits depuis des sources réparties sur les sommets ; le premier est le circuit par défaut
+            index = {name: i for i, name in enumerate(names)}
+            dist = haversine_matrix(lat_array, lon_array)
+            nodes = list(multigraph.nodes())
+            sources = nodes[::max(1, len(nodes) // circuits)][:circuits]
+            variants = [eulerian_circuit] + [list(nx.eulerian_circuit(multigraph, source=source))
+                                             for source in sources[1:]]
+            all_lengths = []
+            best = None
+            for variant, circuit in enumerate(variants):
+                lengths, variant_tour, start = shortcut_all_starts([index[u] for u, v in circuit], dist)
+                all_lengths.append(lengths)
+                if best is None or lengths[start] < best[0]:
+                    best = (float(lengths[start]), variant_tour, variant, start)
+            shortcut_lengths = np.concatenate(all_lengths)
+            tour = [names[i] for i in best[1]]
+        tour.append(tour[0])  # retour au point de départ
 
     # --- Calcul du kilométrage total ---
     total_distance = 0
@@ -148,24 +478,6 @@ def cristo_algo(data, verbose=False):
     print("Tournée :", " → ".join(tour))
     print(f"Kilométrage total : {total_distance:.2f} km")
 
-    # --- Fusion MST + matching ---
-    multigraph = nx.MultiGraph(mst)
-    multigraph.add_edges_from(matching)
-
-    # --- Trouver un cycle eulérien ---
-    eulerian_circuit = list(nx.eulerian_circuit(multigraph))
-
-    # --- Extraire la tournée finale (Hamiltonienne) ---
-    visited = []
-    for u, v in eulerian_circuit:
-        if u not in visited:
-            visited.append(u)
-    # On ferme le cycle en revenant au point de départ
-    tour = visited + [visited[0]]
-
-    distance = calculate_tour_distance(tour, data)
-            
-    # --- Positions des villes ---
     # --- Print le résultat ---
     print("Sommets impairs :", odd_nodes)
     print("\nAppariements du MWPM :")
@@ -174,7 +486,34 @@ def cristo_algo(data, verbose=False):
     
             
     # --- Positions des villes ---
-    pos = {row["Ville"]: (row["Longitude"], row["Latitude"]) for _, row in data.iterrows()}
+    pos = dict(zip(names, zip(lon, lat)))
+
+    # --- Dispersion des raccourcis ---
+    if shortcut_lengths is None:
+        shortcut_stats = {"mode": "single", "candidates": 1}
+    else:
+        shortcut_stats = {
+            "mode": "best",
+            "circuits": len(variants),
+            "candidates": len(shortcut_lengths),
+            "single": float(all_lengths[0][0]),
+            "min": float(shortcut_lengths.min()),
+            "max": float(shortcut_lengths.max()),
+            "mean": float(shortcut_lengths.mean()),
+            "best_circuit": best[2],
+            "best_start": best[3]
+        }
+        print(f"Raccourcis : {len(shortcut_lengths)} départs sur {len(variants)} circuits, "
+              f"min {shortcut_stats['min']:.2f} / moy {shortcut_stats['mean']:.2f} / max {shortcut_stats['max']:.2f} km "
+              f"(départ unique : {shortcut_stats['single']:.2f} km)")
+
+    # --- Compteurs ---
+    profiler.set("cities", G.number_of_nodes())
+    profiler.set("edges", G.number_of_edges())
+    profiler.set("odd_nodes", len(odd_nodes))
+    profiler.set("matching_size", len(matching))
+    profiler.set("circuit_length", len(eulerian_circuit))
+    profiler.set("shortcut_candidates", shortcut_stats["candidates"])
 
 
     # g_data = G, mst, matching, odd_nodes, pos
@@ -186,16 +525,185 @@ def cristo_algo(data, verbose=False):
         "even_nodes": even_nodes,
         "pos": pos,
         "tour": tour,
-        "total_distance": total_distance
+        "total_distance": total_distance,
+        "shortcut": shortcut_stats,
+        "profile": profiler.as_dict()
     }
     return g_data
 
 
+# ------- Figures : affichage interactif ou écriture de fichier -------
+def new_figure(figsize, output=None):
+    """
+    Crée une figure pyplot (affichage) ou, si `output` est donné, une Figure Agg détachée de pyplot.
+
+    Une Figure détachée n'est pas référencée par pyplot : elle ne bloque pas, ne demande pas
+    d'écran et sa mémoire est libérée dès que la figure n'est plus utilisée.
+    """
+    if output is None:
+        return plt.figure(figsize=figsize)
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def finish_figure(fig, output=None, dpi=100):
+    """
+    Affiche la figure (plt.show) ou l'écrit dans `output` (PNG, SVG, PDF selon l'extension) puis la ferme.
+
+    Returns:
+        Chemin du fichier écrit, ou None en mode interactif
+    """
+    if output is None:
+        plt.show()
+        return None
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fig.savefig(output, dpi=dpi)
+    fig.clear()
+    plt.close(fig)
+    return output
+
+
+# ------- Rendu rapide des arêtes (LineCollection + niveau de détail) -------
+# Une seule LineCollection par groupe d'arêtes au lieu d'un artiste par arête.
+# Le graphe complet (n(n-1)/2 arêtes) est dessiné en entier jusqu'à MAX_FULL_GRAPH_EDGES,
+# puis sous-échantillonné ou rendu en carte de densité ; tour, MST et matching restent exacts.
+MAX_FULL_GRAPH_EDGES = 20000
+MAX_NODE_LABELS = 100
+_density_cmap = LinearSegmentedColormap.from_list("density_gray", [(0.5, 0.5, 0.5, 0.0), (0.3, 0.3, 0.3, 0.9)])
+
+
+def project_positions(m, pos):
+    """
+    Projette les positions (lon, lat) dans le repère de la carte.
+
+    Returns:
+        (liste des villes, array x, array y, dictionnaire {ville: indice})
+    """
+    names = list(pos.keys())
+    lons = np.fromiter((pos[name][0] for name in names), dtype=float, count=len(names))
+    lats = np.fromiter((pos[name][1] for name in names), dtype=float, count=len(names))
+    x, y = m(lons, lats)
+    return names, np.asarray(x), np.asarray(y), {name: i for i, name in enumerate(names)}
+
+
+def edges_to_indices(edges, index):
+    """Convertit une liste d'arêtes (ville, ville) en array (k, 2) d'indices."""
+    pairs = [(index[u], index[v]) for u, v, *_ in edges]
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def tour_to_indices(tour, index):
+    """Arêtes consécutives d'un tour (fermé s'il ne l'est pas déjà), en indices."""
+    order = np.array([index[city] for city in tour], dtype=np.int64)
+    if len(order) > 1 and order[0] == order[-1]:
+        order = order[:-1]
+    return np.column_stack([order, np.roll(order, -1)])
+
+
+def draw_segments(ax, x, y, pairs, zorder=2, **style):
+    """
+    Dessine des arêtes en une seule LineCollection.
+
+    Args:
+        ax: Axes matplotlib
+        x, y: Coordonnées projetées des sommets
+        pairs: Array (k, 2) d'indices de sommets
+        zorder: Ordre d'affichage
+        **style: colors, linewidths, linestyles, alpha, label...
+
+    Returns:
+        La LineCollection ajoutée
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    segments = np.stack([np.column_stack([x[pairs[:, 0]], y[pairs[:, 0]]]),
+                         np.column_stack([x[pairs[:, 1]], y[pairs[:, 1]]])], axis=1)
+    collection = LineCollection(segments, zorder=zorder, **style)
+    ax.add_collection(collection)
+    return collection
+
+
+def _random_pairs(n, k, rng):
+    """k paires (i, j) distinctes tirées uniformément parmi les arêtes du graphe complet."""
+    i = rng.integers(0, n, size=k)
+    j = rng.integers(0, n - 1, size=k)
+    j = j + (j >= i)  # évite i == j sans biais
+    return np.column_stack([i, j])
+
+
+def draw_complete_graph(ax, x, y, max_edges=MAX_FULL_GRAPH_EDGES, mode="auto", color='gray', width=1, alpha=0.3,
+                        label=None, density_bins=400, seed=0):
+    """
+    Dessine le graphe complet avec un niveau de détail adapté au nombre d'arêtes.
+
+    Args:
+        ax: Axes matplotlib
+        x, y: Coordonnées projetées des sommets
+        max_edges: Nombre maximal d'arêtes dessinées individuellement
+        mode: "auto" (toutes les arêtes si possible, sinon densité), "full", "subsample" ou "density"
+        color, width, alpha: Style des arêtes
+        label: Légende
+        density_bins: Résolution de la carte de densité
+        seed: Graine du sous-échantillonnage
+    """
+    n = len(x)
+    total = n * (n - 1) // 2
+    if n < 2:
+        return
+    if mode == "auto":
+        mode = "full" if total <= max_edges else "density"
+    rng = np.random.default_rng(seed)
+
+    if mode == "full" or (mode == "subsample" and total <= max_edges):
+        i, j = np.triu_indices(n, k=1)
+        draw_segments(ax, x, y, np.column_stack([i, j]), zorder=1, colors=color, linewidths=width, alpha=alpha,
+                      label=label)
+    elif mode == "subsample":
+        # Opacité réduite en proportion : la densité visuelle reste comparable au graphe complet
+        draw_segments(ax, x, y, _random_pairs(n, max_edges, rng), zorder=1, colors=color, linewidths=width,
+                      alpha=max(alpha * max_edges / total, 0.02), label=label)
+    elif mode == "density":
+        # Points tirés le long d'un échantillon d'arêtes, accumulés dans un histogramme 2D
+        pairs = _random_pairs(n, max_edges, rng)
+        t = rng.random((len(pairs), 32))
+        px = x[pairs[:, 0], None] + t * (x[pairs[:, 1]] - x[pairs[:, 0]])[:, None]
+        py = y[pairs[:, 0], None] + t * (y[pairs[:, 1]] - y[pairs[:, 0]])[:, None]
+        xlim, ylim = ax.get_xlim(), ax.get_ylim()
+        hist, _, _ = np.histogram2d(px.ravel(), py.ravel(), bins=density_bins, range=[xlim, ylim])
+        ax.imshow(np.log1p(hist.T), extent=(*xlim, *ylim), origin='lower', cmap=_density_cmap, zorder=1,
+                  interpolation='bilinear', aspect=ax.get_aspect())
+        if label:
+            ax.plot([], [], color=color, linewidth=width, alpha=alpha, label=label)
+    else:
+        raise ValueError(f"Mode de rendu inconnu : {mode!r}")
+
+
+def draw_nodes(ax, x, y, indices, color, size, label=None, zorder=3):
+    """Dessine des sommets en un seul scatter, taille réduite pour les grandes instances."""
+    n_total = len(x)
+    if n_total > MAX_NODE_LABELS:
+        size = max(2, size * MAX_NODE_LABELS / n_total)
+    indices = np.asarray(indices, dtype=np.int64)
+    return ax.scatter(x[indices], y[indices], s=size, color=color, label=label, zorder=zorder, edgecolors='none')
+
+
+def draw_labels(ax, x, y, names, indices=None, font_size=9):
+    """Affiche le nom des villes (seulement jusqu'à MAX_NODE_LABELS villes)."""
+    if len(names) > MAX_NODE_LABELS:
+        return
+    indices = range(len(names)) if indices is None else indices
+    for i in indices:
+        ax.text(x[i], y[i], names[i], fontsize=font_size, color='black', fontweight='bold',
+                ha='center', va='center', zorder=4)
+
+
 # ------- Affichage avec fond de carte -------
-def cristo_plot(g_data, show_full=True, show_mst=True, show_matching=True, bg_color=ma_palette[0], label=''):
+def cristo_plot(g_data, show_full=True, show_mst=True, show_matching=True, bg_color=ma_palette[0], label='',
+                full_graph_mode="auto", output=None):
 
     # Récupère le retours de cristo_algo()
-    G = g_data["G"]
     mst = g_data["mst"]
     matching = g_data["matching"]
     odd_nodes = g_data["odd_nodes"]
@@ -203,58 +711,45 @@ def cristo_plot(g_data, show_full=True, show_mst=True, show_matching=True, bg_co
     pos = g_data["pos"]
     total_distance = g_data["total_distance"]
 
-    plt.figure(figsize=(12, 10))
+    fig = new_figure((12, 10), output)
+    ax = fig.add_subplot(111)
 
     # --- Création de la carte de fond ---
-    m = basemap(pos)
+    m = basemap(pos, ax=ax)
     # --- Convertir positions lat/lon en coordonnées projetées ---
-    x, y = m([coord[0] for coord in pos.values()], [coord[1] for coord in pos.values()])
-    projected_pos = {n: (x_i, y_i) for n, x_i, y_i in zip(G.nodes(), x, y)}
+    names, x, y, index = project_positions(m, pos)
 
     # --- Sommets pairs---
-    nx.draw_networkx_nodes(
-        G, projected_pos,
-        nodelist=even_nodes,
-        node_color=cristofides_color,
-        node_size=250,
-        label='Sommets pairs'
-    )
+    draw_nodes(ax, x, y, [index[node] for node in even_nodes], cristofides_color, 250, label='Sommets pairs')
 
    # --- Sommets impairs---
-    nx.draw_networkx_nodes(
-        G, projected_pos,
-        nodelist=odd_nodes,
-        node_color=odd_color,
-        node_size=300,
-        label='Sommets impairs'
-    )
+    draw_nodes(ax, x, y, [index[node] for node in odd_nodes], odd_color, 300, label='Sommets impairs')
 
     # --- Arêtes ---
     if show_full:
-        nx.draw_networkx_edges(G, projected_pos, edge_color='gray', width=2, alpha=0.5, label='Graphe complet')
+        draw_complete_graph(ax, x, y, mode=full_graph_mode, color='gray', width=2, alpha=0.5, label='Graphe complet')
     if show_mst:
-        nx.draw_networkx_edges(mst, projected_pos, edge_color=cristofides_color, width=3, label='MST')
+        draw_segments(ax, x, y, edges_to_indices(mst.edges(), index), colors=[cristofides_color], linewidths=3,
+                      label='MST')
     if show_matching:
-        nx.draw_networkx_edges(G, projected_pos, edgelist=list(matching),
-                               edge_color=odd_color, style='dashed', width=2, label='MWPM')
+        draw_segments(ax, x, y, edges_to_indices(matching, index), colors=[odd_color], linestyles='dashed',
+                      linewidths=2, label='MWPM')
 
-    # --- Labels pour les sommets impairs ---
-    odd_labels = {node: node for node in odd_nodes}
-    nx.draw_networkx_labels(G, projected_pos, labels=odd_labels, font_size=9, font_color='black', font_weight='bold')
-    
-    # --- Labels pour les sommets pairs ---
-    even_labels = {node: node for node in even_nodes}
-    nx.draw_networkx_labels(G, projected_pos, labels=even_labels, font_size=9, font_color='black', font_weight='bold')
+    # --- Labels des sommets (impairs puis pairs) ---
+    draw_labels(ax, x, y, names, [index[node] for node in odd_nodes])
+    draw_labels(ax, x, y, names, [index[node] for node in even_nodes])
 
-    plt.legend(loc='upper left', fontsize=9, frameon=True, fancybox=True, shadow=True)
-    plt.title(f"Algorithme de Christofides - {label}\nDistance totale : {total_distance:.2f} km", fontsize=12, fontweight='bold')
-    plt.tight_layout()
-    plt.show()
+    ax.legend(loc='upper left', fontsize=9, frameon=True, fancybox=True, shadow=True)
+    ax.set_title(f"Algorithme de Christofides - {label}\nDistance totale : {total_distance:.2f} km", fontsize=12, fontweight='bold')
+    fig.tight_layout()
+    return finish_figure(fig, output)
 
 
 
 # --- Affichage séquentielle pour visualiser étape par étape ---
-def cristo_steps(g_data):
+def cristo_steps(g_data, output=None):
+    # output : chemin de base des images (ex. "results/steps.png" -> steps_1.png ... steps_4.png),
+    # sans attente clavier entre les étapes
     
     steps = [
         ("Graphe complet", True, False, False),
@@ -263,7 +758,15 @@ def cristo_steps(g_data):
         (" fusion de MST et MWPM", False, True, True)
     ]
 
-    for title, show_full, show_mst, show_matching in steps:
+    paths = []
+    for step, (title, show_full, show_mst, show_matching) in enumerate(steps, start=1):
         print(f"--- {title} ---")
-        cristo_plot(g_data, show_full=show_full, show_mst=show_mst, show_matching=show_matching, label=title)
-        input("Appuyez sur Entrée pour passer à l'étape suivante...")
\ No newline at end of file
+        step_output = None
+        if output is not None:
+            root, ext = os.path.splitext(output)
+            step_output = f"{root}_{step}{ext or '.png'}"
+        paths.append(cristo_plot(g_data, show_full=show_full, show_mst=show_mst, show_matching=show_matching,
+                                 label=title, output=step_output))
+        if output is None:
+            input("Appuyez sur Entrée pour passer à l'étape suivante...")
+    return paths
\ No newline at end of file
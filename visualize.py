@@ -1,10 +1,10 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import networkx as nx
 import seaborn as sns
 from mpl_toolkits.basemap import Basemap
-from utils import cristo_algo, basemap
+from utils import cristo_algo, basemap, new_figure, finish_figure
 from genetique import genetic_tsp
+from loader import load_cities
 
 
 # ========= Visualisation et Comparaison des Tours =========
@@ -37,13 +37,14 @@ ma_palette = [land_color, sea_color, odd_color, genetic_color, cristofides_color
 
 
 
-def compare_plot(data, genetic_params=None):
+def compare_plot(data, genetic_params=None, output=None):
     """
     Compare visuellement Christofides et l'algorithme génétique côte à côte.
 
     Args:
         data: DataFrame des villes
         genetic_params: Paramètres pour l'algorithme génétique (dict)
+        output: Fichier image à écrire (PNG/SVG) au lieu d'afficher la figure
     """
     if genetic_params is None:
         genetic_params = {"pop_size": POPULATION, "generations": GENERATIONS, "mutation_rate": MUTATION_RATE, "elite_size": ELITE_SIZE}
@@ -60,15 +61,48 @@ def compare_plot(data, genetic_params=None):
     print("\n[2/2] Exécution de l'algorithme génétique...")
     result_genetic = genetic_tsp(data, verbose=True, **genetic_params)
 
+    # --- Figure ---
+    compare_figure(result_cristo, result_genetic, genetic_params, output=output)
+
+    # --- Résumé textuel ---
+    diff = result_genetic['best_distance'] - result_cristo['total_distance']
+    diff_percent = (diff / result_cristo['total_distance']) * 100
+
+    print("\n" + "="*70)
+    print("RÉSUMÉ DE LA COMPARAISON")
+    print("="*70)
+    print(f"Christofides  : {result_cristo['total_distance']:.2f} km")
+    print(f"Génétique     : {result_genetic['best_distance']:.2f} km")
+    print(f"Différence    : {diff:+.2f} km ({diff_percent:+.2f}%)")
+    if diff < 0:
+        print("\n🏆 Génétique a trouvé un meilleur tour !")
+    elif diff > 0:
+        print("\n🏆 Christofides a trouvé un meilleur tour !")
+    else:
+        print("\n🏆 Les deux algorithmes ont trouvé le même tour !")
+
+
+def compare_figure(result_cristo, result_genetic, genetic_params, output=None):
+    """
+    Dessine les tours de Christofides et du génétique côte à côte.
+
+    Args:
+        result_cristo: Dictionnaire renvoyé par cristo_algo()
+        result_genetic: Dictionnaire renvoyé par genetic_tsp()
+        genetic_params: Paramètres du génétique (affichés dans l'encart)
+        output: Fichier image à écrire (PNG/SVG) au lieu d'afficher la figure
+
+    Returns:
+        Chemin du fichier écrit, ou None en mode interactif
+    """
     # --- Créer figure avec 2 subplots ---
-    fig = plt.figure(figsize=(20, 10))
+    fig = new_figure((20, 10), output)
 
     # === CHRISTOFIDES ===
     ax1 = fig.add_subplot(121)
-    plt.sca(ax1)
 
     pos = result_cristo["pos"]
-    m1 = basemap(pos)
+    m1 = basemap(pos, ax=ax1)
     
 
 
@@ -94,9 +128,9 @@ def compare_plot(data, genetic_params=None):
     ax1.set_title(f"Christofides", fontsize=12, fontweight='bold', color='green')
     
     # ---- Infos km parcourus. -----------
-    plt.text(0.95, 0.97,
+    ax1.text(0.95, 0.97,
          f"Distance totale : {result_cristo['total_distance']:.2f} km",
-         transform=plt.gca().transAxes,
+         transform=ax1.transAxes,
          ha='right', va='top',
          color='white',
          bbox=dict(boxstyle='round,pad=0.4',
@@ -105,10 +139,9 @@ def compare_plot(data, genetic_params=None):
 
     # === GÉNÉTIQUE ===
     ax2 = fig.add_subplot(122)
-    plt.sca(ax2)
 
     pos2 = result_genetic["pos"]
-    m2 = basemap(pos2)
+    m2 = basemap(pos2, ax=ax2)
 
     x2, y2 = m2([coord[0] for coord in pos2.values()], [coord[1] for coord in pos2.values()])
     projected_pos2 = {n: (x_i, y_i) for n, x_i, y_i in zip(pos2.keys(), x2, y2)}
@@ -132,11 +165,11 @@ def compare_plot(data, genetic_params=None):
     ax2.set_title(f"Algorithme Génétique",fontsize=12, fontweight='bold', color=genetic_color)
     
     # ---- Infos sur la population et le nombre de générations -----------
-    plt.text(0.95, 0.97,
+    ax2.text(0.95, 0.97,
          f"Population Size : {genetic_params['pop_size']}\n"
          f"Generations : {genetic_params['generations']}\n"
          f"Distance totale : {result_genetic['best_distance']:.2f} km",
-         transform=plt.gca().transAxes,
+         transform=ax2.transAxes,
          ha='right', va='top',
          multialignment='left',       # 👈 corrige l’alignement des lignes internes
          color='white',
@@ -149,32 +182,18 @@ def compare_plot(data, genetic_params=None):
     diff = result_genetic['best_distance'] - result_cristo['total_distance']
     diff_percent = (diff / result_cristo['total_distance']) * 100
 
-    fig.suptitle(f"Comparaison TSP - 20 villes françaises - différence: {diff:+.2f} km ({diff_percent:+.2f}%)",
+    fig.suptitle(f"Comparaison TSP - {len(pos)} villes françaises - différence: {diff:+.2f} km ({diff_percent:+.2f}%)",
                 fontsize=14, fontweight='bold')
     
 
     # plt.tight_layout()
-    plt.show()
-
-    # --- Résumé textuel ---
-    print("\n" + "="*70)
-    print("RÉSUMÉ DE LA COMPARAISON")
-    print("="*70)
-    print(f"Christofides  : {result_cristo['total_distance']:.2f} km")
-    print(f"Génétique     : {result_genetic['best_distance']:.2f} km")
-    print(f"Différence    : {diff:+.2f} km ({diff_percent:+.2f}%)")
-    if diff < 0:
-        print("\n🏆 Génétique a trouvé un meilleur tour !")
-    elif diff > 0:
-        print("\n🏆 Christofides a trouvé un meilleur tour !")
-    else:
-        print("\n🏆 Les deux algorithmes ont trouvé le même tour !")
+    return finish_figure(fig, output)
 
 
 
 if __name__ == "__main__":
     # --- Chargement des données ---
-    data = pd.read_csv("data/villes.csv")
+    data = load_cities("data/villes.csv").to_dataframe()
 
     # --- Comparaison visuelle ---
     compare_plot(